@@ -1,12 +1,29 @@
 import os
+import time
+import mimetypes
 from werkzeug.utils import secure_filename
-from flask import Flask, render_template, request, redirect, url_for, flash, session, make_response
+from flask import (Flask, render_template, request, redirect, url_for, flash, session, make_response, jsonify,
+                   send_from_directory)
+from markupsafe import Markup
 from sqlalchemy.exc import IntegrityError
 from werkzeug.security import generate_password_hash
-from models import db, User, Admin, Contact, Movie, Director, Genre
+from models import db, User, Admin, Contact
+import click
+from datamanager import (counters, enrichment_jobs, bulk_import, fragment_cache, shared_cache, static_assets,
+                         db_engine)
+from datamanager.backends import create_data_manager
+from datamanager.title_index import suggest_titles
+from datamanager.movie_search import search_catalog_page, rebuild_search_index
+from datamanager.catalog_facets import CatalogFilters, catalog_facets
+from datamanager.fragment_cache import cached_fragment
+from controllers.common_fun import conditional_get, catalog_namespaces, compress_response
+from datamanager.movie_queries import (unique_movies_query,
+                                       get_unique_movies_page,
+                                       count_unique_movies)
 from blueprints.admin import admin_bp
 from blueprints.user import user_bp
-from flask_caching import Cache
+from blueprints.api import api_bp, API_VERSION
+from blueprints.utils import metadata_cache
 from flask_migrate import Migrate
 import logging
 
@@ -23,31 +40,156 @@ if not os.path.exists(db_directory):
 
 # Create the Flask app instance and configure the database URI and other settings.
 app = Flask(__name__)
-app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{os.path.join(db_directory, "moviwebapp.db")}'
+# SQLITE_DATABASE_URI points the SQLite backend at another file, e.g. the tests' scratch database
+app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('SQLITE_DATABASE_URI',
+                                                  f'sqlite:///{os.path.join(db_directory, "moviwebapp.db")}')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+app.config['DATABASE_BACKEND'] = os.getenv('DATABASE_BACKEND', 'sqlite')  # 'sqlite' or 'postgresql'
+app.config['DATABASE_URL'] = os.getenv('DATABASE_URL')  # Used by the PostgreSQL backend
 app.config['TEMPLATES_AUTO_RELOAD'] = True
 app.config['SECRET_KEY'] = 'YOUR_SECRET_KEY'
-app.config['CACHE_TYPE'] = 'simple'  # Simple in-memory cache for development
+# 'sqlite' shares one cache file between worker processes, 'redis' uses CACHE_REDIS_URL,
+# 'simple' keeps a separate in-memory cache in each process (see datamanager/shared_cache.py)
+app.config['CACHE_BACKEND'] = os.getenv('CACHE_BACKEND', 'sqlite')
+app.config['CACHE_REDIS_URL'] = os.getenv('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+app.config['CACHE_DEFAULT_TIMEOUT'] = fragment_cache.FRAGMENT_TIMEOUT
+app.config['CACHE_THRESHOLD'] = 2000  # Entries kept before the least recently used are evicted
+app.config['CACHE_SQLITE_MAX_SIZE'] = int(os.getenv('CACHE_SQLITE_MAX_SIZE', 64 * 1024 * 1024))  # Bytes
+shared_cache.configure_cache(app, db_directory)
 app.config['UPLOAD_FOLDER'] = './static/images/upload/profile_image'
-
-# Ensure the upload folder exists
-if not os.path.exists(app.config['UPLOAD_FOLDER']):
-    os.makedirs(app.config['UPLOAD_FOLDER'])
-
-# Initialize SQLAlchemy and Flask-Migrate
-db.init_app(app)
-migrate = Migrate(app, db)
-
-# Configure and initialize cache
-cache = Cache(app, config={'CACHE_TYPE': 'simple'})
+app.config['IMPORT_FOLDER'] = os.path.join(db_directory, 'imports')  # Bulk import uploads and checkpoints
+# 'thread' runs enrichment jobs inside the web process,
+# 'external' leaves them to `flask enrichment-worker`
+app.config['ENRICHMENT_WORKER'] = os.getenv('ENRICHMENT_WORKER', 'thread')
+# Rebuild static/dist/ at startup when a static file changed (see datamanager/static_assets.py);
+# turn off where the build runs once at deploy time with `flask build-assets`
+app.config['ASSETS_AUTO_BUILD'] = os.getenv('ASSETS_AUTO_BUILD', '1') == '1'
+
+# Ensure the upload folders exist
+for folder in (app.config['UPLOAD_FOLDER'], app.config['IMPORT_FOLDER']):
+    if not os.path.exists(folder):
+        os.makedirs(folder)
+
+# Initialize SQLAlchemy through the configured data manager, then Flask-Migrate
+data_manager = create_data_manager(app)
+migrate = Migrate(app, db, render_as_batch=True)  # Batch mode for SQLite ALTERs
+
+# Configure and initialize the cache used for rendered fragments (datamanager/fragment_cache.py)
+cache = fragment_cache.cache
 cache.init_app(app)
 
 # Register Blueprints
 app.register_blueprint(admin_bp, url_prefix='/admin')
 app.register_blueprint(user_bp, url_prefix='/user')
+app.register_blueprint(api_bp, url_prefix=f'/api/{API_VERSION}')
+
+# Compress pages and JSON responses
+app.after_request(compress_response)
+
+# Minified, bundled and fingerprinted static files (datamanager/static_assets.py)
+dist_folder = os.path.join(app.static_folder, static_assets.DIST_DIRECTORY)
+if app.config['ASSETS_AUTO_BUILD'] and static_assets.needs_build(app.static_folder):
+    static_assets.build_assets(app.static_folder)
+asset_manifest = static_assets.load_manifest(app.static_folder)
+# Part of every page ETag, so a redeploy never answers 304 with pages of the old one;
+# BUILD_ID can name the deploy instead, e.g. the commit hash
+app.config['BUILD_ID'] = os.getenv('BUILD_ID') or static_assets.build_id(
+    app.static_folder, os.path.join(app.root_path, app.template_folder))
+
+
+@app.before_request
+def start_enrichment_worker():
+    """
+    Start the in-process enrichment worker with the first request, so it runs
+    in the serving process (after any fork) and not in CLI commands.
+
+    Parameters:
+    None
+
+    Returns:
+    None
+    """
+    if app.config['ENRICHMENT_WORKER'] == 'thread':
+        enrichment_jobs.start_worker(app)
+
+
+@app.template_global()
+def url_template(endpoint, **placeholders):
+    """
+    Build the URL of an endpoint with '{field}' placeholders in place of its
+    integer arguments, for the table row templates that static/js/pagination.js
+    fills in from the JSON API.
+
+    Parameters:
+    endpoint (str): The endpoint, e.g. 'admin_bp.view_user'.
+    **placeholders: The endpoint arguments and the item fields that fill
+    them in, e.g. user_id='id'.
+
+    Returns:
+    str: The URL, e.g. '/admin/view_user/{id}'.
+    """
+    sentinels = {argument: 987654321 + index for index, argument in enumerate(placeholders)}
+    url = url_for(endpoint, **sentinels)
+    for argument, sentinel in sentinels.items():
+        url = url.replace(str(sentinel), '{' + placeholders[argument] + '}')
+    return url
+
+
+@app.template_global()
+def asset_url(filename):
+    """
+    Return the URL of a static file, by its fingerprinted name in static/dist/
+    when it has been built.
+
+    Parameters:
+    filename (str): The file, relative to static/, e.g. 'js/site.js'.
+
+    Returns:
+    str: e.g. '/static/dist/js/site.3f9a0c1d2e.js', or the plain static URL
+    of a file that is not built (e.g. an uploaded profile picture).
+    """
+    if filename in asset_manifest:
+        return url_for('dist_asset', filename=asset_manifest[filename])
+    return url_for('static', filename=filename)
+
+
+@app.route(f'/static/{static_assets.DIST_DIRECTORY}/<path:filename>')
+def dist_asset(filename):
+    """
+    Serve a built static file for a year: its name changes with its content,
+    so browsers can keep it without ever revalidating. Clients that accept
+    brotli or gzip get the pre-compressed copy.
+
+    Parameters:
+    filename (str): The fingerprinted name, e.g. 'js/site.3f9a0c1d2e.js'.
+
+    Returns:
+    Response: The file, or 404.
+    """
+    path, encoding = static_assets.precompressed_variant(dist_folder, filename, request.accept_encodings)
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    response = send_from_directory(dist_folder, path, mimetype=mimetype, max_age=static_assets.LONG_CACHE_SECONDS)
+    response.cache_control.immutable = True
+    response.vary.add('Accept-Encoding')
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def catalog_posters_fragment():
+    """
+    Return the poster strip of every listed film, rendered once per catalog version.
+
+    Returns:
+    Markup: The rendered 'partials/catalog_posters.html'.
+    """
+    return cached_fragment([fragment_cache.CATALOG], 'catalog-posters', lambda: Markup(
+        render_template('partials/catalog_posters.html', movies=unique_movies_query().all())
+    ))
 
 
 @app.route('/')
+@conditional_get(catalog_namespaces)
 def index():
     """
     This function retrieves all movies from the database, 
@@ -61,19 +203,11 @@ def index():
     render_template: A Flask function that renders 
     the 'index.html' template with the unique movies.
     """
-    movies = Movie.query.all()
-    seen_imdb_ids = set()
-    unique_movies = []
-
-    for movie in movies:
-        if movie.imdbID not in seen_imdb_ids:
-            seen_imdb_ids.add(movie.imdbID)
-            unique_movies.append(movie)
-
-    return render_template('index.html', movies=unique_movies)
+    return render_template('index.html', posters_html=catalog_posters_fragment())
 
 
 @app.route('/home')
+@conditional_get(catalog_namespaces)
 def home():
     """
     This function retrieves all movies from the database, 
@@ -87,16 +221,7 @@ def home():
     render_template: A Flask function that renders 
     the 'index.html' template with the unique movies.
     """
-    movies = Movie.query.all()
-    seen_imdb_ids = set()
-    unique_movies = []
-
-    for movie in movies:
-        if movie.imdbID not in seen_imdb_ids:
-            seen_imdb_ids.add(movie.imdbID)
-            unique_movies.append(movie)
-
-    return render_template('index.html', movies=unique_movies)
+    return render_template('index.html', posters_html=catalog_posters_fragment())
 
 
 @app.route('/about')
@@ -110,11 +235,12 @@ def favorites():
 
 
 @app.route('/movies_home')
+@conditional_get(catalog_namespaces)
 def movies_home():
     """
     This function handles the movie home page with pagination, sorting, and filtering.
-    It fetches movies from the database, removes duplicates based on imdbID,
-    applies sorting and pagination, and renders the 'movies_home.html' template.
+    Duplicates based on imdbID are removed, sorted and paginated in the database,
+    and the result is rendered with the 'movies_home.html' template.
 
     Parameters:
     None
@@ -122,65 +248,79 @@ def movies_home():
     Returns:
     render_template: A Flask function that renders 
     the 'movies_home.html' template with the paginated unique movies,
-    total number of unique movies, sorting information,
-    and the original movies query.
+    total number of unique movies and sorting information.
+    The catalog can be narrowed down by facets (genre, year_min, year_max,
+    rating_min and director arguments), shown with the film count of each value.
+    With a 'q' argument, the page shows ranked full-text search results
+    instead, one keyset page (after=<cursor>) at a time.
     """
     # Fetch pagination and sorting parameters
     page = request.args.get('page', 1, type=int)
     per_page = 10  # Items per page
     sort_column = request.args.get('sort', 'title')  # Default sorting by title
     sort_order = request.args.get('order', 'asc')  # Default order ascending
-
-    # Define sorting columns
-    sort_options = {
-        'title': Movie.title,
-        'director': Director.name,
-        'year': Movie.year,
-        'rating': Movie.rating,
-        'genre': Genre.name  # This will require proper joining with Genre
-    }
-
-    # Get the sort key, default to Movie.title
-    sort = sort_options.get(sort_column, Movie.title)
-
-    # Apply sorting order
-    if sort_order == 'desc':
-        sort = sort.desc()
+    q = request.args.get('q', '').strip()
+    filters = CatalogFilters.from_args(request.args)
+
+    search_results, next_cursor, facets, collection_html = [], None, None, None
+    if q:
+        search_results, next_cursor = search_catalog_page(q, request.args.get('after'), per_page)
+        posters_html = Markup(render_template('partials/catalog_posters.html',
+                                              movies=[result.item for result in search_results]))
+        total_unique_movies = cached_fragment([fragment_cache.CATALOG], 'catalog-count', count_unique_movies)
     else:
-        sort = sort.asc()
-
-    # Use left outer joins for Director and Genre relationships
-    movies_query = Movie.query \
-        .distinct() \
-        .outerjoin(Movie.director) \
-        .outerjoin(Movie.genres) \
-        .order_by(sort) \
-        .all()  # Fetch all movies without pagination first to filter duplicates
-
-    # Logic to filter out duplicate movies by imdbID
-    seen_imdb_ids = set()
-    unique_movies = []
-
-    for movie in movies_query:
-        if movie.imdbID not in seen_imdb_ids:
-            seen_imdb_ids.add(movie.imdbID)
-            unique_movies.append(movie)
-
-    # Paginate the filtered unique movies list manually
-    total_unique_movies = len(unique_movies)
-    start_index = (page - 1) * per_page
-    end_index = start_index + per_page
-    paginated_movies = unique_movies[start_index:end_index]
+        def render_catalog_page():
+            # Dedup by imdbID, filter, sort and paginate inside the database
+            movies = get_unique_movies_page(sort_column, sort_order, page, per_page, filters)
+            num_movies = count_unique_movies(filters)
+            collection = render_template('partials/movie_web_app_collection.html',
+                                         movies=movies, num_movies=num_movies, sort_column=sort_column,
+                                         sort_order=sort_order, page=page, per_page=per_page,
+                                         filter_args=filters.as_args())
+            posters = render_template('partials/catalog_posters.html', movies=movies)
+            return num_movies, Markup(collection), Markup(posters)
+
+        # The table and posters of each sort, filter and page are rendered once per catalog version
+        total_unique_movies, collection_html, posters_html = cached_fragment(
+            [fragment_cache.CATALOG, fragment_cache.LABELS], 'movies-home', render_catalog_page,
+            sort_column, sort_order, page, per_page, filters)
+        facets = catalog_facets(filters)
 
     # Pass movies and sorting information to the template
     return render_template('movies_home.html',
                            num_movies=total_unique_movies,  # Use total number of unique movies
-                           movies=paginated_movies,  # Pass the paginated unique movies
+                           collection_html=collection_html,
+                           posters_html=posters_html,
                            sort_column=sort_column,
                            sort_order=sort_order,
                            page=page,
                            per_page=per_page,
-                           movies_query=unique_movies)
+                           q=q,
+                           search_results=search_results,
+                           next_cursor=next_cursor,
+                           filters=filters,
+                           filter_args=filters.as_args(),  # Keeps the filters in sort and page links
+                           facets=facets)
+
+
+@app.route('/titles/autocomplete')
+def autocomplete_titles():
+    """
+    This function suggests the catalog titles of films already in a collection
+    for the add-movie forms, from an in-memory prefix index. Picking a suggestion
+    submits its imdbID, so the movie is copied from the catalog without
+    an OMDb request.
+
+    Parameters:
+    q (str): Query string argument, the text typed so far.
+    limit (int): Query string argument, the maximum number of suggestions (default 10, at most 25).
+
+    Returns:
+    Response: JSON list of {"title", "imdbID"} suggestions.
+    """
+    prefix = request.args.get('q', '')
+    limit = min(max(request.args.get('limit', 10, type=int), 1), 25)
+    return jsonify(suggest_titles(prefix, limit))
 
 
 @app.route('/contact', methods=['GET', 'POST'])
@@ -290,6 +430,7 @@ def signup_user():
 
         try:
             db.session.add(new_user)
+            counters.user_added(new_user)
             db.session.commit()
             flash('User registration successful!', 'success')
             return redirect(url_for('login'))
@@ -402,30 +543,6 @@ def login():
     return render_template('login.html')
 
 
-# Clear the cache
-def clear_cache():
-    """
-    Clears the cache if it is available.
-
-    This function checks if the cache object has a 'clear' method. If it does,
-    it clears the cache and displays a success flash message. If the cache object
-    does not have a 'clear' method, it displays a warning flash message.
-    Finally, it redirects the user to the home page.
-
-    Parameters:
-    None
-
-    Returns:
-    redirect: A Flask function that redirects to the 'home' route.
-    """
-    if hasattr(cache, 'clear'):
-        cache.clear()
-        flash('Cache cleared successfully!', 'success')
-    else:
-        flash('Cache clearing functionality not available.', 'warning')
-    return redirect(url_for('home'))  # Redirect to a suitable page
-
-
 @app.route('/logout')
 def logout():
     """
@@ -461,6 +578,163 @@ def logout():
     return response
 
 
+@app.cli.command('reconcile-counters')
+def reconcile_counters_command():
+    """
+    Recompute the denormalized user, admin and site-wide counters from the base tables.
+    Meant to be run periodically (e.g. from cron) to repair any drift.
+
+    Usage:
+    flask reconcile-counters
+    """
+    counters.reconcile_counters()
+    db.session.commit()
+    print('Counters reconciled.')
+
+
+@app.cli.command('rebuild-search-index')
+def rebuild_search_index_command():
+    """
+    Rewrite the movie_search full-text index from the movie table.
+    Only needed after writes that bypassed the ORM (e.g. raw SQL).
+
+    Usage:
+    flask rebuild-search-index
+    """
+    rebuild_search_index()
+    db.session.commit()
+    print('Search index rebuilt.')
+
+
+@app.cli.command('bench-cache')
+@click.option('--backend', 'backends', multiple=True, type=click.Choice(list(shared_cache.CACHE_BACKENDS)),
+              help='Backends to compare (default: all but redis).')
+@click.option('--processes', default=4, help='Worker processes sharing the cache.')
+@click.option('--requests', 'requests_per_process', default=2000, help='Requests per process.')
+@click.option('--keys', default=500, help='Distinct fragment keys.')
+@click.option('--render-ms', default=2.0, help='Time a miss spends rendering, in milliseconds.')
+def bench_cache_command(backends, processes, requests_per_process, keys, render_ms):
+    """
+    Compare the hit ratio and read latency of the cache backends when
+    several worker processes share them, like gunicorn workers do.
+
+    flask bench-cache [--backend sqlite --backend redis] [--processes 4]
+    """
+    for backend in backends or ('simple', 'sqlite'):
+        config = dict(app.config, CACHE_TYPE=shared_cache.CACHE_BACKENDS[backend])
+        result = shared_cache.benchmark(config, processes, requests_per_process, keys, render_ms)
+        print(f"{backend:>7}: hit ratio {result['hit_ratio']:.1%}, "
+              f"read p50 {result['p50_ms']:.3f} ms, p95 {result['p95_ms']:.3f} ms, "
+              f"wall time {result['seconds']:.2f} s")
+
+
+@app.cli.command('bench-sqlite')
+@click.option('--threads', default=8, help='Concurrent threads.')
+@click.option('--operations', default=300, help='Operations per thread.')
+@click.option('--write-every', default=5, help='Every n-th operation is a write.')
+def bench_sqlite_command(threads, operations, write_every):
+    """
+    Compare concurrent read/write throughput on a copy of the SQLite database
+    with SQLAlchemy's default engine and with the tuned engine of
+    datamanager/db_engine.py (WAL, PRAGMAs, connection pool).
+
+    flask bench-sqlite [--threads 8] [--operations 300] [--write-every 5]
+    """
+    if db.engine.dialect.name != 'sqlite':
+        print('bench-sqlite needs the SQLite backend.')
+        return
+    for name, tuned in (('default', False), ('tuned', True)):
+        result = db_engine.benchmark(db.engine.url.database, tuned, threads, operations, write_every)
+        print(f"{name:>7}: {result['ops_per_second']:.0f} ops/s, "
+              f"p50 {result['p50_ms']:.3f} ms, p95 {result['p95_ms']:.3f} ms, "
+              f"{result['errors']} errors, wall time {result['seconds']:.2f} s")
+
+
+@app.cli.command('build-assets')
+def build_assets_command():
+    """
+    Minify, bundle, fingerprint and pre-compress the static files into
+    static/dist/ and write its manifest. Run at deploy time when
+    ASSETS_AUTO_BUILD is off.
+
+    Usage:
+    flask build-assets
+    """
+    manifest = static_assets.build_assets(app.static_folder)
+    print(f'Built {len(manifest)} static files into static/{static_assets.DIST_DIRECTORY}/.')
+
+
+@app.cli.command('enrichment-worker')
+@click.option('--once', is_flag=True, help='Run the due jobs and exit instead of polling.')
+@click.option('--interval', default=5.0, help='Seconds between polls of the queue.')
+def enrichment_worker_command(once, interval):
+    """
+    Run the background enrichment jobs (trailer, poster check and full plot of
+    newly added movies) in a separate process. Use with ENRICHMENT_WORKER=external.
+
+    Usage:
+    flask enrichment-worker [--once] [--interval SECONDS]
+    """
+    while True:
+        processed = enrichment_jobs.process_jobs()
+        if processed:
+            print(f'Processed {processed} enrichment job(s).')
+        purged = enrichment_jobs.purge_metadata_cache_if_due()
+        if purged:
+            print(f'Purged {purged} expired metadata cache entries.')
+        if once:
+            break
+        time.sleep(interval)
+
+
+@app.cli.command('purge-metadata-cache')
+def purge_metadata_cache_command():
+    """
+    Delete the expired entries of the movie metadata cache (db/metadata_cache.db).
+    The enrichment workers also do this every hour; run it from cron when they
+    are not running.
+
+    Usage:
+    flask purge-metadata-cache
+    """
+    print(f'Purged {metadata_cache.purge_expired()} expired metadata cache entries.')
+
+
+@app.cli.command('import-movies')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--admin-id', type=int, help='Admin to add the movies for.')
+@click.option('--user-id', type=int, help='User to add the movies for.')
+@click.option('--batch-size', default=bulk_import.BATCH_SIZE, help='Titles per transaction.')
+@click.option('--workers', default=bulk_import.FETCH_WORKERS, help='Concurrent API lookups.')
+@click.option('--restart', is_flag=True, help='Ignore the checkpoint and start from the top.')
+def import_movies_command(path, admin_id, user_id, batch_size, workers, restart):
+    """
+    Import the movie titles listed in a CSV, JSON, JSON Lines or text file.
+    Progress is saved to PATH.checkpoint.json after every batch; running the
+    command again resumes an interrupted import.
+
+    Usage:
+    flask import-movies titles.csv --admin-id 1 [--user-id 2]
+    """
+    checkpoint_path = bulk_import.checkpoint_path_for(path)
+    if restart and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+    def report(progress):
+        print(f"{progress['position']} titles read: {progress['imported']} imported "
+              f"({progress['from_catalog']} from the catalog), {progress['skipped']} skipped, "
+              f"{progress['not_found']} not found.")
+
+    try:
+        progress = bulk_import.import_titles(path, admin_id, user_id, checkpoint_path,
+                                             batch_size, workers, report)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    report(progress)
+    if progress['not_found_titles']:
+        print('Not found: ' + ', '.join(progress['not_found_titles']))
+
+
 @app.errorhandler(404)
 def page_not_found():
     """
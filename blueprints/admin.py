@@ -7,6 +7,8 @@ with valid sessions can access and modify the data.
 import os
 from flask import Blueprint
 
+from controllers.common_fun import admin_required, conditional_get, catalog_namespaces
+
 from controllers.admin_controllers.admin_controller_dashboard import admin_dashboard
 from controllers.admin_controllers.admin_controller_for_add_user import add_user
 from controllers.admin_controllers.admin_controller_for_edit_user import edit_user
@@ -17,6 +19,7 @@ from controllers.admin_controllers.admin_controller_for_manage_users import mana
 from controllers.admin_controllers.admin_controller_for_manage_all_users import manage_all_users
 
 from controllers.admin_controllers.admin_controller_for_add_movie import add_movie
+from controllers.admin_controllers.admin_controller_for_bulk_import import bulk_import, resume_bulk_import
 from controllers.admin_controllers.admin_controller_for_edit_movie import edit_movie
 from controllers.admin_controllers.admin_controller_for_delete_movie import delete_movie
 from controllers.admin_controllers.admin_controller_for_delete_any_movie import delete_any_movie
@@ -30,35 +33,44 @@ from controllers.admin_controllers.admin_controller_for_all_movies_added_by_user
 from controllers.admin_controllers.admin_controller_for_details_view_of_movies_added_by_user_of_current_admin_report \
     import details_view_of_movies_added_by_user_of_current_admin_report
 from controllers.admin_controllers.admin_controller_for_admin_view_movie_detail import admin_view_movie_details
+from controllers.admin_controllers.admin_controller_for_enrichment_jobs import enrichment_jobs
 
 
 admin_bp = Blueprint('admin_bp', __name__,
                      template_folder=os.path.join(os.path.dirname(__file__),
                                                   '../templates/admin'))
 
-# Define routes and assign controller functions
-admin_bp.route('/admin_dashboard')(admin_dashboard)
-admin_bp.route('/add_user', methods=['GET', 'POST'])(add_user)
-admin_bp.route('/edit_user/<int:user_id>', methods=['GET', 'POST'])(edit_user)
-admin_bp.route('/delete_user/<int:user_id>', methods=['POST'])(delete_user)
+# Define routes and assign controller functions.
+# admin_required resolves the logged-in admin once per request before the controller runs.
+# conditional_get answers 304 Not Modified while the movie shown is unchanged.
+admin_bp.route('/admin_dashboard')(admin_required(admin_dashboard))
+admin_bp.route('/add_user', methods=['GET', 'POST'])(admin_required(add_user))
+admin_bp.route('/edit_user/<int:user_id>', methods=['GET', 'POST'])(admin_required(edit_user))
+admin_bp.route('/delete_user/<int:user_id>', methods=['POST'])(admin_required(delete_user))
 
-admin_bp.route('/view_user/<int:user_id>', methods=['GET', 'POST'])(view_user)
+admin_bp.route('/view_user/<int:user_id>', methods=['GET', 'POST'])(admin_required(view_user))
 
-admin_bp.route('/manage_users')(manage_users)
-admin_bp.route('/manage_all_users')(manage_all_users)
+admin_bp.route('/manage_users')(admin_required(manage_users))
+admin_bp.route('/manage_all_users')(admin_required(manage_all_users))
 
-admin_bp.route('/add_movie', methods=['GET', 'POST'])(add_movie)
-admin_bp.route('/edit_movie/<int:movie_id>', methods=['GET', 'POST'])(edit_movie)
+admin_bp.route('/add_movie', methods=['GET', 'POST'])(admin_required(add_movie))
+admin_bp.route('/bulk_import', methods=['GET', 'POST'])(admin_required(bulk_import))
+admin_bp.route('/bulk_import/<name>/resume', methods=['POST'])(admin_required(resume_bulk_import))
+admin_bp.route('/edit_movie/<int:movie_id>', methods=['GET', 'POST'])(admin_required(edit_movie))
 
-admin_bp.route('/delete_movie/<int:movie_id>', methods=['POST'])(delete_movie)
-admin_bp.route('/delete_any_movie/<int:movie_id>', methods=['POST'])(delete_any_movie)
+admin_bp.route('/delete_movie/<int:movie_id>', methods=['POST'])(admin_required(delete_movie))
+admin_bp.route('/delete_any_movie/<int:movie_id>', methods=['POST'])(admin_required(delete_any_movie))
 
-admin_bp.route('/manage_movies')(manage_movies)
-admin_bp.route('/manage_all_movies')(manage_all_movies)
-admin_bp.route('/movie/<int:movie_id>', methods=['GET'])(admin_view_movie_details)
+admin_bp.route('/manage_movies')(admin_required(manage_movies))
+admin_bp.route('/manage_all_movies')(admin_required(manage_all_movies))
+admin_bp.route('/movie/<int:movie_id>', methods=['GET'])(
+    admin_required(conditional_get(catalog_namespaces)(admin_view_movie_details)))
 
-admin_bp.route('/reports')(reports)
-admin_bp.route('/all_movies_added_by_user_of_current_admin_report')(all_movies_added_by_user_of_current_admin_report)
+admin_bp.route('/reports')(admin_required(reports))
+admin_bp.route('/all_movies_added_by_user_of_current_admin_report')(
+    admin_required(all_movies_added_by_user_of_current_admin_report)
+)
 admin_bp.route('/details_view_of_movies_added_by_user_of_current_admin_report/<int:user_id>')(
-    details_view_of_movies_added_by_user_of_current_admin_report
+    admin_required(details_view_of_movies_added_by_user_of_current_admin_report)
 )
+admin_bp.route('/enrichment_jobs')(admin_required(enrichment_jobs))
@@ -0,0 +1,35 @@
+# api.py
+"""
+This module defines the versioned JSON API (mounted at /api/v1) for the
+listings the HTML pages paginate: the public catalog, the admin's movie,
+user and report lists and the user's movie and favorite lists. Responses
+are compact JSON, limited to the fields asked for with ?fields=, and
+compressed with brotli or gzip; static/js/pagination.js renders table rows
+from them.
+"""
+from flask import Blueprint
+
+from controllers.common_fun import conditional_get, catalog_namespaces, user_list_namespaces
+from controllers.api_controllers.api_common import api_admin_required, api_user_required
+from controllers.api_controllers.api_controller_for_listings import (
+    api_catalog_movies, api_admin_movies, api_all_movies, api_admin_users, api_all_users,
+    api_users_report, api_user_movies_report, api_my_movies, api_favorites
+)
+
+API_VERSION = 'v1'
+
+api_bp = Blueprint('api_bp', __name__)
+
+# The API answers 401 JSON instead of redirecting to the login page.
+# conditional_get answers 304 Not Modified while the catalog or the user's lists are unchanged.
+api_bp.route('/movies')(conditional_get(catalog_namespaces)(api_catalog_movies))
+
+api_bp.route('/admin/movies')(api_admin_required(api_admin_movies))
+api_bp.route('/admin/all_movies')(api_admin_required(api_all_movies))
+api_bp.route('/admin/users')(api_admin_required(api_admin_users))
+api_bp.route('/admin/all_users')(api_admin_required(api_all_users))
+api_bp.route('/admin/reports/users')(api_admin_required(api_users_report))
+api_bp.route('/admin/reports/users/<int:user_id>/movies')(api_admin_required(api_user_movies_report))
+
+api_bp.route('/user/movies')(api_user_required(conditional_get(user_list_namespaces)(api_my_movies)))
+api_bp.route('/user/favorites')(api_user_required(conditional_get(user_list_namespaces)(api_favorites)))
@@ -0,0 +1,213 @@
+"""
+metadata_cache.py
+
+This module contains the two-tier cache for OMDb/TMDb movie metadata:
+an in-process LRU in front of a small SQLite file that survives restarts
+and is shared by every worker process on the host.
+
+Entries are keyed by normalized title and by imdbID and expire after a
+configurable TTL. "Movie not found" answers are cached too (negative
+caching), with their own, shorter TTL, so repeated typos do not spend
+API quota.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+# Default lifetimes in seconds
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_NEGATIVE_TTL = 24 * 3600
+DEFAULT_MEMORY_SIZE = 512
+
+
+def normalize_title(title):
+    """
+    Normalize a movie title for use as a cache key.
+
+    Parameters:
+    title (str): The title as typed by the user.
+
+    Returns:
+    str: The title case-folded with runs of whitespace collapsed.
+    """
+    return ' '.join((title or '').split()).casefold()
+
+
+class MetadataCache:
+    """
+    Two-tier TTL cache for movie metadata.
+
+    A cached value is either the metadata dict or None, meaning the
+    API reported that the movie does not exist.
+
+    Attributes:
+        path (str): The SQLite file of the persistent tier.
+        ttl (int): Lifetime of found entries, in seconds.
+        negative_ttl (int): Lifetime of "not found" entries, in seconds.
+        memory_size (int): Maximum number of entries kept in process memory.
+    """
+
+    def __init__(self, path, ttl=DEFAULT_TTL, negative_ttl=DEFAULT_NEGATIVE_TTL,
+                 memory_size=DEFAULT_MEMORY_SIZE):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.memory_size = memory_size
+        self._memory = OrderedDict()  # key -> (expires_at, value), least recently used first
+        self._lock = threading.Lock()
+        self._counters = {'memory_hits': 0, 'disk_hits': 0, 'negative_hits': 0, 'misses': 0}
+
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS metadata ('
+                'key TEXT PRIMARY KEY, value TEXT, expires_at REAL NOT NULL)'
+            )
+
+    @contextmanager
+    def _connect(self):
+        """Open a connection to the persistent tier, commit on success and close it."""
+        conn = sqlite3.connect(self.path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _count(self, name):
+        """Increment one of the hit/miss counters."""
+        with self._lock:
+            self._counters[name] += 1
+
+    def _remember(self, key, expires_at, value):
+        """Put an entry in the in-process tier, evicting the least recently used."""
+        with self._lock:
+            self._memory[key] = (expires_at, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+    def get(self, key):
+        """
+        Look up a key in memory, then on disk.
+
+        Parameters:
+        key (str): The cache key.
+
+        Returns:
+        tuple: (found, value). found is False on a miss or an expired entry;
+        value is None for a cached "not found" answer.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and entry[0] > now:
+                self._memory.move_to_end(key)
+        if entry and entry[0] > now:
+            self._count('memory_hits' if entry[1] is not None else 'negative_hits')
+            return True, entry[1]
+
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT value, expires_at FROM metadata WHERE key = ? AND expires_at > ?',
+                (key, now)
+            ).fetchone()
+        if row is None:
+            self._count('misses')
+            return False, None
+
+        value = json.loads(row[0])
+        self._remember(key, row[1], value)
+        self._count('disk_hits' if value is not None else 'negative_hits')
+        return True, value
+
+    def set(self, keys, value, ttl=None):
+        """
+        Store a value under one or more keys in both tiers.
+
+        Parameters:
+        keys (list[str]): The cache keys, e.g. the title key and the imdbID key.
+        value (dict or None): The metadata, or None for "not found".
+        ttl (int): Lifetime in seconds; defaults to ttl, or negative_ttl for None.
+
+        Returns:
+        None
+        """
+        if ttl is None:
+            ttl = self.ttl if value is not None else self.negative_ttl
+        expires_at = time.time() + ttl
+        payload = json.dumps(value)
+        with self._connect() as conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO metadata (key, value, expires_at) VALUES (?, ?, ?)',
+                [(key, payload, expires_at) for key in keys]
+            )
+        for key in keys:
+            self._remember(key, expires_at, value)
+
+    def get_by_title(self, title):
+        """Look up metadata by movie title. Returns (found, value) like get()."""
+        return self.get('title:' + normalize_title(title))
+
+    def get_by_imdb_id(self, imdb_id):
+        """Look up metadata by imdbID. Returns (found, value) like get()."""
+        return self.get('imdb:' + imdb_id)
+
+    def set_movie(self, title, data, ttl=None):
+        """
+        Cache the lookup result for a title, and under the canonical title and
+        imdbID returned by the API if the movie was found.
+
+        Parameters:
+        title (str): The title that was looked up.
+        data (dict or None): The metadata, or None if the movie was not found.
+        ttl (int): Lifetime in seconds, see set().
+
+        Returns:
+        None
+        """
+        keys = ['title:' + normalize_title(title)]
+        if data:
+            if data.get('Title') and normalize_title(data['Title']) != normalize_title(title):
+                keys.append('title:' + normalize_title(data['Title']))
+            if data.get('imdbID'):
+                keys.append('imdb:' + data['imdbID'])
+        self.set(keys, data, ttl)
+
+    def purge_expired(self):
+        """
+        Delete expired entries from both tiers; expired entries are never
+        served, this only frees the space they take.
+
+        Returns:
+        int: The number of entries deleted from the persistent tier.
+        """
+        now = time.time()
+        with self._lock:
+            for key in [key for key, (expires_at, _) in self._memory.items() if expires_at <= now]:
+                del self._memory[key]
+        with self._connect() as conn:
+            return conn.execute('DELETE FROM metadata WHERE expires_at <= ?', (now,)).rowcount
+
+    def clear(self):
+        """Empty both tiers."""
+        with self._lock:
+            self._memory.clear()
+        with self._connect() as conn:
+            conn.execute('DELETE FROM metadata')
+
+    def stats(self):
+        """
+        Return the hit and miss counters of this process.
+
+        Returns:
+        dict: memory_hits, disk_hits, negative_hits and misses.
+        """
+        with self._lock:
+            return dict(self._counters)
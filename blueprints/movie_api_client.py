@@ -0,0 +1,216 @@
+"""
+movie_api_client.py
+
+This module contains the HTTP client used for the external movie APIs
+(OMDb and TMDb). One client keeps a pooled httpx.AsyncClient, so repeated
+lookups reuse keep-alive connections instead of opening a new TCP+TLS
+connection each time, and independent lookups can run concurrently.
+Each API host gets its own connection pool (a transport mounted for its
+origin), so a slow API cannot use up the connections of the other one.
+It also applies shared timeouts, bounded retries with jittered exponential
+backoff, and a per-host circuit breaker that fails fast while an API is down.
+
+The client runs on one long-lived event loop in a background thread
+(see run_sync), which keeps its connections alive between requests of
+the synchronous Flask views.
+"""
+import asyncio
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+import httpx
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class CircuitOpenError(httpx.HTTPError):
+    """Raised instead of calling a host whose circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker.
+
+    After failure_threshold consecutive failures the circuit opens and
+    calls are refused for reset_timeout seconds. The first call after that
+    is let through as a trial: success closes the circuit, failure opens
+    it again.
+
+    Attributes:
+        failure_threshold (int): Consecutive failures that open the circuit.
+        reset_timeout (float): Seconds to wait before a trial call.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = {}  # host -> consecutive failures
+        self._opened_at = {}  # host -> time the circuit opened
+        self._lock = threading.Lock()
+
+    def allow(self, host):
+        """
+        Check whether a call to the host may proceed.
+
+        Parameters:
+        host (str): The host name.
+
+        Returns:
+        bool: False while the circuit is open.
+        """
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return True
+            if time.monotonic() - opened_at >= self.reset_timeout:
+                # Half-open: let one trial call through, refuse others until it finishes
+                self._opened_at[host] = time.monotonic()
+                return True
+            return False
+
+    def record_success(self, host):
+        """Close the circuit for the host."""
+        with self._lock:
+            self._failures.pop(host, None)
+            self._opened_at.pop(host, None)
+
+    def record_failure(self, host):
+        """Count a failure and open the circuit once the threshold is reached."""
+        with self._lock:
+            failures = self._failures.get(host, 0) + 1
+            self._failures[host] = failures
+            if failures >= self.failure_threshold:
+                self._opened_at[host] = time.monotonic()
+
+
+def _origin(url):
+    """The scheme://host[:port] part of a URL, used as a transport mount pattern."""
+    parts = urlsplit(url)
+    return f'{parts.scheme}://{parts.netloc}'
+
+
+class MovieApiClient:
+    """
+    Pooled asynchronous HTTP client for the OMDb and TMDb APIs.
+
+    Attributes:
+        retries (int): Retries after the first attempt.
+        backoff_factor (float): Base of the exponential backoff between retries.
+        client (httpx.AsyncClient): The pooled client.
+        breaker (CircuitBreaker): The per-host circuit breaker.
+    """
+
+    def __init__(self, timeout=(3.05, 10), retries=2, backoff_factor=0.3,
+                 pool_maxsize=10, failure_threshold=5, reset_timeout=30, hosts=()):
+        """
+        Parameters:
+        timeout (tuple): The (connect, read) timeout in seconds.
+        retries (int): Retries after the first attempt, for connection errors
+        and 429/5xx responses.
+        backoff_factor (float): Base of the exponential backoff between retries.
+        pool_maxsize (int): Maximum connections per pool.
+        failure_threshold (int): Consecutive failures that open a host's circuit.
+        reset_timeout (float): Seconds a circuit stays open.
+        hosts (iterable): URLs of the API hosts; each origin (scheme, host and
+        port) gets a pool of its own. Other hosts, e.g. poster servers,
+        share the default pool.
+        """
+        connect_timeout, read_timeout = timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        limits = httpx.Limits(max_connections=pool_maxsize, max_keepalive_connections=pool_maxsize)
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=limits,
+            mounts={origin: httpx.AsyncHTTPTransport(limits=limits)
+                    for origin in dict.fromkeys(_origin(url) for url in hosts)}
+        )
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+
+    def _backoff(self, attempt, response=None):
+        """Seconds to wait before the next attempt: Retry-After if given, else jittered exponential."""
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(int(retry_after), 30)
+        return self.backoff_factor * (2 ** attempt) + random.uniform(0, self.backoff_factor)
+
+    async def get(self, url, params=None):
+        """Send a GET request; see request()."""
+        return await self.request('GET', url, params)
+
+    async def head(self, url):
+        """Send a HEAD request, e.g. to check that a poster URL exists; see request()."""
+        return await self.request('HEAD', url)
+
+    async def request(self, method, url, params=None):
+        """
+        Send a request through the pooled client, retrying transient failures.
+
+        Parameters:
+        method (str): 'GET' or 'HEAD'; both are safe to retry.
+        url (str): The URL to request.
+        params (dict): Query string parameters.
+
+        Returns:
+        httpx.Response: The response. Server errors that remain after
+        the retries count as failures for the circuit breaker.
+
+        Raises:
+        CircuitOpenError: If the host's circuit is open.
+        httpx.HTTPError: If the request failed after the retries.
+        """
+        host = urlsplit(url).hostname
+        if not self.breaker.allow(host):
+            raise CircuitOpenError(f"{host} is unavailable, not calling it for now")
+
+        for attempt in range(self.retries + 1):
+            last_attempt = attempt == self.retries
+            try:
+                response = await self.client.request(method, url, params=params,
+                                                     follow_redirects=True)
+            except httpx.TransportError:
+                if last_attempt:
+                    self.breaker.record_failure(host)
+                    raise
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+
+            if response.status_code in RETRY_STATUSES and not last_attempt:
+                await asyncio.sleep(self._backoff(attempt, response))
+                continue
+            break
+
+        if response.status_code >= 500 or response.status_code == 429:
+            self.breaker.record_failure(host)
+        else:
+            self.breaker.record_success(host)
+        return response
+
+    async def aclose(self):
+        """Close the pooled connections."""
+        await self.client.aclose()
+
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def run_sync(coro):
+    """
+    Run a coroutine on the shared background event loop and wait for its result.
+    The loop thread is started on first use, i.e. after a server has forked
+    its workers.
+
+    Parameters:
+    coro (coroutine): The coroutine to run.
+
+    Returns:
+    The coroutine's result.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name='movie-api-loop', daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coro, _loop).result()
@@ -15,6 +15,8 @@ Routes:
 
 import os
 from flask import Blueprint
+from controllers.common_fun import (user_required, conditional_get,
+                                   user_list_namespaces, user_movie_namespaces)
 from controllers.user_controllers.user_controller_for_user_dashboard import user_dashboard
 from controllers.user_controllers.user_controller_for_my_movies import my_movies
 from controllers.user_controllers.user_controller_for_user_favorites import user_favorites
@@ -33,15 +35,17 @@ user_bp = Blueprint('user_bp', __name__,
                     template_folder=os.path.join(os.path.dirname(__file__),
                                                  '../templates/user'))
 
-
-user_bp.route('/dashboard')(user_dashboard)
-user_bp.route('/my_movies')(my_movies)
-user_bp.route('/movie/<int:movie_id>', methods=['GET'])(user_view_movie_details)
-user_bp.route('/user_favorites')(user_favorites)
-user_bp.route('/add_to_favorites/<int:movie_id>', methods=['POST'])(add_to_favorites)
-user_bp.route('/remove_from_favorites/<int:movie_id>', methods=['POST'])(remove_from_favorites)
-user_bp.route('/user_add_movie', methods=['GET', 'POST'])(user_add_movie)
-user_bp.route('/edit_movie/<int:movie_id>', methods=['GET', 'POST'])(user_edit_movie)
-user_bp.route('/delete_movie/<int:movie_id>', methods=['POST'])(delete_movie)
-user_bp.route('/user_profile')(user_profile)
-user_bp.route('/edit_user_profile/<int:user_id>', methods=['GET', 'POST'])(edit_user_profile)
+# user_required resolves the logged-in user once per request before the controller runs.
+# conditional_get answers 304 Not Modified while the lists or movie shown are unchanged.
+user_bp.route('/dashboard')(user_required(user_dashboard))
+user_bp.route('/my_movies')(user_required(conditional_get(user_list_namespaces)(my_movies)))
+user_bp.route('/movie/<int:movie_id>', methods=['GET'])(
+    user_required(conditional_get(user_movie_namespaces)(user_view_movie_details)))
+user_bp.route('/user_favorites')(user_required(conditional_get(user_list_namespaces)(user_favorites)))
+user_bp.route('/add_to_favorites/<int:movie_id>', methods=['POST'])(user_required(add_to_favorites))
+user_bp.route('/remove_from_favorites/<int:movie_id>', methods=['POST'])(user_required(remove_from_favorites))
+user_bp.route('/user_add_movie', methods=['GET', 'POST'])(user_required(user_add_movie))
+user_bp.route('/edit_movie/<int:movie_id>', methods=['GET', 'POST'])(user_required(user_edit_movie))
+user_bp.route('/delete_movie/<int:movie_id>', methods=['POST'])(user_required(delete_movie))
+user_bp.route('/user_profile')(user_required(user_profile))
+user_bp.route('/edit_user_profile/<int:user_id>', methods=['GET', 'POST'])(user_required(edit_user_profile))
@@ -6,72 +6,221 @@ including helper functions for movie API.
 
 Functions:
 - _fetch_movie_data: Fetches movie data from the OMDb API
-  using the provided movie title.
+  using the provided movie title or IMDb ID.
+- fetch_movie_data: Returns cached movie data, or fetches and caches it.
+- fetch_enrichment_data: Fetches the trailer and full plot and checks the
+  poster of a movie, for the background enrichment jobs.
 """
+import asyncio
 import os
-import requests
+import httpx
 from dotenv import load_dotenv
+from blueprints.metadata_cache import MetadataCache
+from blueprints.movie_api_client import MovieApiClient, run_sync
 
 load_dotenv()
 
 OMDB_API_KEY = os.getenv('OMDB_API_KEY')
 TMDB_API_KEY = os.getenv('TMDB_API_KEY')
 
+# MOVIE_API_STUB_URL points both APIs at a local stand-in (see stubs/movie_api_stub.py)
+# for offline development and reproducible benchmarks
+MOVIE_API_STUB_URL = (os.getenv('MOVIE_API_STUB_URL') or '').rstrip('/')
+OMDB_URL = f'{MOVIE_API_STUB_URL}/' if MOVIE_API_STUB_URL else 'http://www.omdbapi.com/'
+TMDB_VIDEOS_URL = (MOVIE_API_STUB_URL or 'https://api.themoviedb.org') + '/3/movie/{imdb_id}/videos'
 
-def _fetch_movie_data(title):
+# Pooled client shared by all API calls, with a pool per API host;
+# timeouts are (connect, read) seconds
+movie_api_client = MovieApiClient(
+    timeout=(float(os.getenv('MOVIE_API_CONNECT_TIMEOUT', 3.05)),
+             float(os.getenv('MOVIE_API_READ_TIMEOUT', 10))),
+    retries=int(os.getenv('MOVIE_API_RETRIES', 2)),
+    pool_maxsize=int(os.getenv('MOVIE_API_POOL_SIZE', 10)),
+    hosts=(OMDB_URL, TMDB_VIDEOS_URL)
+)
+
+# Two-tier cache for API lookups; TTLs are in seconds. Stub answers get their
+# own cache file so they never mix with real API data.
+metadata_cache = MetadataCache(
+    os.getenv('METADATA_CACHE_PATH',
+              os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'db',
+                           'metadata_cache_stub.db' if MOVIE_API_STUB_URL else 'metadata_cache.db')),
+    ttl=int(os.getenv('METADATA_CACHE_TTL', 7 * 24 * 3600)),
+    negative_ttl=int(os.getenv('METADATA_CACHE_NEGATIVE_TTL', 24 * 3600)),
+    memory_size=int(os.getenv('METADATA_CACHE_MEMORY_SIZE', 512))
+)
+
+
+async def _fetch_movie_data(title, imdb_id=None):
     """
-    Fetches movie data from the OMDb API using the provided movie title.
-    Additionally, fetches the movie trailer from TMDb API.
+    Fetches movie data from the OMDb API using the provided movie title,
+    or the IMDb ID when it is known. The trailer, full plot and poster check
+    are left to the background enrichment job (see fetch_enrichment_data).
 
     Parameters:
     title (str): The title of the movie to fetch data for.
+    imdb_id (str): The IMDb ID of the movie, if known.
 
     Returns:
-    dict: A dictionary containing the movie data and trailer link.
+    dict: The movie data. When OMDb reports that the movie does not exist,
+    its error response (Response == 'False') is returned so the caller can
+    cache the miss. None if the API could not be reached.
     """
+    params = {'apikey': OMDB_API_KEY}
+    params.update({'i': imdb_id} if imdb_id else {'t': title})
     try:
         # Fetch movie data from OMDb API
-        response = requests.get(
-            f"http://www.omdbapi.com/?apikey={OMDB_API_KEY}&t={title}", timeout=10
-        )
+        response = await movie_api_client.get(OMDB_URL, params=params)
         if response.status_code == 200:
             data = response.json()
-            if data['Response'] == 'True':
-                imdb_id = data.get('imdbID')
-
-                # Fetch trailer from TMDb API using the IMDb ID
-                tmdb_response = requests.get(
-                    f"https://api.themoviedb.org/3/movie/{imdb_id}/videos?api_key={TMDB_API_KEY}"
-                )
-                if tmdb_response.status_code == 200:
-                    tmdb_data = tmdb_response.json()
-                    trailers = tmdb_data.get('results', [])
-
-                    # Find the YouTube trailer link
-                    for trailer in trailers:
-                        if trailer['site'] == 'YouTube' and trailer['type'] == 'Trailer':
-                            trailer_link = f"https://www.youtube.com/watch?v={trailer['key']}"
-                            data['Trailer'] = trailer_link
-                            break
-                return data
-            print(f"Error: {data['Error']}")
+            if data['Response'] != 'True':
+                print(f"Error: {data['Error']}")
+            return data
         print("Error: Could not retrieve data from OMDb API.")
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         print(f"Error: {e}")
     return None
 
 
-def fetch_movie_data(title):
+def _raise_if_unavailable(response):
+    """Raise httpx.HTTPStatusError for responses worth retrying later (429 and 5xx)."""
+    if response.status_code >= 500 or response.status_code == 429:
+        response.raise_for_status()
+
+
+async def _lookup_trailer(imdb_id):
+    """
+    Looks up the YouTube trailer link of a movie in the TMDb API.
+
+    Parameters:
+    imdb_id (str): The IMDb ID of the movie.
+
+    Returns:
+    str: The trailer URL, or None if the movie has no YouTube trailer.
+
+    Raises:
+    httpx.HTTPError: If TMDb could not be reached or is unavailable.
+    """
+    tmdb_response = await movie_api_client.get(
+        TMDB_VIDEOS_URL.format(imdb_id=imdb_id), params={'api_key': TMDB_API_KEY}
+    )
+    _raise_if_unavailable(tmdb_response)
+    if tmdb_response.status_code == 200:
+        trailers = tmdb_response.json().get('results', [])
+
+        # Find the YouTube trailer link
+        for trailer in trailers:
+            if trailer['site'] == 'YouTube' and trailer['type'] == 'Trailer':
+                return f"https://www.youtube.com/watch?v={trailer['key']}"
+    return None
+
+
+async def _lookup_full_plot(imdb_id):
+    """
+    Looks up the full-length plot of a movie in the OMDb API.
+
+    Parameters:
+    imdb_id (str): The IMDb ID of the movie.
+
+    Returns:
+    str: The full plot, or None if OMDb has none.
+
+    Raises:
+    httpx.HTTPError: If OMDb could not be reached or is unavailable.
+    """
+    response = await movie_api_client.get(
+        OMDB_URL, params={'apikey': OMDB_API_KEY, 'i': imdb_id, 'plot': 'full'}
+    )
+    _raise_if_unavailable(response)
+    if response.status_code == 200:
+        data = response.json()
+        if data.get('Response') == 'True' and data.get('Plot') not in (None, '', 'N/A'):
+            return data['Plot']
+    return None
+
+
+async def _check_poster(poster_url):
+    """
+    Checks that a remote poster URL serves an image.
+
+    Parameters:
+    poster_url (str): The poster URL.
+
+    Returns:
+    bool: Whether the poster is usable, or None for local/empty URLs that need no check.
+
+    Raises:
+    httpx.HTTPError: If the poster host could not be reached or is unavailable.
+    """
+    if not poster_url or not poster_url.startswith(('http://', 'https://')):
+        return None
+    response = await movie_api_client.head(poster_url)
+    _raise_if_unavailable(response)
+    return (response.status_code == 200
+            and response.headers.get('Content-Type', '').startswith('image/'))
+
+
+def fetch_enrichment_data(imdb_id, poster_url):
+    """
+    Fetches the trailer and full plot and checks the poster of a movie,
+    all three concurrently. Used by the background enrichment jobs.
+
+    Parameters:
+    imdb_id (str): The IMDb ID of the movie.
+    poster_url (str): The poster URL stored for the movie.
+
+    Returns:
+    dict: 'trailer' (str or None), 'plot' (str or None) and
+    'poster_ok' (bool, or None if the poster was not checked).
+
+    Raises:
+    httpx.HTTPError: If one of the APIs could not be reached; the job is retried.
+    """
+    async def gather():
+        tasks = [asyncio.create_task(lookup) for lookup in
+                 (_lookup_trailer(imdb_id), _lookup_full_plot(imdb_id), _check_poster(poster_url))]
+        try:
+            return await asyncio.gather(*tasks)
+        finally:
+            # After a failure, stop the lookups still running instead of leaving them on the loop
+            for task in tasks:
+                task.cancel()
+
+    trailer, plot, poster_ok = run_sync(gather())
+    return {'trailer': trailer, 'plot': plot, 'poster_ok': poster_ok}
+
+
+def fetch_movie_data(title, imdb_id=None):
     """
     Public function to fetch movie data, using the internal _fetch_movie_data function.
 
     This function is a wrapper that ensures the protected function is accessed
-    properly and only through this public interface.
+    properly and only through this public interface. Results are served from
+    metadata_cache when possible; found movies and "not found" answers are
+    cached, network errors are not. Found movies are cached for the full TTL
+    (the enrichment job adds the trailer to the catalog entry); the shorter
+    negative TTL is only used for "not found" answers.
 
     Parameters:
     title (str): The title of the movie to fetch data for.
+    imdb_id (str): The IMDb ID of the movie if already known, e.g. from the
+    local catalog; OMDb is then queried by ID instead of by title.
 
     Returns:
-    dict: A dictionary containing the movie data and trailer link.
+    dict: A dictionary containing the movie data,
+    or None if the movie was not found or the API could not be reached.
     """
-    return _fetch_movie_data(title)
\ No newline at end of file
+    found, data = metadata_cache.get_by_title(title)
+    if not found and imdb_id:
+        found, data = metadata_cache.get_by_imdb_id(imdb_id)
+    if found:
+        return dict(data) if data else None
+
+    data = run_sync(_fetch_movie_data(title, imdb_id))
+    if data is None:
+        return None
+    if data.get('Response') != 'True':
+        metadata_cache.set_movie(title, None)
+        return None
+    metadata_cache.set_movie(title, data)
+    return dict(data)
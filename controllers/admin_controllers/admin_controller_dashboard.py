@@ -1,6 +1,9 @@
 from flask import render_template
-from models import User, Movie
-from controllers.common_fun import (admin_logged_in, handle_invalid_admin, handle_not_logged_in)
+from models import Movie, CatalogMovie
+from datamanager.stats_service import (get_admin_stats,
+                                       user_movie_counts_query,
+                                       to_user_movie_counts)
+from controllers.common_fun import admin_logged_in
 
 
 def admin_dashboard():
@@ -11,42 +14,21 @@ def admin_dashboard():
     Returns:
     render_template: A rendered HTML template for the admin dashboard page.
     """
-    if not admin_logged_in():
-        return handle_not_logged_in()
-
     admin = admin_logged_in()
 
-    if admin is None:
-        return handle_invalid_admin()  # Handle case where admin is not logged in
-
     # Log the current admin ID
     print(f"Current admin ID: {admin}")
 
-    # Fetch counts for users and movies
-    counts = {
-        'num_users': User.query.filter_by(admin_id=admin.id).count(),
-        'num_movies': Movie.query.filter_by(admin_id=admin.id).count(),
-        'num_users_total': User.query.count(),
-        'num_movies_total': Movie.query.count(),
-    }
+    # Read the user and movie counts from the admin's counter columns and the Counter totals
+    counts = get_admin_stats(admin.id).as_dict()
 
-    # Fetch users and their associated movie counts
-    user_query = User.query.filter_by(admin_id=admin.id)
-    users_with_movies = [
-        {
-            'user': user,
-            'movies_count': Movie.query.filter_by(user_id=user.id).count()
-        }
-        for user in user_query
-    ]
+    # Fetch users with the movie counts kept in their movie_count column
+    users_with_movies = to_user_movie_counts(user_movie_counts_query(admin.id))
 
-    # Get unique movies by IMDb ID
-    unique_movies = []
-    seen_imdb_ids = set()
-    for movie in Movie.query.filter_by(admin_id=admin.id):
-        if movie.imdbID not in seen_imdb_ids:
-            seen_imdb_ids.add(movie.imdbID)
-            unique_movies.append(movie)
+    # Get unique movies by IMDb ID from the catalog
+    unique_movies = CatalogMovie.query.filter(
+        CatalogMovie.copies.any(Movie.admin_id == admin.id)
+    ).all()
 
     # Render the full page
     return render_template('admin_dashboard.html',
@@ -1,9 +1,7 @@
 from flask import render_template, request
 from models import User, Genre
 from controllers.common_fun import (admin_logged_in,
-                                    handle_invalid_admin,
-                                    handle_add_movie_post,
-                                    handle_not_logged_in)
+                                    handle_add_movie_post)
 
 
 def add_movie():
@@ -17,12 +15,7 @@ def add_movie():
         - On success, redirects to the movie management page.
         - On failure, displays a flash message and redirects to the add movie form.
     """
-    if not admin_logged_in():
-        return handle_not_logged_in()
-
     admin = admin_logged_in()
-    if not admin:
-        return handle_invalid_admin()
 
     if request.method == 'POST':
         return handle_add_movie_post(admin)
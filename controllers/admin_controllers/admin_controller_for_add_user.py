@@ -3,7 +3,8 @@ from flask import render_template, request, redirect, url_for, flash, current_ap
 from werkzeug.utils import secure_filename
 from werkzeug.security import generate_password_hash
 from models import db, User
-from controllers.common_fun import (admin_logged_in, handle_invalid_admin, handle_not_logged_in, allowed_file)
+from datamanager import counters
+from controllers.common_fun import (admin_logged_in, allowed_file)
 
 
 def add_user():
@@ -20,14 +21,8 @@ def add_user():
     - If the user registration is successful,
     it displays a success message and redirects to the manage users page.
     """
-    if not admin_logged_in():
-        return handle_not_logged_in()
-
     admin = admin_logged_in()
 
-    if admin is None:
-        return handle_invalid_admin()  # Handle case where admin is not logged in
-
     if not admin:
         flash('You must be logged in as an admin to add a movie.', 'warning')
         return redirect(url_for('admin_bp.login'))
@@ -66,6 +61,7 @@ def add_user():
             admin_id=admin.id  # Admin who is adding the user
         )
         db.session.add(new_user)
+        counters.user_added(new_user)
         db.session.commit()
         flash('User registration successful!', 'success')
         return redirect(url_for('admin_bp.manage_users', admin=admin))
@@ -3,10 +3,6 @@ from flask import (render_template,
                    url_for,
                    flash)
 from models import Movie
-from controllers.common_fun import (admin_logged_in,
-                                    handle_invalid_admin,
-                                    handle_not_logged_in
-                                    )
 
 
 def admin_view_movie_details(movie_id):
@@ -19,13 +15,6 @@ def admin_view_movie_details(movie_id):
     Returns:
     - render_template: A rendered HTML template displaying the movie details.
     """
-    if not admin_logged_in():
-        return handle_not_logged_in()  # Redirect if the user is not logged in
-
-    admin = admin_logged_in()
-    if admin is None:
-        return handle_invalid_admin()
-
     # Query the movie to ensure it belongs to the current user
     movie = Movie.query.filter_by(id=movie_id).first()
 
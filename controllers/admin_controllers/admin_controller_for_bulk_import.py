@@ -0,0 +1,62 @@
+import os
+from datetime import datetime
+from flask import render_template, request, redirect, url_for, flash, current_app
+from werkzeug.utils import secure_filename
+from models import User
+from datamanager import bulk_import as importer
+from controllers.common_fun import admin_logged_in
+
+
+def bulk_import():
+    """
+    Route for admins to import a list of movie titles from a CSV, JSON,
+    JSON Lines or text file. The upload is saved to the import folder and
+    imported in the background; the page lists the admin's imports with
+    their progress.
+    Returns:
+        - On POST, redirects back to the bulk import page.
+        - Otherwise, the rendered bulk import page.
+    """
+    admin = admin_logged_in()
+
+    if request.method == 'POST':
+        file = request.files.get('file')
+        extension = file.filename.rsplit('.', 1)[-1].lower() if file and '.' in file.filename else ''
+        if extension not in importer.ALLOWED_EXTENSIONS:
+            flash('Please upload a .csv, .json, .jsonl or .txt file.', 'error')
+            return redirect(url_for('admin_bp.bulk_import'))
+
+        # Prefix the upload time so every upload gets its own checkpoint
+        filename = f"{datetime.now():%Y%m%d%H%M%S}_{secure_filename(file.filename)}"
+        path = os.path.join(current_app.config['IMPORT_FOLDER'], filename)
+        file.save(path)
+
+        user_id = request.form.get('user_id', type=int)
+        importer.start_import(current_app._get_current_object(), path, admin.id, user_id)
+        flash('Import started. Refresh this page to follow its progress.', 'success')
+        return redirect(url_for('admin_bp.bulk_import'))
+
+    imports = importer.list_imports(current_app.config['IMPORT_FOLDER'], admin.id)
+    users = User.query.all()
+    return render_template('bulk_import.html', admin=admin, users=users, imports=imports)
+
+
+def resume_bulk_import(name):
+    """
+    Route for admins to resume an interrupted import from its checkpoint.
+    Returns:
+        - Redirects back to the bulk import page.
+    """
+    admin = admin_logged_in()
+
+    path = os.path.join(current_app.config['IMPORT_FOLDER'], secure_filename(name))
+    progress = importer.load_checkpoint(importer.checkpoint_path_for(path))
+    if progress is None or progress['admin_id'] != admin.id or not os.path.exists(path):
+        flash('Import not found.', 'error')
+    elif progress['done']:
+        flash('This import has already finished.', 'info')
+    elif importer.start_import(current_app._get_current_object(), path, admin.id, progress['user_id']):
+        flash('Import resumed.', 'success')
+    else:
+        flash('This import is still running.', 'warning')
+    return redirect(url_for('admin_bp.bulk_import'))
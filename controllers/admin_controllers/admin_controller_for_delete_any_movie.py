@@ -1,8 +1,6 @@
 from flask import redirect, url_for, flash
 from models import db, Movie, Favorite
-from controllers.common_fun import (admin_logged_in,
-                                    handle_invalid_admin,
-                                    handle_not_logged_in)
+from datamanager import counters
 
 
 def delete_any_movie(movie_id):
@@ -17,19 +15,12 @@ def delete_any_movie(movie_id):
     Returns:
     redirect: A redirect to the 'manage_all_movies' route.
     """
-    if not admin_logged_in():
-        return handle_not_logged_in()
-
-    admin = admin_logged_in()
-
-    if admin is None:
-        return handle_invalid_admin()  # Handle case where admin is not logged in
-
-    # First, delete related favorites
-    Favorite.query.filter_by(movie_id=movie_id).delete()
-    # Then, delete the movie
-    movie = Movie.query.get(movie_id)
+    movie = db.session.get(Movie, movie_id)
     if movie:
+        counters.movie_removed(movie)
+        # First, delete related favorites
+        Favorite.query.filter_by(movie_id=movie_id).delete()
+        # Then, delete the movie
         db.session.delete(movie)
         db.session.commit()
         flash('Movie deleted successfully.')
@@ -1,9 +1,8 @@
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError, OperationalError
 from flask import redirect, url_for, flash
 from models import db, Movie, Favorite
-from controllers.common_fun import (admin_logged_in,
-                                    handle_invalid_admin,
-                                    handle_not_logged_in)
+from datamanager import counters
+from controllers.common_fun import admin_logged_in
 
 
 def delete_movie(movie_id):
@@ -21,20 +20,15 @@ def delete_movie(movie_id):
     Returns:
     redirect: A redirect to the 'manage_movies' route.
     """
-    if not admin_logged_in():
-        return handle_not_logged_in()
-
     admin = admin_logged_in()
 
-    if admin is None:
-        return handle_invalid_admin()  # Handle case where admin is not logged in
-
     # Get the movie and check if it belongs to the current admin
     movie = Movie.query.filter_by(id=movie_id, admin_id=admin.id).first_or_404()
 
     try:
         # Remove associations from the movie_genre association table
         movie.genres.clear()
+        counters.movie_removed(movie)
         # Remove any associated favorites
         Favorite.query.filter_by(movie_id=movie_id).delete()
         # Now delete the movie
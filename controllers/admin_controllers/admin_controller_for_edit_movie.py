@@ -6,11 +6,10 @@ from flask import (render_template,
                    flash)
 from models import db, User, Movie, Genre
 from controllers.common_fun import (admin_logged_in,
-                                    handle_invalid_admin,
                                     handle_genres_for_movie,
-                                    handle_not_logged_in,
                                     extract_movie_form_data,
                                     find_or_create_director,
+                                    handle_missing_director,
                                     update_movie)
 
 
@@ -33,19 +32,15 @@ def edit_movie(movie_id):
     render_template: A rendered template displaying
     the edit movie form if the request method is GET.
     """
-    if not admin_logged_in():
-        return handle_not_logged_in()
-
     admin = admin_logged_in()
 
-    if admin is None:
-        return handle_invalid_admin()  # Handle case where admin is not logged in
-
     movie = Movie.query.get_or_404(movie_id)
 
     if request.method == 'POST':
         form_data = extract_movie_form_data(request.form)
         director = find_or_create_director(form_data['director_name'])
+        if director is None:
+            return handle_missing_director('admin_bp.edit_movie', movie_id=movie_id)
         update_movie(movie, form_data, director, admin)
 
         # Handle genres
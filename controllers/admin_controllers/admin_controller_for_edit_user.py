@@ -9,9 +9,8 @@ from flask import (render_template,
 from werkzeug.utils import secure_filename
 from werkzeug.security import generate_password_hash
 from models import db, User
+from datamanager import counters
 from controllers.common_fun import (admin_logged_in,
-                                    handle_invalid_admin,
-                                    handle_not_logged_in,
                                     allowed_file)
 
 
@@ -26,14 +25,8 @@ def edit_user(user_id):
     redirect: Redirects to the manage users page
     if the user is successfully updated.
     """
-    if not admin_logged_in():
-        return handle_not_logged_in()
-
     admin = admin_logged_in()
 
-    if admin is None:
-        return handle_invalid_admin()  # Handle case where admin is not logged in
-
     # user = User.query.filter_by(id=user_id, admin_id=admin_id).first_or_404()
     user = User.query.filter_by(id=user_id).first_or_404()
 
@@ -80,6 +73,7 @@ def edit_user(user_id):
                 print(f"Profile Picture Filename: {filename}")
                 print(f"Profile Picture Path: {profile_picture_path}")
 
+        counters.user_admin_changed(user.admin_id, admin.id)
         user.admin_id = admin.id  # Admin who is Updating the user
 
         db.session.commit()
@@ -0,0 +1,21 @@
+from flask import render_template
+from datamanager.enrichment_jobs import queue_stats, recent_jobs
+from controllers.common_fun import admin_logged_in
+
+
+def enrichment_jobs():
+    """
+    Render the enrichment queue page for the currently logged-in admin.
+    It shows how many background enrichment jobs (trailer, poster check and
+    full plot of newly added movies) are pending, running, done or failed,
+    and the most recently updated jobs with their last error.
+    Returns:
+        - Rendered HTML page with the queue status.
+    """
+    admin = admin_logged_in()
+
+    return render_template('enrichment_jobs.html',
+                           admin=admin,
+                           stats=queue_stats(),
+                           jobs=recent_jobs()
+                           )
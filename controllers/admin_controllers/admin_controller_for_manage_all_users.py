@@ -1,8 +1,8 @@
 from flask import render_template, request
 from models import User
-from controllers.common_fun import (admin_logged_in,
-                                    handle_invalid_admin,
-                                    handle_not_logged_in)
+from datamanager.counters import USERS_TOTAL, get_total
+from datamanager.keyset import paginate_keyset
+from controllers.common_fun import admin_logged_in
 
 
 def manage_all_users():
@@ -11,7 +11,7 @@ def manage_all_users():
     It checks if the user is logged in, clears the cache if necessary,
     and redirects to the login page if not.
     It then fetches the total number of users and all users,
-    paginates the users for display, and renders
+    paginates the users for display (cursor-based, ?after=/?before=), and renders
     the appropriate template based on the request type.
     Parameters:
     None
@@ -21,22 +21,16 @@ def manage_all_users():
     render_template: A rendered template containing only
     the table and pagination controls for AJAX requests.
     """
-    if not admin_logged_in():
-        return handle_not_logged_in()
-
     admin = admin_logged_in()
 
-    if admin is None:
-        return handle_invalid_admin()  # Handle case where admin is not logged in
-
     # Count users and movies for display purposes, filtering by admin_id
-    num_users = User.query.count()
+    num_users = get_total(USERS_TOTAL)
 
-    page = request.args.get('page', 1, type=int)
     per_page = 5  # Set how many users to display per page
 
-    # Paginate users, filtering by admin_id
-    users = User.query.paginate(page=page, per_page=per_page)
+    # Keyset-paginate users by id; the total comes from the counter
+    users = paginate_keyset(User.query, [User.id], request.args.get('after'), request.args.get('before'),
+                            per_page, total=num_users)
 
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
         # Render and return only the table and pagination controls for AJAX requests
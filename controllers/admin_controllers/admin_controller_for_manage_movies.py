@@ -1,9 +1,10 @@
 from flask import render_template, request
 from models import Movie
-from controllers.common_fun import (admin_logged_in,
-                                    handle_invalid_admin,
-                                    handle_not_logged_in,
-                                    )
+from datamanager.stats_service import get_admin_stats
+from datamanager.movie_queries import with_listing_relationships
+from datamanager.movie_search import search_movies_page
+from datamanager.keyset import paginate_keyset
+from controllers.common_fun import admin_logged_in
 
 
 def manage_movies():
@@ -13,29 +14,41 @@ def manage_movies():
     and redirects to the login page if not.
     It then fetches the total number of movies added by the current admin
     and all movies,
-    paginates the admin's movies for display, and renders
+    paginates the admin's movies by title (cursor-based, ?after=/?before=), and renders
     the appropriate template based on the request type.
+    With a 'q' argument, the admin's movies are searched instead and
+    ranked full-text results are shown, one keyset page at a time.
     Parameters:
     None
     Returns:
     render_template: A rendered template displaying the admin's movies.
     """
-    if not admin_logged_in():
-        return handle_not_logged_in()
-
     admin = admin_logged_in()
 
-    if admin is None:
-        return handle_invalid_admin()  # Handle case where admin is not logged in
-
     # Filter movies by the current admin's ID
-    num_movies = Movie.query.filter_by(admin_id=admin.id).count()
-    total_num_movies = Movie.query.count()
+    stats = get_admin_stats(admin.id)
+    num_movies = stats.num_movies
+    total_num_movies = stats.num_movies_total
 
     # Pagination for admin's movies
-    page = request.args.get('page', 1, type=int)
     per_page = 5
-    movies = Movie.query.filter_by(admin_id=admin.id).paginate(page=page, per_page=per_page)
+
+    q = request.args.get('q', '').strip()
+    if q:
+        search_results, next_cursor = search_movies_page(q, admin_id=admin.id, after=request.args.get('after'),
+                                                         per_page=per_page)
+        return render_template('manage_movies.html',
+                               num_movies=num_movies,
+                               admin=admin,
+                               total_num_movies=total_num_movies,
+                               q=q,
+                               search_results=search_results,
+                               next_cursor=next_cursor)
+
+    # Keyset pagination by title, served by the (admin_id, title) index
+    movies = paginate_keyset(with_listing_relationships(Movie.query.filter_by(admin_id=admin.id)),
+                             [Movie.title, Movie.id], request.args.get('after'), request.args.get('before'),
+                             per_page, total=num_movies)
 
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
         # Render and return only the table and pagination controls for AJAX requests
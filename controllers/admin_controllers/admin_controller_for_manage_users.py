@@ -1,8 +1,8 @@
 from flask import render_template, request
-from models import User, Movie
-from controllers.common_fun import (admin_logged_in,
-                                    handle_invalid_admin,
-                                    handle_not_logged_in)
+from models import User
+from datamanager.stats_service import get_admin_stats
+from datamanager.keyset import paginate_keyset
+from controllers.common_fun import admin_logged_in
 
 
 def manage_users():
@@ -13,7 +13,8 @@ def manage_users():
     and the user is redirected to the login page.
     The function then fetches the admin from the database,
     counts the number of users and movies
-    associated with the admin, and paginates the users for display.
+    associated with the admin, and paginates the users for display
+    (cursor-based, ?after=/?before=).
     If the request is an AJAX request, the function renders and
     returns only the table and
     pagination controls. Otherwise, it renders
@@ -26,23 +27,18 @@ def manage_users():
     pagination controls for AJAX requests.
     render_template: A rendered template displaying the user management page.
     """
-    if not admin_logged_in():
-        return handle_not_logged_in()
-
     admin = admin_logged_in()
 
-    if admin is None:
-        return handle_invalid_admin()  # Handle case where admin is not logged in
-
     # Count users and movies for display purposes, filtering by admin_id
-    num_users = User.query.filter_by(admin_id=admin.id).count()
-    num_movies = Movie.query.filter_by(admin_id=admin.id).count()
+    stats = get_admin_stats(admin.id)
+    num_users = stats.num_users
+    num_movies = stats.num_movies
 
-    page = request.args.get('page', 1, type=int)
     per_page = 5  # Set how many users to display per page
 
-    # Paginate users, filtering by admin_id
-    users = User.query.filter_by(admin_id=admin.id).paginate(page=page, per_page=per_page)
+    # Keyset-paginate users by id, filtering by admin_id
+    users = paginate_keyset(User.query.filter_by(admin_id=admin.id), [User.id],
+                            request.args.get('after'), request.args.get('before'), per_page, total=num_users)
 
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
         # Render and return only the table and pagination controls for AJAX requests
@@ -1,9 +1,6 @@
 from flask import render_template
-from models import User, Movie
-from controllers.common_fun import (admin_logged_in,
-                                    handle_invalid_admin,
-                                    handle_not_logged_in
-                                    )
+from datamanager.stats_service import get_admin_stats
+from controllers.common_fun import admin_logged_in
 
 
 def reports():
@@ -17,28 +14,16 @@ def reports():
         - Rendered HTML page with reports data if admin is logged in.
         - Redirects to login page if admin is not logged in.
     """
-    if not admin_logged_in():
-        return handle_not_logged_in()
-
     admin = admin_logged_in()
 
-    if admin is None:
-        return handle_invalid_admin()  # Handle case where admin is not logged in
-
-    # Filter movies by the current admin's ID
-    num_users = User.query.filter_by(admin_id=admin.id).count()
-    # Filter movies by the current admin's ID
-    num_movies = Movie.query.filter_by(admin_id=admin.id).count()
-
-    # Count all users and movies for display purposes
-    num_users_total = User.query.count()
-    num_movies_total = Movie.query.count()
+    # Read the admin's user and movie counters and the site totals from the Counter table
+    stats = get_admin_stats(admin.id)
 
     # Render the full page
     return render_template('reports.html',
-                           num_users=num_users,
-                           num_movies=num_movies,
+                           num_users=stats.num_users,
+                           num_movies=stats.num_movies,
                            admin=admin,
-                           num_users_total=num_users_total,
-                           num_movies_total=num_movies_total
+                           num_users_total=stats.num_users_total,
+                           num_movies_total=stats.num_movies_total
                            )
@@ -0,0 +1,182 @@
+"""
+api_common.py
+
+This module contains the shared parts of the JSON API (blueprints/api.py):
+the compact serializers of movies, users and report rows, field selection,
+the page envelope and the login checks. Responses are compressed
+by compress_response (controllers/common_fun.py), like every page.
+
+Every listing answers:
+
+    {"items": [...], "start": 0, "page": 1, "pages": 3, "total": 12,
+     "prev": <cursor or null>, "next": <cursor or null>}
+
+Items only carry the fields asked for with ?fields=id,title (all of the
+serializer's fields by default). Lists use the same keyset cursors as the
+HTML pages (datamanager/keyset.py), so ?after= and ?before= values can be
+passed from one to the other.
+
+The exception is the public catalog, /api/movies: like /movies_home it can
+be sorted by any column, so it is paginated by page number (?page=) and its
+prev and next are page numbers instead of cursors.
+"""
+
+import json
+from functools import wraps
+from flask import request, session, make_response
+from controllers.common_fun import admin_logged_in, user_logged_in
+
+MAX_PER_PAGE = 50
+
+
+def _names(items):
+    return [item.name for item in items]
+
+
+# Field name -> function reading it from the object
+MOVIE_FIELDS = {
+    'id': lambda movie: movie.id,
+    'title': lambda movie: movie.title,
+    'director': lambda movie: movie.director.name if movie.director else None,
+    'year': lambda movie: movie.year,
+    'rating': lambda movie: movie.rating,
+    'genres': lambda movie: _names(movie.genres),
+    'user': lambda movie: movie.user.name if movie.user else None,
+    'imdbID': lambda movie: movie.imdbID,
+    'poster': lambda movie: movie.poster,
+}
+
+CATALOG_FIELDS = {
+    'id': lambda movie: movie.id,
+    'imdbID': lambda movie: movie.imdbID,
+    'title': lambda movie: movie.title,
+    'director': lambda movie: movie.director.name if movie.director else None,
+    'year': lambda movie: movie.year,
+    'rating': lambda movie: movie.rating,
+    'genres': lambda movie: _names(movie.genres),
+    'poster': lambda movie: movie.poster,
+}
+
+USER_FIELDS = {
+    'id': lambda user: user.id,
+    'name': lambda user: user.name,
+    'email': lambda user: user.email,
+}
+
+# UserMovieCount rows of the users report (datamanager/stats_service.py)
+REPORT_FIELDS = {
+    'id': lambda row: row.user.id,
+    'name': lambda row: row.user.name,
+    'movies_count': lambda row: row.movies_count,
+}
+
+
+def api_error(message, status):
+    """
+    Build a JSON error response.
+
+    Parameters:
+    message (str): The error message.
+    status (int): The HTTP status code.
+
+    Returns:
+    Response: {"error": message} with the status.
+    """
+    return json_response({'error': message}, status)
+
+
+def json_response(payload, status=200):
+    """Serialize a payload without whitespace into a JSON response."""
+    body = json.dumps(payload, separators=(',', ':'), ensure_ascii=False)
+    response = make_response(body, status)
+    response.mimetype = 'application/json'
+    return response
+
+
+def selected_fields(available):
+    """
+    Read ?fields= for a serializer.
+
+    Parameters:
+    available (dict): The serializer, e.g. MOVIE_FIELDS.
+
+    Returns:
+    list[str]: The requested field names, or all of them when ?fields= is missing.
+
+    Raises:
+    ValueError: If a requested field does not exist.
+    """
+    fields = [name.strip() for name in request.args.get('fields', '').split(',') if name.strip()]
+    unknown = [name for name in fields if name not in available]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. "
+                         f"Available: {', '.join(available)}")
+    return fields or list(available)
+
+
+def requested_per_page(default):
+    """Read ?per_page=, between 1 and MAX_PER_PAGE."""
+    return min(max(request.args.get('per_page', default, type=int), 1), MAX_PER_PAGE)
+
+
+def serialize(items, available, fields):
+    """
+    Serialize objects with the selected fields of a serializer.
+
+    Parameters:
+    items (iterable): The objects.
+    available (dict): The serializer.
+    fields (list[str]): The fields to include.
+
+    Returns:
+    list[dict]: One dict per object.
+    """
+    readers = [(name, available[name]) for name in fields]
+    return [{name: read(item) for name, read in readers} for item in items]
+
+
+def page_response(page, available, items=None):
+    """
+    Build the response of one keyset page of a listing.
+
+    Parameters:
+    page (KeysetPage): The page.
+    available (dict): The serializer of its items.
+    items (list): The objects to serialize, if not page.items (e.g. report rows).
+
+    Returns:
+    Response: The page envelope, or a 400 error for unknown fields.
+    """
+    try:
+        fields = selected_fields(available)
+    except ValueError as e:
+        return api_error(str(e), 400)
+    return json_response({
+        'items': serialize(page.items if items is None else items, available, fields),
+        'start': page.start,
+        'page': page.page,
+        'pages': page.pages,
+        'total': page.total,
+        'prev': page.prev_cursor,
+        'next': page.next_cursor,
+    })
+
+
+def api_admin_required(view):
+    """Like admin_required, but answers 401 JSON instead of redirecting to the login page."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not session.get('admin_id') or admin_logged_in() is None:
+            return api_error('Admin login required.', 401)
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def api_user_required(view):
+    """Like user_required, but answers 401 JSON instead of redirecting to the login page."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not session.get('user_id') or user_logged_in() is None:
+            return api_error('User login required.', 401)
+        return view(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,166 @@
+from flask import request
+from models import db, User, Movie, Favorite
+from datamanager.counters import MOVIES_TOTAL, USERS_TOTAL, get_total
+from datamanager.catalog_facets import CatalogFilters
+from datamanager.movie_queries import with_listing_relationships, get_unique_movies_page, count_unique_movies
+from datamanager.stats_service import user_movie_counts_query, to_user_movie_counts
+from datamanager.keyset import paginate_keyset
+from controllers.common_fun import admin_logged_in, user_logged_in
+from controllers.api_controllers.api_common import (MOVIE_FIELDS, CATALOG_FIELDS, USER_FIELDS, REPORT_FIELDS,
+                                                     api_error, json_response, page_response, requested_per_page,
+                                                     selected_fields, serialize)
+
+
+def _cursors():
+    """Return the ?after= and ?before= cursors of the request."""
+    return request.args.get('after'), request.args.get('before')
+
+
+def api_catalog_movies():
+    """
+    List the films of the public catalog, like /movies_home: sorted (sort, order),
+    narrowed down by the facet arguments and paginated by page number.
+
+    Parameters:
+    None
+
+    Returns:
+    Response: {"items", "start", "page", "pages", "total", "prev", "next"},
+    where prev and next are page numbers or null.
+    """
+    try:
+        fields = selected_fields(CATALOG_FIELDS)
+    except ValueError as e:
+        return api_error(str(e), 400)
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = requested_per_page(10)
+    filters = CatalogFilters.from_args(request.args)
+
+    movies = get_unique_movies_page(request.args.get('sort', 'title'), request.args.get('order', 'asc'),
+                                    page, per_page, filters)
+    total = count_unique_movies(filters)
+    pages = max((total + per_page - 1) // per_page, 1)
+    return json_response({
+        'items': serialize(movies, CATALOG_FIELDS, fields),
+        'start': (page - 1) * per_page,
+        'page': page,
+        'pages': pages,
+        'total': total,
+        'prev': page - 1 if page > 1 else None,
+        'next': page + 1 if page < pages else None,
+    })
+
+
+def api_admin_movies():
+    """
+    List the current admin's movies by title, like Manage Movies.
+
+    Returns:
+    Response: One keyset page of movies.
+    """
+    admin = admin_logged_in()
+    movies = paginate_keyset(with_listing_relationships(Movie.query.filter_by(admin_id=admin.id)),
+                             [Movie.title, Movie.id], *_cursors(), requested_per_page(5),
+                             total=admin.movie_count)
+    return page_response(movies, MOVIE_FIELDS)
+
+
+def api_all_movies():
+    """
+    List every movie by id, like Manage All Movies.
+
+    Returns:
+    Response: One keyset page of movies.
+    """
+    movies = paginate_keyset(with_listing_relationships(Movie.query), [Movie.id], *_cursors(),
+                             requested_per_page(5), total=get_total(MOVIES_TOTAL))
+    return page_response(movies, MOVIE_FIELDS)
+
+
+def api_admin_users():
+    """
+    List the current admin's users by id, like Manage Users.
+
+    Returns:
+    Response: One keyset page of users.
+    """
+    admin = admin_logged_in()
+    users = paginate_keyset(User.query.filter_by(admin_id=admin.id), [User.id], *_cursors(),
+                            requested_per_page(5), total=admin.user_count)
+    return page_response(users, USER_FIELDS)
+
+
+def api_all_users():
+    """
+    List every user by id, like Manage All Users.
+
+    Returns:
+    Response: One keyset page of users.
+    """
+    users = paginate_keyset(User.query, [User.id], *_cursors(), requested_per_page(5),
+                            total=get_total(USERS_TOTAL))
+    return page_response(users, USER_FIELDS)
+
+
+def api_users_report():
+    """
+    List the current admin's users with the number of movies each added,
+    like the users report.
+
+    Returns:
+    Response: One keyset page of report rows.
+    """
+    admin = admin_logged_in()
+    rows = paginate_keyset(user_movie_counts_query(admin.id).order_by(None), [User.id], *_cursors(),
+                           requested_per_page(5), total=admin.user_count, key=lambda row: (row[0].id,))
+    return page_response(rows, REPORT_FIELDS, to_user_movie_counts(rows.items))
+
+
+def api_user_movies_report(user_id):
+    """
+    List the movies added by one user by title, like the report's details view.
+
+    Parameters:
+    user_id (int): The ID of the user.
+
+    Returns:
+    Response: One keyset page of movies, or 404 if the user does not exist.
+    """
+    user = db.session.get(User, user_id)
+    if user is None:
+        return api_error('User not found.', 404)
+    movies = paginate_keyset(with_listing_relationships(Movie.query.filter_by(user_id=user_id)),
+                             [Movie.title, Movie.id], *_cursors(), requested_per_page(5),
+                             total=user.movie_count)
+    return page_response(movies, MOVIE_FIELDS)
+
+
+def api_my_movies():
+    """
+    List the current user's movies that are not among their favorites, by title,
+    like My Movies.
+
+    Returns:
+    Response: One keyset page of movies.
+    """
+    user = user_logged_in()
+    favorite_movie_ids = [f.movie_id for f in Favorite.query.filter_by(user_id=user.id).all()]
+    query = Movie.query.filter(Movie.user_id == user.id).filter(Movie.id.notin_(favorite_movie_ids))
+    movies = paginate_keyset(with_listing_relationships(query), [Movie.title, Movie.id], *_cursors(),
+                             requested_per_page(5), total=query.count())
+    return page_response(movies, MOVIE_FIELDS)
+
+
+def api_favorites():
+    """
+    List the current user's favorite movies by movie id, like the favorites page.
+
+    Returns:
+    Response: One keyset page of movies.
+    """
+    user = user_logged_in()
+    query = Movie.query.join(Favorite).filter(Favorite.user_id == user.id, Favorite.movie_id == Movie.id)
+    movies = paginate_keyset(with_listing_relationships(query), [Favorite.movie_id], *_cursors(),
+                             requested_per_page(5), total=user.favorite_count,
+                             key=lambda movie: (movie.id,))
+    return page_response(movies, MOVIE_FIELDS)
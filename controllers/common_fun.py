@@ -6,6 +6,8 @@ admin and user interactions, and genre associations in the movie
 management application.
 """
 
+import gzip
+from functools import wraps
 from sqlalchemy.exc import IntegrityError
 from flask import (
                    request,
@@ -13,45 +15,180 @@ from flask import (
                    url_for,
                    session,
                    flash,
-                   current_app)
-from models import db, Movie, Director,  Genre, Admin, User
+                   make_response,
+                   current_app,
+                   g)
+from models import db, Movie, CatalogMovie, Admin, User
 from blueprints.utils import fetch_movie_data
+from datamanager import counters, fragment_cache
+from datamanager.lookups import resolve_director, resolve_genres
+from datamanager.movie_queries import catalog_imdb_id_for_title, catalog_movie_data
+from datamanager.enrichment_jobs import enqueue_enrichment, wake_worker
+
+try:
+    import brotli  # Optional; without it responses are gzip-compressed only
+except ImportError:
+    brotli = None
+
+COMPRESS_MIN_SIZE = 512  # Bytes; smaller bodies are sent as they are
+COMPRESSIBLE_MIMETYPES = {'text/html', 'text/plain', 'text/css', 'text/javascript',
+                          'application/javascript', 'application/json'}
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
 
 
 def admin_logged_in():
-    """Check if the admin is logged in."""
-    admin_id = session.get('admin_id')
-    if admin_id:
-        return Admin.query.get(admin_id)  # This should return the Admin object or None
-    return None
+    """
+    Return the logged-in Admin object or None.
+    The admin is looked up once per request and cached on flask.g.
+    """
+    if 'admin' not in g:
+        admin_id = session.get('admin_id')
+        g.admin = db.session.get(Admin, admin_id) if admin_id else None
+    return g.admin
 
 
 def user_logged_in():
-    """Check if the user is logged in."""
-    user_id = session.get('user_id')
-    if user_id:
-        return User.query.get(user_id)  # This should return the User object or None
-    return None
+    """
+    Return the logged-in User object or None.
+    The user is looked up once per request and cached on flask.g.
+    """
+    if 'user' not in g:
+        user_id = session.get('user_id')
+        g.user = db.session.get(User, user_id) if user_id else None
+    return g.user
+
+
+def admin_required(view):
+    """
+    Decorator for admin routes. Redirects to the login page unless the session
+    belongs to an existing admin; the view reads the admin via admin_logged_in().
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not session.get('admin_id'):
+            return handle_not_logged_in()
+        if admin_logged_in() is None:
+            return handle_invalid_admin()
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def user_required(view):
+    """
+    Decorator for user routes. Redirects to the login page unless the session
+    belongs to an existing user; the view reads the user via user_logged_in().
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not session.get('user_id'):
+            return handle_not_logged_in()
+        if user_logged_in() is None:
+            return handle_invalid_user()
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def catalog_namespaces():
+    """Fragment cache namespaces of the pages listing or showing catalog films."""
+    return [fragment_cache.CATALOG, fragment_cache.LABELS]
+
+
+def user_list_namespaces():
+    """Fragment cache namespaces of the logged-in user's movie and favorite lists."""
+    return [fragment_cache.user_namespace(session.get('user_id')), fragment_cache.LABELS]
+
+
+def user_movie_namespaces():
+    """Fragment cache namespaces of a movie page of the logged-in user."""
+    return catalog_namespaces() + [fragment_cache.user_namespace(session.get('user_id'))]
+
+
+def conditional_get(namespaces):
+    """
+    Decorator for GET pages whose content only changes with the fragment cache
+    namespaces they are built from. Pages get an ETag and a Last-Modified
+    derived from the namespace versions and the deploy's BUILD_ID (app.py),
+    and a client that already has the current version gets 304 Not Modified
+    without the view running.
+
+    Parameters:
+    namespaces (callable): Returns the namespaces of the page, called once per request.
+
+    Returns:
+    function: The decorator.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            # Flashed messages are shown once, so such a page is always rendered
+            if request.method != 'GET' or session.get('_flashes'):
+                return view(*args, **kwargs)
+
+            etag, last_modified = fragment_cache.page_version(
+                namespaces(), request.full_path, request.headers.get('X-Requested-With'),
+                session.get('admin_id'), session.get('user_id'), current_app.config.get('BUILD_ID'))
+            if request.if_none_match:
+                not_modified = request.if_none_match.contains_weak(etag)
+            else:
+                not_modified = bool(request.if_modified_since) and last_modified <= request.if_modified_since
+
+            response = make_response('', 304) if not_modified else make_response(view(*args, **kwargs))
+            if response.status_code in (200, 304):
+                response.set_etag(etag)
+                response.last_modified = last_modified
+                # Browsers keep the page but ask again every time
+                response.headers['Cache-Control'] = 'private, no-cache'
+                response.vary.update(('Cookie', 'X-Requested-With'))
+            return response
+        return wrapper
+    return decorator
+
+
+def compress_response(response):
+    """
+    Compress a page or JSON response with brotli or gzip, whichever the client
+    accepts (brotli preferred when installed). Files sent from disk are left
+    alone; the built assets have pre-compressed copies (datamanager/static_assets.py).
+
+    Parameters:
+    response (Response): The response of a view.
+
+    Returns:
+    Response: The same response, compressed when worthwhile.
+    """
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES or 'Content-Encoding' in response.headers):
+        return response
+    response.vary.add('Accept-Encoding')
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_SIZE:
+        return response
+
+    if brotli is not None and request.accept_encodings['br']:
+        data, encoding = brotli.compress(data, quality=BROTLI_QUALITY), 'br'
+    elif request.accept_encodings['gzip']:
+        data, encoding = gzip.compress(data, compresslevel=GZIP_LEVEL), 'gzip'
+    else:
+        return response
+    response.set_data(data)
+    response.headers['Content-Encoding'] = encoding
+    # The encodings differ byte for byte, so their shared ETag can only be weak
+    etag, _ = response.get_etag()
+    if etag:
+        response.set_etag(etag, weak=True)
+    return response
 
 
 def handle_not_logged_in():
     """Handle case where admin is not logged in."""
     session.clear()
-    clear_cache()
     return redirect(url_for('login'))
 
 
-def clear_cache():
-    """Clear cache if it exists."""
-    current_cache = current_app.extensions.get('cache')
-    if current_cache and hasattr(current_cache, 'clear'):
-        current_cache.clear()
-
-
 def handle_invalid_admin():
     """Handle case where admin is invalid."""
     session.clear()
-    clear_cache()
     flash('You must be logged in as an admin.', 'warning')
     return redirect(url_for('login'))
 
@@ -59,7 +196,6 @@ def handle_invalid_admin():
 def handle_invalid_user():
     """Handle the case where the user is not valid."""
     session.clear()
-    clear_cache()
     flash('Invalid user. Please log in again.', 'error')
     return redirect(url_for('login'))  # Redirect to login page
 
@@ -103,12 +239,11 @@ def create_movie_from_data(movie_data, admin):
         director_id=director.id,
         year=movie_data.get('Year'),
         rating=rating,
-        poster=get_movie_poster(movie_data),
-        imdbID=movie_data.get('imdbID') or '',
-        trailer=movie_data.get('Trailer') or '',  # Include the trailer URL
-        plot=movie_data.get('Plot') or '',
         user_id=request.form.get('user_id') or None,
-        admin_id=admin.id
+        admin_id=admin.id,
+        catalog_movie=find_or_create_catalog_movie(
+            movie_data, director.id, rating, get_movie_poster(movie_data)
+        )
     )
 
     handle_genres(new_movie, movie_data)
@@ -127,7 +262,10 @@ def handle_add_movie_post(admin):
         flash('Movie with this title already exists.', 'warning')
         return redirect(url_for('admin_bp.manage_movies'))
 
-    movie_data = fetch_movie_data(title)
+    # A film picked from the title autocomplete is copied from the catalog without
+    # an API call; otherwise the trailer is looked up by the background enrichment job
+    movie_data = (catalog_movie_data(request.form.get('imdb_id'))
+                  or fetch_movie_data(title, imdb_id=catalog_imdb_id_for_title(title)))
     if not movie_data:
         return handle_missing_movie_data()
 
@@ -139,13 +277,44 @@ def handle_add_movie_post(admin):
 
 
 def find_or_create_director(director_name):
-    """Find or create a director in the database."""
-    director = Director.query.filter_by(name=director_name).first()
-    if not director:
-        director = Director(name=director_name)
-        db.session.add(director)
-        db.session.commit()
-    return director
+    """
+    Find or create a director; it is committed together with the movie.
+    Returns None if the name is blank.
+    """
+    return resolve_director(director_name)
+
+
+def handle_missing_director(endpoint, **values):
+    """Handle an edit form submitted without a director."""
+    flash('Director is required.', 'error')
+    return redirect(url_for(endpoint, **values))
+
+
+def find_or_create_catalog_movie(movie_data, director_id, rating, poster):
+    """
+    Find the catalog entry for the fetched movie by its imdbID,
+    or create it from the API data, genres included. Returns None if the data
+    has no imdbID. A new entry is saved together with the movie that links to it;
+    an existing one keeps its metadata.
+    """
+    imdb_id = movie_data.get('imdbID')
+    if not imdb_id:
+        return None
+
+    catalog_movie = CatalogMovie.query.filter_by(imdbID=imdb_id).first()
+    if not catalog_movie:
+        catalog_movie = CatalogMovie(
+            imdbID=imdb_id,
+            title=movie_data.get('Title'),
+            director_id=director_id,
+            year=movie_data.get('Year'),
+            rating=rating,
+            poster=poster,
+            trailer=movie_data.get('Trailer') or '',  # Include the trailer URL
+            plot=movie_data.get('Plot') or '',
+            genres=resolve_genres([name.strip() for name in (movie_data.get('Genre') or '').split(',')])
+        )
+    return catalog_movie
 
 
 def get_movie_rating(movie_data):
@@ -171,12 +340,7 @@ def handle_genres(movie, movie_data):
     genre_names = [name.strip() for name in genre_string.split(',') if name.strip()]
     existing_genres = {genre.id for genre in movie.genres}
 
-    for genre_name in genre_names:
-        genre = Genre.query.filter_by(name=genre_name).first()
-        if not genre:
-            genre = Genre(name=genre_name)
-            db.session.add(genre)
-            db.session.commit()
+    for genre in resolve_genres(genre_names):
         if genre.id not in existing_genres:
             movie.genres.append(genre)
 
@@ -185,7 +349,10 @@ def save_new_movie(movie):
     """Save the new movie to the database."""
     try:
         db.session.add(movie)
+        enqueue_enrichment(movie.catalog_movie)
+        counters.movie_added(movie)
         db.session.commit()
+        wake_worker()
         flash('Movie added successfully!', 'success')
         return redirect(url_for('admin_bp.manage_movies'))
     except IntegrityError as e:
@@ -221,6 +388,7 @@ def update_movie(movie, form_data, director, admin):
     movie.director_id = director.id
     movie.year = form_data['year']
     movie.rating = form_data['rating']
+    counters.movie_admin_changed(movie.admin_id, admin.id)
     movie.admin_id = admin.id
 
 
@@ -236,13 +404,7 @@ def handle_genres_for_movie(movie, genre_string):
     genres_to_remove = existing_genre_names - genre_names
 
     # Add new genres
-    for genre_name in genres_to_add:
-        genre = Genre.query.filter_by(name=genre_name).first()
-        if not genre:
-            genre = Genre(name=genre_name)
-            db.session.add(genre)
-            db.session.commit()
-        movie.genres.append(genre)
+    movie.genres.extend(resolve_genres(sorted(genres_to_add)))
 
     # Remove old genres
     for genre_name in genres_to_remove:
@@ -277,7 +439,10 @@ def handle_post_request_add_movie_by_user():
         flash('Movie with this title already exists.', 'warning')
         return redirect(url_for('user_bp.my_movies'))
 
-    movie_data = fetch_movie_data(movie_title)
+    # A film picked from the title autocomplete is copied from the catalog without
+    # an API call; otherwise the trailer is looked up by the background enrichment job
+    movie_data = (catalog_movie_data(request.form.get('imdb_id'))
+                  or fetch_movie_data(movie_title, imdb_id=catalog_imdb_id_for_title(movie_title)))
     if not movie_data:
         flash('Movie not found in the API.', 'error')
         return redirect(url_for('user_bp.user_add_movie'))
@@ -316,7 +481,10 @@ def process_movie_data(movie_data, user_id):
 
     try:
         db.session.add(new_movie)
+        enqueue_enrichment(new_movie.catalog_movie)
+        counters.movie_added(new_movie)
         db.session.commit()
+        wake_worker()
         flash('Movie added successfully!', 'success')
         return redirect(url_for('user_bp.my_movies'))
     except IntegrityError as e:
@@ -334,21 +502,19 @@ def parse_rating(rating_str):
 
 
 def create_movie_object(movie_data, user_id, director_id, rating):
-    """Create a new Movie object."""
+    """Create a new Movie object linked to its catalog entry."""
+    poster = (
+            movie_data.get('Poster')
+            or url_for('static', filename='images/default_movie_poster.jpg')
+    )
     return Movie(
         title=movie_data.get('Title'),
         director_id=director_id,
         year=movie_data.get('Year') or None,
         rating=rating,
-        poster=(
-                movie_data.get('Poster')
-                or url_for('static', filename='images/default_movie_poster.jpg')
-        ),
-        imdbID=movie_data.get('imdbID') or '',
-        trailer=movie_data.get('Trailer') or '',  # Include the trailer URL
-        plot=movie_data.get('Plot') or '',
         user_id=user_id,
-        admin_id=request.form.get('admin_id') or None
+        admin_id=request.form.get('admin_id') or None,
+        catalog_movie=find_or_create_catalog_movie(movie_data, director_id, rating, poster)
     )
 
 
@@ -357,12 +523,7 @@ def handle_genres_for_user(genre_string, new_movie):
     genre_names = [name.strip() for name in genre_string.split(',') if name.strip()]
     existing_genres = {genre.id for genre in new_movie.genres}
 
-    for genre_name in genre_names:
-        genre = Genre.query.filter_by(name=genre_name).first()
-        if not genre:
-            genre = Genre(name=genre_name)
-            db.session.add(genre)
-            db.session.commit()
+    for genre in resolve_genres(genre_names):
         if genre.id not in existing_genres:
             new_movie.genres.append(genre)
             existing_genres.add(genre.id)
@@ -378,13 +539,7 @@ def update_movie_genres(movie, genre_string):
     genres_to_remove = existing_genre_names - genre_names
 
     # Add new genres
-    for genre_name in genres_to_add:
-        genre = Genre.query.filter_by(name=genre_name).first()
-        if not genre:
-            genre = Genre(name=genre_name)
-            db.session.add(genre)
-            db.session.commit()
-        movie.genres.append(genre)
+    movie.genres.extend(resolve_genres(sorted(genres_to_add)))
 
     # Remove genres that are no longer associated with the movie
     for genre_name in genres_to_remove:
@@ -394,10 +549,12 @@ def update_movie_genres(movie, genre_string):
 
 def handle_movie_update(movie):
     """Process the movie update logic."""
-    movie.title = request.form.get('title')
     director_name = request.form.get('director')
     director = find_or_create_director(director_name)
+    if director is None:
+        return handle_missing_director('user_bp.user_edit_movie', movie_id=movie.id)
 
+    movie.title = request.form.get('title')
     movie.director_id = director.id
     movie.year = int(request.form.get('year', movie.year))
     movie.rating = float(request.form.get('rating', movie.rating))
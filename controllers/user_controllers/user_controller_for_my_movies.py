@@ -1,45 +1,60 @@
 from flask import render_template, request
+from markupsafe import Markup
 from models import Movie, Favorite
-from controllers.common_fun import (user_logged_in,
-                                    handle_invalid_user,
-                                    handle_not_logged_in)
+from datamanager.movie_queries import with_listing_relationships
+from datamanager.movie_search import search_movies_page
+from datamanager.keyset import paginate_keyset
+from datamanager import fragment_cache
+from datamanager.fragment_cache import cached_fragment, user_namespace
+from controllers.common_fun import user_logged_in
 
 
 def my_movies():
     """
     Display the list of movies added by the current user,
     excluding their favorite movies.
+    With a 'q' argument, shows ranked full-text search results over
+    the same movies instead, one keyset page (after=<cursor>) at a time.
     Parameters:
     None
     Returns:
     render_template: A rendered HTML template with
     the list of movies and pagination details.
     """
-    if not user_logged_in():
-        return handle_not_logged_in()  # Handle case where user is not logged in
-
     user = user_logged_in()
-
-    if user is None:
-        return handle_invalid_user()
-    # Get the current page from query parameters, default to 1
-    page = request.args.get('page', 1, type=int)
     per_page = 5  # Number of movies per page
 
-    # Query to get the favorite movies of the user
-    favorite_movie_ids = [f.movie_id for f in Favorite.query.filter_by(user_id=user.id).all()]
-
-    # Query to get all movies added by the current user,
-    # excluding the user's favorite movies
-    movies_query = (
-        Movie.query
-        .filter(Movie.user_id == user.id)
-        .filter(Movie.id.notin_(favorite_movie_ids))
-    )
-    # Count the total number of movies after filtering
-    num_movies = movies_query.count()
-
-    # Paginate the filtered query
-    movies = movies_query.paginate(page=page, per_page=per_page, error_out=False)
-
-    return render_template('my_movies.html', num_movies=num_movies, movies=movies)
+    def movies_query():
+        # Query to get all movies added by the current user,
+        # excluding the user's favorite movies
+        favorite_movie_ids = [f.movie_id for f in Favorite.query.filter_by(user_id=user.id).all()]
+        return favorite_movie_ids, (
+            Movie.query
+            .filter(Movie.user_id == user.id)
+            .filter(Movie.id.notin_(favorite_movie_ids))
+        )
+
+    q = request.args.get('q', '').strip()
+    if q:
+        favorite_movie_ids, query = movies_query()
+        search_results, next_cursor = search_movies_page(q, user_id=user.id, exclude_ids=favorite_movie_ids,
+                                                         after=request.args.get('after'), per_page=per_page)
+        return render_template('my_movies.html', num_movies=query.count(), q=q,
+                               search_results=search_results, next_cursor=next_cursor)
+
+    def render_movies_page():
+        favorite_movie_ids, query = movies_query()
+        # Count the total number of movies after filtering
+        num_movies = query.count()
+        # Keyset-paginate the filtered query by title, served by the (user_id, title) index
+        movies = paginate_keyset(with_listing_relationships(query), [Movie.title, Movie.id],
+                                 request.args.get('after'), request.args.get('before'), per_page, total=num_movies)
+        return num_movies, Markup(render_template('partials/my_movies_content.html',
+                                                  num_movies=num_movies, movies=movies))
+
+    # Each page is rendered once per version of the user's lists
+    num_movies, movies_html = cached_fragment(
+        [user_namespace(user.id), fragment_cache.LABELS], 'my-movies', render_movies_page,
+        user.id, request.args.get('after'), request.args.get('before'))
+
+    return render_template('my_movies.html', num_movies=num_movies, movies_html=movies_html)
@@ -5,10 +5,8 @@ from flask import (request,
                    )
 
 from models import db, Movie, Favorite
-from controllers.common_fun import (user_logged_in,
-                                    handle_invalid_user,
-                                    handle_not_logged_in
-                                    )
+from datamanager import counters
+from controllers.common_fun import user_logged_in
 
 
 def remove_from_favorites(movie_id):
@@ -20,14 +18,8 @@ def remove_from_favorites(movie_id):
     Redirects to the user's favorite movies page with
     a success message or an error message.
     """
-    if not user_logged_in():
-        return handle_not_logged_in()  # Handle case where user is not logged in
-
     user = user_logged_in()
 
-    if user is None:
-        return handle_invalid_user()
-
     movie = Movie.query.get(movie_id)
 
     if not movie:
@@ -42,11 +34,12 @@ def remove_from_favorites(movie_id):
 
     # Remove movie from favorites
     db.session.delete(favorite)
+    counters.favorite_removed(user.id)
     db.session.commit()
     flash('Movie removed from favorites!', 'success')
 
     # Get the updated number of favorite movies
-    num_favorites = Favorite.query.filter_by(user_id=user.id).count()
+    num_favorites = user.favorite_count
 
     # Redirect to the same page after removing from favorites
     return redirect(
@@ -3,11 +3,9 @@ from flask import (redirect,
                    flash
                    )
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError, OperationalError
-from models import db, Movie
-from controllers.common_fun import (user_logged_in,
-                                    handle_invalid_user,
-                                    handle_not_logged_in
-                                    )
+from models import db, Movie, Favorite
+from datamanager import counters
+from controllers.common_fun import user_logged_in
 
 
 def delete_movie(movie_id):
@@ -23,20 +21,17 @@ def delete_movie(movie_id):
     - If an error occurs during the deletion process,
       it rolls back the changes and displays an error message.
     """
-    if not user_logged_in():
-        return handle_not_logged_in()  # Handle case where user is not logged in
-
     user = user_logged_in()
 
-    if user is None:
-        return handle_invalid_user()
-
     # Get the movie and check if it belongs to the current user
     movie = Movie.query.filter_by(id=movie_id, user_id=user.id).first_or_404()
 
     try:
         # Remove associations from the movie_genre association table
         movie.genres.clear()
+        counters.movie_removed(movie)
+        # Remove any associated favorites
+        Favorite.query.filter_by(movie_id=movie_id).delete()
 
         # Now delete the movie
         db.session.delete(movie)
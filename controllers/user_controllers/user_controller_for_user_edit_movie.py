@@ -9,8 +9,6 @@ from flask import (
                    )
 from models import Movie, Genre
 from controllers.common_fun import (user_logged_in,
-                                    handle_invalid_user,
-                                    handle_not_logged_in,
                                     handle_movie_update)
 
 
@@ -18,14 +16,8 @@ def user_edit_movie(movie_id):
     """
     Handles the editing of a movie by a user.
     """
-    if not user_logged_in():
-        return handle_not_logged_in()  # Handle case where user is not logged in
-
     user = user_logged_in()
 
-    if user is None:
-        return handle_invalid_user()
-
     movie = Movie.query.get_or_404(movie_id)
 
     if movie.user_id != user.id:
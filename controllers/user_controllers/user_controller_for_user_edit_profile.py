@@ -11,8 +11,6 @@ from werkzeug.utils import secure_filename
 from werkzeug.security import generate_password_hash
 from models import db, User
 from controllers.common_fun import (user_logged_in,
-                                    handle_invalid_user,
-                                    handle_not_logged_in,
                                     allowed_file)
 
 
@@ -34,14 +32,8 @@ def edit_user_profile(user_id):
       the 'edit_user_profile.html' template
       with the user's information.
     """
-    if not user_logged_in():
-        return handle_not_logged_in()  # Handle case where user is not logged in
-
     user = user_logged_in()
 
-    if user is None:
-        return handle_invalid_user()  # Handle case where user is not valid
-
     user = User.query.get_or_404(user_id)
 
     if request.method == 'POST':
@@ -1,17 +1,19 @@
 
 from flask import render_template, request
+from markupsafe import Markup
 from models import Movie, Favorite
-from controllers.common_fun import (user_logged_in,
-                                    handle_invalid_user,
-                                    handle_not_logged_in,
-                                    )
+from datamanager.movie_queries import with_listing_relationships
+from datamanager.keyset import paginate_keyset
+from datamanager import fragment_cache
+from datamanager.fragment_cache import cached_fragment, user_namespace
+from controllers.common_fun import user_logged_in
 
 
 def user_favorites():
     """
     This function handles the user's favorite movies page.
     It retrieves the favorite movies of the user
-    from the database and paginates the results.
+    from the database and paginates the results (cursor-based, ?after=/?before=).
 
     Parameters:
     None
@@ -20,27 +22,27 @@ def user_favorites():
     render_template: A rendered HTML template for
     the user's favorite movies page.
     """
-    if not user_logged_in():
-        return handle_not_logged_in()  # Handle case where user is not logged in
-
     user = user_logged_in()
-
-    if user is None:
-        return handle_invalid_user()
-    # Get the current page from query parameters, default to 1
-    page = request.args.get('page', 1, type=int)
     per_page = 5  # Number of movies per page
 
-    # Query to get the favorite movies of the user with pagination
-    user_favorites_query = (
-        Movie.query.join(Favorite)
-        .filter(Favorite.user_id == user.id, Favorite.movie_id == Movie.id)
-    )
-
-    # Count the total number of favorite movies
-    num_favorites = user_favorites_query.count()
-
-    # Paginate the query
-    movies = user_favorites_query.paginate(page=page, per_page=per_page, error_out=False)
-
-    return render_template('user_favorites.html', num_favorites=num_favorites, movies=movies)
+    # Read the total number of favorite movies from the user's counter
+    num_favorites = user.favorite_count
+
+    def render_favorites_page():
+        # Query to get the favorite movies of the user with pagination
+        user_favorites_query = (
+            Movie.query.join(Favorite)
+            .filter(Favorite.user_id == user.id, Favorite.movie_id == Movie.id)
+        )
+        # Keyset-paginate by movie id, served by the (user_id, movie_id) favorite index
+        movies = paginate_keyset(with_listing_relationships(user_favorites_query), [Favorite.movie_id],
+                                 request.args.get('after'), request.args.get('before'), per_page,
+                                 total=num_favorites, key=lambda movie: (movie.id,))
+        return Markup(render_template('partials/user_favorites_content.html', movies=movies))
+
+    # Each page is rendered once per version of the user's lists
+    favorites_html = cached_fragment(
+        [user_namespace(user.id), fragment_cache.LABELS], 'user-favorites', render_favorites_page,
+        user.id, request.args.get('after'), request.args.get('before'))
+
+    return render_template('user_favorites.html', num_favorites=num_favorites, favorites_html=favorites_html)
@@ -3,10 +3,7 @@ from flask import (render_template,
                    url_for,
                    flash)
 from models import Movie
-from controllers.common_fun import (user_logged_in,
-                                    handle_invalid_user,
-                                    handle_not_logged_in
-                                    )
+from controllers.common_fun import user_logged_in
 
 
 def user_view_movie_details(movie_id):
@@ -19,12 +16,7 @@ def user_view_movie_details(movie_id):
     Returns:
     - render_template: A rendered HTML template displaying the movie details.
     """
-    if not user_logged_in():
-        return handle_not_logged_in()  # Redirect if the user is not logged in
-
     user = user_logged_in()
-    if user is None:
-        return handle_invalid_user()
 
     # Query the movie to ensure it belongs to the current user
     movie = Movie.query.filter_by(id=movie_id, user_id=user.id).first()
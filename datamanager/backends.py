@@ -0,0 +1,33 @@
+"""
+backends.py
+
+This module chooses the data manager implementation from the app config.
+DATABASE_BACKEND selects the backend ('sqlite' by default, or 'postgresql');
+the PostgreSQL backend reads its connection string from DATABASE_URL.
+"""
+
+from datamanager.sqlite_data_manager import SQLiteDataManager
+from datamanager.postgres_data_manager import PostgresDataManager
+
+DATA_MANAGERS = {
+    'sqlite': SQLiteDataManager,
+    'postgresql': PostgresDataManager,
+}
+
+
+def create_data_manager(app):
+    """
+    Create the data manager configured for the app. This also configures
+    the database engine and initializes SQLAlchemy on the app.
+
+    Parameters:
+    app (Flask): The Flask application instance.
+
+    Returns:
+    DataManagerInterface: The data manager for the configured backend.
+    """
+    backend = app.config.get('DATABASE_BACKEND', 'sqlite')
+    if backend not in DATA_MANAGERS:
+        raise ValueError(f"Unknown DATABASE_BACKEND '{backend}', "
+                         f"expected one of: {', '.join(DATA_MANAGERS)}")
+    return DATA_MANAGERS[backend](app)
@@ -0,0 +1,424 @@
+"""
+bulk_import.py
+
+This module imports a list of movie titles from a CSV, JSON, JSON Lines or
+plain text file, for the `flask import-movies` command and the admin
+bulk import page.
+
+The file is read as a stream, in batches of BATCH_SIZE titles. For each batch:
+- titles the owner already has are skipped;
+- titles already in the local catalog are added from it without an API call;
+- the rest are fetched from OMDb by a pool of FETCH_WORKERS threads;
+- all directors and genres of the batch are resolved with one query each, and
+  the movies are written in one transaction.
+
+After every committed batch the progress is saved to a JSON checkpoint file,
+so an interrupted import resumes after the last committed batch. Trailers,
+poster checks and full plots are left to the enrichment jobs.
+"""
+
+import csv
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from itertools import islice
+from sqlalchemy import func
+from sqlalchemy.orm import selectinload
+from models import db, Movie, CatalogMovie, Director, Genre
+from blueprints.utils import fetch_movie_data
+from datamanager import counters
+from datamanager.enrichment_jobs import DEFAULT_POSTER, enqueue_enrichment, wake_worker
+from datamanager.lookups import resolve_names
+
+BATCH_SIZE = 100
+FETCH_WORKERS = 8
+ALLOWED_EXTENSIONS = {'csv', 'json', 'jsonl', 'ndjson', 'txt'}
+CHECKPOINT_SUFFIX = '.checkpoint.json'
+MAX_LISTED_TITLES = 100  # Titles not found kept in the checkpoint for the report
+
+
+def _title_key(title):
+    """Key used to compare titles: whitespace collapsed and lower-cased."""
+    return ' '.join(title.split()).lower()
+
+
+def _title_from_record(record):
+    """Return the title of a JSON record: a string or an object with a title field."""
+    if isinstance(record, dict):
+        record = record.get('title') or record.get('Title')
+    return record if isinstance(record, str) else None
+
+
+def read_titles(path):
+    """
+    Stream the titles of an import file, one per record.
+
+    CSV files use their "title" column if the header has one, otherwise the
+    first column. JSON files hold an array of titles or of objects with a
+    "title" field; JSON Lines files hold one such value per line and plain
+    text files one title per line. Only JSON arrays are read into memory at once.
+
+    Parameters:
+    path (str): The file path; its extension selects the format.
+
+    Returns:
+    generator: The title of every record, in file order. Records without a
+    title yield None, so positions in the file stay stable for checkpoints.
+
+    Raises:
+    ValueError: If the file type is not supported.
+    """
+    extension = path.rsplit('.', 1)[-1].lower()
+    if extension not in ALLOWED_EXTENSIONS:
+        raise ValueError(f'Unsupported import file type: .{extension}')
+
+    with open(path, newline='' if extension == 'csv' else None, encoding='utf-8-sig') as f:
+        if extension == 'csv':
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return
+            names = [name.strip().lower() for name in header]
+            column = names.index('title') if 'title' in names else 0
+            if 'title' not in names:
+                yield header[column] if header else None
+            for row in reader:
+                yield row[column] if len(row) > column else None
+        elif extension == 'json':
+            for record in json.load(f):
+                yield _title_from_record(record)
+        elif extension in ('jsonl', 'ndjson'):
+            for line in f:
+                if line.strip():
+                    yield _title_from_record(json.loads(line))
+        else:
+            for line in f:
+                if line.strip():
+                    yield line
+
+
+def checkpoint_path_for(path):
+    """Return the default checkpoint file of an import file."""
+    return path + CHECKPOINT_SUFFIX
+
+
+def load_checkpoint(checkpoint_path):
+    """
+    Read an import checkpoint.
+
+    Parameters:
+    checkpoint_path (str): The checkpoint file.
+
+    Returns:
+    dict: The saved progress, or None if there is no checkpoint.
+    """
+    if not os.path.exists(checkpoint_path):
+        return None
+    with open(checkpoint_path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_checkpoint(checkpoint_path, progress):
+    """Write the progress to the checkpoint file atomically."""
+    progress['updated_at'] = datetime.now().isoformat(timespec='seconds')
+    temporary_path = checkpoint_path + '.tmp'
+    with open(temporary_path, 'w', encoding='utf-8') as f:
+        json.dump(progress, f, indent=2)
+    os.replace(temporary_path, checkpoint_path)
+
+
+def _new_progress(path, admin_id, user_id):
+    """Return the progress of an import that has not started."""
+    return {
+        'source': os.path.basename(path),
+        'size': os.path.getsize(path),
+        'admin_id': admin_id,
+        'user_id': user_id,
+        'position': 0,  # Records read and committed so far
+        'imported': 0,
+        'from_catalog': 0,  # Imported from the local catalog without an API call
+        'skipped': 0,  # Blank titles and movies the owner already has
+        'not_found': 0,
+        'not_found_titles': [],
+        'done': False,
+        'started_at': datetime.now().isoformat(timespec='seconds'),
+    }
+
+
+def _parse_year(year):
+    """Return the first year of an OMDb year such as '2010' or '2010–2014', or 0."""
+    year = (year or '')[:4]
+    return int(year) if year.isdigit() else 0
+
+
+def _parse_rating(rating):
+    """Return the OMDb rating as a float, or 0 if it is missing."""
+    try:
+        return float(rating)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _owned_title_keys(keys, admin_id, user_id):
+    """Return the title keys of movies the owner already has, among keys."""
+    if not keys:
+        return set()
+    owner = Movie.admin_id == admin_id if admin_id else Movie.user_id == user_id
+    rows = (
+        db.session.query(func.lower(Movie.title))
+        .filter(owner, func.lower(Movie.title).in_(keys))
+    )
+    return {title for (title,) in rows}
+
+
+def _new_catalog_movie(data, directors, genres):
+    """Create a catalog entry from OMDb data, queued for enrichment."""
+    genre_names = [name.strip() for name in (data.get('Genre') or '').split(',') if name.strip()]
+    poster = data.get('Poster')
+    catalog_movie = CatalogMovie(
+        imdbID=data['imdbID'],
+        title=data['Title'],
+        director=directors[data['Director']],
+        year=_parse_year(data.get('Year')),
+        rating=_parse_rating(data.get('imdbRating')),
+        poster=poster if poster and poster != 'N/A' else DEFAULT_POSTER,
+        trailer='',
+        plot=data.get('Plot') or '',
+        genres=[genres[name] for name in dict.fromkeys(genre_names) if name in genres]
+    )
+    enqueue_enrichment(catalog_movie)
+    return catalog_movie
+
+
+def _import_batch(titles, progress, pool):
+    """
+    Import one batch of titles in one transaction and update the progress counts.
+
+    Parameters:
+    titles (list): The titles read from the file; None or blank for empty records.
+    progress (dict): The import progress, updated in place.
+    pool (ThreadPoolExecutor): The pool that fetches missing titles from the API.
+
+    Returns:
+    None
+    """
+    admin_id, user_id = progress['admin_id'], progress['user_id']
+    wanted = {}  # title key -> title, first occurrence wins
+    for title in titles:
+        title = ' '.join((title or '').split())
+        if not title or _title_key(title) in wanted:
+            progress['skipped'] += 1
+            continue
+        wanted[_title_key(title)] = title
+
+    owned = _owned_title_keys(list(wanted), admin_id, user_id)
+    progress['skipped'] += len(owned)
+    wanted = {key: title for key, title in wanted.items() if key not in owned}
+
+    # Titles already in the catalog need no API call
+    in_catalog = {}
+    if wanted:
+        entries = (
+            CatalogMovie.query
+            .options(selectinload(CatalogMovie.genres), selectinload(CatalogMovie.director))
+            .filter(func.lower(CatalogMovie.title).in_(list(wanted)))
+            .order_by(CatalogMovie.id)
+        )
+        for entry in entries:
+            in_catalog.setdefault(entry.title.lower(), entry)
+
+    # Fetch the rest concurrently; the movie API client bounds the connections
+    missing = [title for key, title in wanted.items() if key not in in_catalog]
+    fetched = {}  # imdbID -> OMDb data
+    for title, data in zip(missing, pool.map(fetch_movie_data, missing)):
+        if not data or not data.get('imdbID') or not data.get('Title') or not data.get('Director'):
+            progress['not_found'] += 1
+            if len(progress['not_found_titles']) < MAX_LISTED_TITLES:
+                progress['not_found_titles'].append(title)
+            continue
+        fetched.setdefault(data['imdbID'], data)
+
+    # The API may return a title the owner already has or one found twice in this batch
+    owned = _owned_title_keys([_title_key(data['Title']) for data in fetched.values()],
+                              admin_id, user_id)
+    owned.update(in_catalog)
+    new_data = []
+    for data in fetched.values():
+        key = _title_key(data['Title'])
+        if key in owned:
+            progress['skipped'] += 1
+            continue
+        owned.add(key)
+        new_data.append(data)
+
+    # Titles typed differently may still match a catalog entry by imdbID
+    known = {
+        entry.imdbID: entry for entry in
+        CatalogMovie.query
+        .options(selectinload(CatalogMovie.genres), selectinload(CatalogMovie.director))
+        .filter(CatalogMovie.imdbID.in_([data['imdbID'] for data in new_data]))
+    } if new_data else {}
+    unknown = [data for data in new_data if data['imdbID'] not in known]
+    directors = resolve_names(Director, [data['Director'] for data in unknown])
+    genres = resolve_names(Genre, [name.strip() for data in unknown
+                                   for name in (data.get('Genre') or '').split(',')])
+
+    catalog_movies = list(in_catalog.values()) + list(known.values())
+    progress['from_catalog'] += len(catalog_movies)
+    catalog_movies += [_new_catalog_movie(data, directors, genres) for data in unknown]
+
+    movies = [
+        Movie(
+            title=catalog_movie.title,
+            director=catalog_movie.director,
+            year=catalog_movie.year,
+            rating=catalog_movie.rating,
+            user_id=user_id,
+            admin_id=admin_id,
+            genres=list(catalog_movie.genres),
+            catalog_movie=catalog_movie
+        )
+        for catalog_movie in catalog_movies
+    ]
+    db.session.add_all(movies)
+    counters.movies_added(user_id, admin_id, len(movies))
+    db.session.commit()
+    progress['imported'] += len(movies)
+    if unknown:
+        wake_worker()
+
+
+def import_titles(path, admin_id=None, user_id=None, checkpoint_path=None,
+                  batch_size=BATCH_SIZE, workers=FETCH_WORKERS, report=None):
+    """
+    Import the titles of a file for an admin and/or a user, resuming from
+    the checkpoint if there is one. Must run inside an application context.
+
+    Parameters:
+    path (str): The import file, see read_titles().
+    admin_id (int): The admin the movies are added for, as on the admin add page.
+    user_id (int): The user the movies are added for. Duplicates are checked
+    against the admin's movies if admin_id is given, otherwise the user's.
+    checkpoint_path (str): The checkpoint file; defaults to checkpoint_path_for(path).
+    batch_size (int): Titles per transaction.
+    workers (int): Concurrent API lookups.
+    report (callable): Called with the progress dict after every batch.
+
+    Returns:
+    dict: The final progress: counts of imported, skipped and not found titles.
+
+    Raises:
+    ValueError: If no owner is given, the file type is not supported, or the
+    file changed since the checkpoint was written.
+    """
+    checkpoint_path = checkpoint_path or checkpoint_path_for(path)
+    progress = load_checkpoint(checkpoint_path)
+    if progress is None:
+        if not admin_id and not user_id:
+            raise ValueError('An admin or a user to import the movies for is required.')
+        progress = _new_progress(path, admin_id, user_id)
+    elif progress['size'] != os.path.getsize(path):
+        raise ValueError(f'{path} changed since its checkpoint was written; '
+                         f'delete {checkpoint_path} to start over.')
+    if progress['done']:
+        return progress
+
+    titles = islice(read_titles(path), progress['position'], None)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while True:
+            batch = list(islice(titles, batch_size))
+            if not batch:
+                break
+            _import_batch(batch, progress, pool)
+            progress['position'] += len(batch)
+            save_checkpoint(checkpoint_path, progress)
+            if report:
+                report(progress)
+
+    progress['done'] = True
+    save_checkpoint(checkpoint_path, progress)
+    return progress
+
+
+_running_imports = set()
+_running_lock = threading.Lock()
+
+
+def _run_import(app, path, admin_id, user_id):
+    """Run an import in a background thread and release it when it ends."""
+    with app.app_context():
+        try:
+            import_titles(path, admin_id, user_id)
+        except Exception as e:  # The checkpoint keeps the committed batches
+            print(f"Import of {path} stopped: {e}")
+            progress = load_checkpoint(checkpoint_path_for(path))
+            if progress is not None:
+                progress['error'] = str(e)
+                save_checkpoint(checkpoint_path_for(path), progress)
+        finally:
+            db.session.remove()
+            with _running_lock:
+                _running_imports.discard(path)
+
+
+def start_import(app, path, admin_id, user_id=None):
+    """
+    Start or resume the import of an uploaded file in a background thread.
+
+    Parameters:
+    app (Flask): The Flask application instance.
+    path (str): The uploaded file.
+    admin_id (int): The admin who uploaded it.
+    user_id (int): The user to assign the movies to, if any.
+
+    Returns:
+    bool: False if this file is already being imported.
+    """
+    with _running_lock:
+        if path in _running_imports:
+            return False
+        _running_imports.add(path)
+
+    progress = load_checkpoint(checkpoint_path_for(path))
+    if progress is None:
+        save_checkpoint(checkpoint_path_for(path), _new_progress(path, admin_id, user_id))
+    elif progress.pop('error', None):
+        save_checkpoint(checkpoint_path_for(path), progress)
+    threading.Thread(target=_run_import, args=(app, path, admin_id, user_id),
+                     name='bulk-import', daemon=True).start()
+    return True
+
+
+def is_running(path):
+    """Return whether a file is being imported by this process."""
+    with _running_lock:
+        return path in _running_imports
+
+
+def list_imports(folder, admin_id):
+    """
+    List the uploaded imports of an admin with their progress.
+
+    Parameters:
+    folder (str): The folder holding the uploads and their checkpoints.
+    admin_id (int): The admin whose imports are listed.
+
+    Returns:
+    list[dict]: The progress of each import, most recent first, with 'name'
+    (the uploaded file) and 'running' added.
+    """
+    imports = []
+    if not os.path.isdir(folder):
+        return imports
+    for name in os.listdir(folder):
+        if not name.endswith(CHECKPOINT_SUFFIX):
+            continue
+        progress = load_checkpoint(os.path.join(folder, name))
+        if progress.get('admin_id') != admin_id:
+            continue
+        progress['name'] = name[:-len(CHECKPOINT_SUFFIX)]
+        progress['running'] = is_running(os.path.join(folder, progress['name']))
+        imports.append(progress)
+    return sorted(imports, key=lambda progress: progress['started_at'], reverse=True)
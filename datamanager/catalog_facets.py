@@ -0,0 +1,170 @@
+"""
+catalog_facets.py
+
+This module contains the faceted filtering of the public catalog on the
+movies page: one or more genres, a year range, a minimum rating and a
+director.
+
+Filters within a facet are alternatives (any of the chosen genres), filters
+across facets all apply. Each facet's counts are computed with one
+aggregate query that applies every filter except the facet's own, so the
+counts show what picking another value would give. Counts are cached per
+filter signature in the shared fragment cache, under the 'catalog' and
+'labels' namespaces, so a committed change to movies, the catalog,
+directors or genres in any worker process invalidates them.
+"""
+
+from dataclasses import dataclass
+from sqlalchemy import Integer, cast, func, select
+from models import db, CatalogMovie, Director, Genre, catalog_movie_genre
+from datamanager import fragment_cache
+from datamanager.fragment_cache import cached_fragment
+
+DIRECTOR_FACET_LIMIT = 20  # Directors listed, most films first
+RATING_STEPS = (9, 8, 7, 6, 5)  # "N and up" choices of the rating facet
+
+
+@dataclass(frozen=True)
+class CatalogFilters:
+    """The facet filters chosen on the movies page. None (or no genres) means not filtered."""
+    genre_ids: tuple = ()
+    year_min: int = None
+    year_max: int = None
+    rating_min: float = None
+    director_id: int = None
+
+    @classmethod
+    def from_args(cls, args):
+        """
+        Read the filters from the query string: genre (repeatable genre id),
+        year_min, year_max, rating_min and director.
+
+        Parameters:
+        args (MultiDict): request.args.
+
+        Returns:
+        CatalogFilters: The filters; invalid values are ignored.
+        """
+        genre_ids = tuple(sorted({int(value) for value in args.getlist('genre') if value.isdigit()}))
+        return cls(genre_ids=genre_ids,
+                   year_min=args.get('year_min', type=int),
+                   year_max=args.get('year_max', type=int),
+                   rating_min=args.get('rating_min', type=float),
+                   director_id=args.get('director', type=int))
+
+    @property
+    def is_empty(self):
+        """True if no filter is set."""
+        return self == CatalogFilters()
+
+    def as_args(self):
+        """Return the filters as url_for() arguments, so links keep them."""
+        args = {'genre': list(self.genre_ids), 'year_min': self.year_min, 'year_max': self.year_max,
+                'rating_min': self.rating_min, 'director': self.director_id}
+        return {name: value for name, value in args.items() if value not in (None, [])}
+
+    def conditions(self, exclude=None):
+        """
+        Build the SQL conditions on CatalogMovie for the filters.
+
+        Parameters:
+        exclude (str): A facet to leave out: 'genre', 'year', 'rating' or 'director'.
+
+        Returns:
+        list: SQLAlchemy conditions.
+        """
+        conditions = []
+        if self.genre_ids and exclude != 'genre':
+            conditions.append(CatalogMovie.id.in_(
+                select(catalog_movie_genre.c.catalog_movie_id)
+                .where(catalog_movie_genre.c.genre_id.in_(self.genre_ids))
+            ))
+        if exclude != 'year':
+            if self.year_min is not None:
+                conditions.append(CatalogMovie.year >= self.year_min)
+            if self.year_max is not None:
+                conditions.append(CatalogMovie.year <= self.year_max)
+        if self.rating_min is not None and exclude != 'rating':
+            conditions.append(CatalogMovie.rating >= self.rating_min)
+        if self.director_id is not None and exclude != 'director':
+            conditions.append(CatalogMovie.director_id == self.director_id)
+        return conditions
+
+    def apply(self, query):
+        """Return a CatalogMovie query narrowed down by the filters."""
+        return query.filter(*self.conditions())
+
+
+def _listed():
+    """Condition keeping the catalog entries that at least one user or admin still owns."""
+    return CatalogMovie.copies.any()
+
+
+def _genre_counts(filters):
+    """Films per genre, alphabetically."""
+    rows = db.session.execute(
+        select(Genre.id, Genre.name, func.count())
+        .select_from(catalog_movie_genre)
+        .join(Genre, Genre.id == catalog_movie_genre.c.genre_id)
+        .join(CatalogMovie, CatalogMovie.id == catalog_movie_genre.c.catalog_movie_id)
+        .where(_listed(), *filters.conditions(exclude='genre'))
+        .group_by(Genre.id, Genre.name)
+        .order_by(Genre.name)
+    ).all()
+    return [{'id': genre_id, 'name': name, 'count': count} for genre_id, name, count in rows]
+
+
+def _director_counts(filters):
+    """Films per director, most films first, at most DIRECTOR_FACET_LIMIT directors."""
+    rows = db.session.execute(
+        select(Director.id, Director.name, func.count(CatalogMovie.id).label('films'))
+        .join(CatalogMovie, CatalogMovie.director_id == Director.id)
+        .where(_listed(), *filters.conditions(exclude='director'))
+        .group_by(Director.id, Director.name)
+        .order_by(func.count(CatalogMovie.id).desc(), Director.name)
+        .limit(DIRECTOR_FACET_LIMIT)
+    ).all()
+    return [{'id': director_id, 'name': name, 'count': count} for director_id, name, count in rows]
+
+
+def _decade_counts(filters):
+    """Films per decade, oldest first."""
+    decade = (CatalogMovie.year // 10 * 10).label('decade')
+    rows = db.session.execute(
+        select(decade, func.count())
+        .where(_listed(), *filters.conditions(exclude='year'))
+        .group_by(decade)
+        .order_by(decade)
+    ).all()
+    return [{'decade': int(start), 'count': count} for start, count in rows]
+
+
+def _rating_counts(filters):
+    """Films rated at least each of RATING_STEPS, from one count per whole rating point."""
+    point = cast(CatalogMovie.rating, Integer).label('point')
+    per_point = dict(db.session.execute(
+        select(point, func.count())
+        .where(_listed(), *filters.conditions(exclude='rating'))
+        .group_by(point)
+    ).all())
+    return [{'min': step, 'count': sum(count for value, count in per_point.items() if value >= step)}
+            for step in RATING_STEPS]
+
+
+def catalog_facets(filters):
+    """
+    Count the listed films for every value of every facet, cached per filter signature.
+
+    Parameters:
+    filters (CatalogFilters): The filters chosen so far.
+
+    Returns:
+    dict: 'genres' and 'directors' (lists of dicts with id, name and count),
+    'decades' (decade and count) and 'ratings' (min and count).
+    """
+    return cached_fragment([fragment_cache.CATALOG, fragment_cache.LABELS], 'catalog-facets', lambda: {
+        'genres': _genre_counts(filters),
+        'directors': _director_counts(filters),
+        'decades': _decade_counts(filters),
+        'ratings': _rating_counts(filters),
+    }, filters)
@@ -0,0 +1,161 @@
+"""
+counters.py
+
+This module maintains the denormalized counters read by the dashboards:
+movie and favorite counts on User, user and movie counts on Admin, and the
+site-wide totals in the Counter table.
+
+Every function here only issues UPDATE statements on the current session;
+callers run them next to the write they describe and commit both together,
+so a counter never changes without its data. reconcile_counters() recomputes
+everything from the base tables to repair any drift.
+"""
+
+from sqlalchemy import func, select, update
+from models import db, User, Admin, Movie, Favorite, Counter
+
+MOVIES_TOTAL = 'movies_total'
+USERS_TOTAL = 'users_total'
+
+
+def _bump(model, ident, column, delta):
+    """Add delta to a counter column of one row, if the row is set."""
+    if ident is None:
+        return
+    db.session.execute(
+        update(model)
+        .where(model.id == ident)
+        .values({column: getattr(model, column) + delta})
+    )
+
+
+def _bump_total(name, delta):
+    """Add delta to a site-wide counter. A missing row is created by reconcile_counters()."""
+    db.session.execute(
+        update(Counter)
+        .where(Counter.name == name)
+        .values(value=Counter.value + delta)
+    )
+
+
+def get_total(name):
+    """
+    Read a site-wide counter.
+
+    Parameters:
+    name (str): MOVIES_TOTAL or USERS_TOTAL.
+
+    Returns:
+    int: The counter value. Falls back to a COUNT(*) if the counter row is missing.
+    """
+    value = db.session.scalar(select(Counter.value).where(Counter.name == name))
+    if value is None:
+        model = Movie if name == MOVIES_TOTAL else User
+        value = db.session.scalar(select(func.count()).select_from(model))
+    return value
+
+
+def movie_added(movie):
+    """Count a new movie for its user, its admin and the site total."""
+    _bump(User, movie.user_id, 'movie_count', 1)
+    _bump(Admin, movie.admin_id, 'movie_count', 1)
+    _bump_total(MOVIES_TOTAL, 1)
+
+
+def movies_added(user_id, admin_id, count):
+    """Count several new movies of the same user and admin at once, e.g. an import batch."""
+    if not count:
+        return
+    _bump(User, user_id, 'movie_count', count)
+    _bump(Admin, admin_id, 'movie_count', count)
+    _bump_total(MOVIES_TOTAL, count)
+
+
+def movie_removed(movie):
+    """
+    Uncount a movie that is about to be deleted, including the favorites
+    pointing at it. Call this before the movie's favorites are deleted.
+    """
+    _bump(User, movie.user_id, 'movie_count', -1)
+    _bump(Admin, movie.admin_id, 'movie_count', -1)
+    _bump_total(MOVIES_TOTAL, -1)
+
+    favorites_of_movie = (
+        select(func.count())
+        .select_from(Favorite)
+        .where(Favorite.movie_id == movie.id, Favorite.user_id == User.id)
+        .scalar_subquery()
+    )
+    db.session.execute(
+        update(User)
+        .where(User.id.in_(select(Favorite.user_id).where(Favorite.movie_id == movie.id)))
+        .values(favorite_count=User.favorite_count - favorites_of_movie),
+        execution_options={'synchronize_session': 'fetch'}
+    )
+
+
+def movie_admin_changed(old_admin_id, new_admin_id):
+    """Move a movie from one admin's count to another's."""
+    if old_admin_id != new_admin_id:
+        _bump(Admin, old_admin_id, 'movie_count', -1)
+        _bump(Admin, new_admin_id, 'movie_count', 1)
+
+
+def favorite_added(user_id):
+    """Count a new favorite for a user."""
+    _bump(User, user_id, 'favorite_count', 1)
+
+
+def favorite_removed(user_id):
+    """Uncount a removed favorite for a user."""
+    _bump(User, user_id, 'favorite_count', -1)
+
+
+def user_added(user):
+    """Count a new user for its admin and the site total."""
+    _bump(Admin, user.admin_id, 'user_count', 1)
+    _bump_total(USERS_TOTAL, 1)
+
+
+def user_removed(user):
+    """Uncount a user that is about to be deleted."""
+    _bump(Admin, user.admin_id, 'user_count', -1)
+    _bump_total(USERS_TOTAL, -1)
+
+
+def user_admin_changed(old_admin_id, new_admin_id):
+    """Move a user from one admin's count to another's."""
+    if old_admin_id != new_admin_id:
+        _bump(Admin, old_admin_id, 'user_count', -1)
+        _bump(Admin, new_admin_id, 'user_count', 1)
+
+
+def _count_where(model, *criteria):
+    """Build a correlated COUNT(*) subquery for use in an UPDATE."""
+    return select(func.count()).select_from(model).where(*criteria).scalar_subquery()
+
+
+def reconcile_counters():
+    """
+    Recompute every counter from the base tables and create missing Counter rows.
+    The caller commits the session.
+    """
+    db.session.execute(
+        update(User).values(
+            movie_count=_count_where(Movie, Movie.user_id == User.id),
+            favorite_count=_count_where(Favorite, Favorite.user_id == User.id)
+        ),
+        execution_options={'synchronize_session': False}
+    )
+    db.session.execute(
+        update(Admin).values(
+            user_count=_count_where(User, User.admin_id == Admin.id),
+            movie_count=_count_where(Movie, Movie.admin_id == Admin.id)
+        ),
+        execution_options={'synchronize_session': False}
+    )
+    for name, model in ((MOVIES_TOTAL, Movie), (USERS_TOTAL, User)):
+        value = db.session.scalar(select(func.count()).select_from(model))
+        db.session.merge(Counter(name=name, value=value))
+    db.session.flush()  # expire_all() would otherwise discard the last merge
+    db.session.expire_all()
@@ -58,6 +58,11 @@ class DataManagerInterface(ABC):
         """Delete a user based on their ID."""
         pass
 
+    @abstractmethod
+    def search_movies(self, term, limit=20):
+        """Search the catalog for films matching the given text."""
+        pass
+
     @abstractmethod
     def get_reports(self):
         """Generate and retrieve reports with relevant data."""
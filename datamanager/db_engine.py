@@ -0,0 +1,197 @@
+"""
+db_engine.py
+
+This module holds the database engine profiles used in production.
+For SQLite: connection pool settings for multi-threaded servers and the
+PRAGMAs applied to every new connection (WAL journal, relaxed fsync,
+memory mapped I/O, a larger page cache, a busy timeout and foreign keys).
+For PostgreSQL: a connection pool that checks connections before use.
+benchmark() compares concurrent read/write throughput on a copy of a
+SQLite database with and without this profile (flask bench-sqlite).
+"""
+
+import os
+import sqlite3
+import statistics
+import threading
+import time
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+
+# Applied in order on every new SQLite connection
+SQLITE_PRAGMAS = (
+    ('journal_mode', 'WAL'),  # Readers no longer block on a writer
+    ('synchronous', 'NORMAL'),  # Safe with WAL, fsyncs only at checkpoints
+    ('mmap_size', 268435456),  # 256 MB of memory-mapped reads
+    ('cache_size', -65536),  # 64 MB page cache per connection (negative = KiB)
+    ('busy_timeout', 5000),  # Wait up to 5 s for a lock instead of failing
+    ('foreign_keys', 'ON'),
+)
+
+# Pool profile for a threaded WSGI server; each thread keeps a warm connection
+SQLITE_ENGINE_OPTIONS = {
+    'pool_size': 10,
+    'max_overflow': 20,
+    'pool_timeout': 30,
+    'pool_recycle': 3600,
+    'connect_args': {
+        'check_same_thread': False,  # Pooled connections move between threads
+        'timeout': 30,
+    },
+}
+
+# Pool profile for PostgreSQL; pre-ping drops connections the server closed
+POSTGRES_ENGINE_OPTIONS = {
+    'pool_size': 10,
+    'max_overflow': 20,
+    'pool_timeout': 30,
+    'pool_recycle': 1800,
+    'pool_pre_ping': True,
+}
+
+
+def apply_sqlite_pragmas(dbapi_connection):
+    """
+    Apply SQLITE_PRAGMAS to a raw sqlite3 connection.
+
+    Parameters:
+    dbapi_connection (sqlite3.Connection): The new connection.
+
+    Returns:
+    None
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in SQLITE_PRAGMAS:
+            cursor.execute(f'PRAGMA {name}={value}')
+    finally:
+        cursor.close()
+
+
+def _on_connect(dbapi_connection, connection_record):
+    """Tune every SQLite connection as soon as it is opened; other databases are left alone."""
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        apply_sqlite_pragmas(dbapi_connection)
+
+
+def configure_sqlite_engine(app):
+    """
+    Set SQLALCHEMY_ENGINE_OPTIONS for a file-based SQLite database and
+    register the PRAGMA hook. Must be called before db.init_app(app).
+    In-memory databases keep SQLAlchemy's default single-connection pool.
+
+    Parameters:
+    app (Flask): The Flask application instance.
+
+    Returns:
+    None
+    """
+    if not event.contains(Engine, 'connect', _on_connect):
+        event.listen(Engine, 'connect', _on_connect)
+
+    uri = app.config.get('SQLALCHEMY_DATABASE_URI', '')
+    if uri.startswith('sqlite') and ':memory:' not in uri and uri != 'sqlite://':
+        options = dict(SQLITE_ENGINE_OPTIONS)
+        options.update(app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+
+# The benchmark's read: one user's list, joined with the directors
+_BENCH_READ = text('SELECT movie.title, director.name FROM movie '
+                   'JOIN director ON director.id = movie.director_id '
+                   'WHERE movie.user_id = :user_id ORDER BY movie.title LIMIT 20')
+# The benchmark's write: a counter update, like adding a favorite
+_BENCH_WRITE = text('UPDATE user SET favorite_count = favorite_count + 1 WHERE id = :user_id')
+
+
+def _copy_database(path, copy_path):
+    """Copy a SQLite database with the backup API (includes its WAL) in rollback-journal mode."""
+    source = sqlite3.connect(path)
+    target = sqlite3.connect(copy_path)
+    try:
+        source.backup(target)
+        target.execute('PRAGMA journal_mode=DELETE')
+    finally:
+        target.close()
+        source.close()
+
+
+def _remove_database(path):
+    for suffix in ('', '-wal', '-shm', '-journal'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def benchmark(path, tuned, threads=8, operations=300, write_every=5):
+    """
+    Measure read/write throughput of a SQLite database shared by several
+    threads, the way a threaded WSGI server shares it. The database is
+    copied first; the original is never written.
+
+    Parameters:
+    path (str): The SQLite database file.
+    tuned (bool): Use SQLITE_ENGINE_OPTIONS and SQLITE_PRAGMAS, or
+        SQLAlchemy's defaults (rollback journal, default pool).
+    threads (int): Concurrent threads.
+    operations (int): Operations per thread.
+    write_every (int): Every n-th operation is a write, the rest are reads.
+
+    Returns:
+    dict: ops_per_second, p50_ms, p95_ms (operation latency), errors
+    (operations that failed, e.g. "database is locked") and seconds (wall time).
+    """
+    copy_path = path + '.bench'
+    _remove_database(copy_path)
+    _copy_database(path, copy_path)
+
+    # Only the tuned engine gets the PRAGMAs, even when the app registered the hook
+    registered = event.contains(Engine, 'connect', _on_connect)
+    if registered:
+        event.remove(Engine, 'connect', _on_connect)
+    if tuned:
+        engine = create_engine(f'sqlite:///{copy_path}', **SQLITE_ENGINE_OPTIONS)
+        event.listen(engine, 'connect', _on_connect)
+    else:
+        engine = create_engine(f'sqlite:///{copy_path}', connect_args={'check_same_thread': False})
+
+    try:
+        with engine.connect() as connection:
+            user_ids = connection.execute(text('SELECT id FROM user')).scalars().all() or [1]
+
+        latencies, errors = [], []
+
+        def worker(number):
+            for operation in range(operations):
+                user_id = user_ids[(number + operation) % len(user_ids)]
+                start = time.perf_counter()
+                try:
+                    with engine.begin() as connection:
+                        if operation % write_every == 0:
+                            connection.execute(_BENCH_WRITE, {'user_id': user_id})
+                        else:
+                            connection.execute(_BENCH_READ, {'user_id': user_id}).all()
+                except Exception:
+                    errors.append(operation)
+                latencies.append(time.perf_counter() - start)
+
+        workers = [threading.Thread(target=worker, args=(number,)) for number in range(threads)]
+        start = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        seconds = time.perf_counter() - start
+    finally:
+        engine.dispose()
+        if registered:
+            event.listen(Engine, 'connect', _on_connect)
+        _remove_database(copy_path)
+
+    latencies.sort()
+    return {
+        'ops_per_second': threads * operations / seconds,
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p95_ms': latencies[int(len(latencies) * 0.95)] * 1000,
+        'errors': len(errors),
+        'seconds': seconds,
+    }
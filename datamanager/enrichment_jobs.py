@@ -0,0 +1,262 @@
+"""
+enrichment_jobs.py
+
+This module contains the background job queue that enriches catalog entries
+after a movie has been added: it looks up the trailer, checks that the poster
+URL serves an image and fetches the full plot. Adding a movie therefore only
+waits for the OMDb lookup and one commit; these fields fill in later.
+
+Jobs are rows of the enrichment_job table, enqueued in the same transaction
+as the movie. They are processed either by a thread inside the web process
+(ENRICHMENT_WORKER=thread, the default) or by a separate worker process
+(`flask enrichment-worker`). Claiming a job is a conditional UPDATE, so
+several workers can share the queue. Failed jobs are retried with exponential
+backoff and marked failed after MAX_ATTEMPTS. The workers also purge expired
+entries from the movie metadata cache every PURGE_INTERVAL seconds.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import func, inspect, select, update
+from sqlalchemy.orm import joinedload
+from models import db, EnrichmentJob
+from blueprints.utils import fetch_enrichment_data, metadata_cache
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+STATUSES = (PENDING, RUNNING, DONE, FAILED)
+
+MAX_ATTEMPTS = 5
+RETRY_DELAY = 60  # Seconds before the first retry, doubled after every failed attempt
+STALE_AFTER = 600  # Seconds after which a running job is assumed lost (worker died)
+DEFAULT_POSTER = '/static/images/default_movie_poster.jpg'
+PURGE_INTERVAL = 3600  # Seconds between purges of expired metadata cache entries
+
+
+def enqueue_enrichment(catalog_movie):
+    """
+    Queue an enrichment job for a catalog entry created by the current request.
+    Call this before anything flushes the session; the job is saved by the
+    caller's commit, together with the movie.
+
+    Parameters:
+    catalog_movie (CatalogMovie): The catalog entry, or None.
+
+    Returns:
+    EnrichmentJob: The new job, or None if the entry already existed
+    (it was enriched when it was created) or there is no entry.
+    """
+    if catalog_movie is None or inspect(catalog_movie).persistent:
+        return None
+    job = EnrichmentJob(catalog_movie=catalog_movie, status=PENDING)
+    db.session.add(job)
+    return job
+
+
+def _requeue_stale_jobs(now):
+    """Put running jobs whose worker disappeared back in the queue."""
+    db.session.execute(
+        update(EnrichmentJob)
+        .where(EnrichmentJob.status == RUNNING,
+               EnrichmentJob.updated_at < now - timedelta(seconds=STALE_AFTER))
+        .values(status=PENDING, run_after=now, updated_at=now),
+        execution_options={'synchronize_session': False}
+    )
+
+
+def claim_job():
+    """
+    Claim the oldest due pending job for this worker.
+
+    Returns:
+    EnrichmentJob: The claimed job, now running, or None if no job is due.
+    """
+    now = datetime.now()
+    _requeue_stale_jobs(now)
+    while True:
+        job_id = db.session.scalar(
+            select(EnrichmentJob.id)
+            .where(EnrichmentJob.status == PENDING, EnrichmentJob.run_after <= now)
+            .order_by(EnrichmentJob.run_after, EnrichmentJob.id)
+            .limit(1)
+        )
+        if job_id is None:
+            db.session.commit()
+            return None
+
+        # Only one worker can move the job from pending to running
+        claimed = db.session.execute(
+            update(EnrichmentJob)
+            .where(EnrichmentJob.id == job_id, EnrichmentJob.status == PENDING)
+            .values(status=RUNNING, attempts=EnrichmentJob.attempts + 1, updated_at=now),
+            execution_options={'synchronize_session': False}
+        ).rowcount
+        db.session.commit()
+        if claimed:
+            return db.session.get(EnrichmentJob, job_id)
+
+
+def _record_failure(job, error):
+    """Schedule a retry with exponential backoff, or mark the job failed."""
+    job.last_error = str(error)[:1000]
+    if job.attempts >= MAX_ATTEMPTS:
+        job.status = FAILED
+    else:
+        job.status = PENDING
+        job.run_after = datetime.now() + timedelta(seconds=RETRY_DELAY * 2 ** (job.attempts - 1))
+    db.session.commit()
+
+
+def run_job(job):
+    """
+    Enrich the catalog entry of a claimed job and record the outcome.
+
+    Parameters:
+    job (EnrichmentJob): A job returned by claim_job().
+
+    Any error, not only an unreachable API (e.g. an unexpected response or a
+    failed commit), goes through the same retry with backoff, so a job is
+    never left running until it goes stale.
+
+    Returns:
+    bool: True if the job is done, False if it will be retried or has failed.
+    """
+    try:
+        catalog_movie = job.catalog_movie
+        data = fetch_enrichment_data(catalog_movie.imdbID, catalog_movie.poster)
+
+        if data['trailer'] and not catalog_movie.trailer:
+            catalog_movie.trailer = data['trailer']
+        if data['plot'] and len(data['plot']) > len(catalog_movie.plot or ''):
+            catalog_movie.plot = data['plot']
+        if data['poster_ok'] is False:
+            catalog_movie.poster = DEFAULT_POSTER
+        job.status = DONE
+        job.last_error = None
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        print(f"Enrichment job {job.id} failed (attempt {job.attempts}): {e!r}")
+        _record_failure(job, e)
+        return False
+    return True
+
+
+def process_jobs(limit=None):
+    """
+    Run due jobs until the queue is empty or the limit is reached.
+
+    Parameters:
+    limit (int): The maximum number of jobs to run, or None for no limit.
+
+    Returns:
+    int: The number of jobs run.
+    """
+    processed = 0
+    while limit is None or processed < limit:
+        job = claim_job()
+        if job is None:
+            break
+        run_job(job)
+        processed += 1
+    return processed
+
+
+def queue_stats():
+    """
+    Count the jobs in each status.
+
+    Returns:
+    dict: The number of jobs per status, including statuses with no jobs.
+    """
+    counts = dict.fromkeys(STATUSES, 0)
+    counts.update(db.session.execute(
+        select(EnrichmentJob.status, func.count()).group_by(EnrichmentJob.status)
+    ).all())
+    return counts
+
+
+def recent_jobs(limit=20):
+    """
+    Fetch the most recently updated jobs with their catalog entries.
+
+    Parameters:
+    limit (int): The maximum number of jobs.
+
+    Returns:
+    list[EnrichmentJob]: The jobs, most recent first.
+    """
+    return (
+        EnrichmentJob.query
+        .options(joinedload(EnrichmentJob.catalog_movie))
+        .order_by(EnrichmentJob.updated_at.desc(), EnrichmentJob.id.desc())
+        .limit(limit)
+        .all()
+    )
+
+
+_last_purge = None
+
+
+def purge_metadata_cache_if_due():
+    """
+    Delete the expired entries of the movie metadata cache, at most once
+    every PURGE_INTERVAL seconds per process.
+
+    Returns:
+    int: The number of entries deleted, or None if no purge was due.
+    """
+    global _last_purge
+    now = time.monotonic()
+    if _last_purge is not None and now - _last_purge < PURGE_INTERVAL:
+        return None
+    _last_purge = now
+    return metadata_cache.purge_expired()
+
+
+_wakeup = threading.Event()
+_worker_lock = threading.Lock()
+_worker_thread = None
+
+
+def _worker_loop(app, poll_interval):
+    """Run due jobs whenever woken up, and at least every poll_interval seconds."""
+    while True:
+        with app.app_context():
+            try:
+                process_jobs()
+                purge_metadata_cache_if_due()
+            except Exception as e:  # Keep the worker alive; the job is requeued once stale
+                print(f"Enrichment worker error: {e}")
+                db.session.rollback()
+            finally:
+                db.session.remove()
+        _wakeup.wait(poll_interval)
+        _wakeup.clear()
+
+
+def start_worker(app, poll_interval=30):
+    """
+    Start the in-process worker thread, once per process.
+
+    Parameters:
+    app (Flask): The Flask application instance.
+    poll_interval (float): Seconds between checks for due retries.
+
+    Returns:
+    None
+    """
+    global _worker_thread
+    with _worker_lock:
+        if _worker_thread is None:
+            _worker_thread = threading.Thread(target=_worker_loop, args=(app, poll_interval),
+                                              name='enrichment-worker', daemon=True)
+            _worker_thread.start()
+
+
+def wake_worker():
+    """Tell the in-process worker that new jobs were committed."""
+    _wakeup.set()
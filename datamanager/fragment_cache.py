@@ -0,0 +1,191 @@
+"""
+fragment_cache.py
+
+This module holds the Flask-Caching cache of the app and the fragment
+cache built on it: rendered pieces of the catalog pages and of the
+per-user lists.
+
+Fragment keys are versioned by namespace instead of being deleted:
+
+- 'catalog': the films and their posters (Movie and CatalogMovie writes);
+- 'labels': genre and director names, shown in every listing;
+- 'user:<id>': one user's movie and favorite lists.
+
+Every fragment key includes the current version token of the namespaces it
+depends on. A committed write replaces the tokens of the namespaces it
+touched (collected by session events, like the title index), so only those
+fragments miss on the next request; stale entries age out on their own.
+Nothing ever clears the whole cache. The same tokens give pages their ETag
+and Last-Modified (page_version()).
+"""
+
+import hashlib
+import time
+import uuid
+from datetime import datetime, timezone
+from flask_caching import Cache
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+from models import Movie, CatalogMovie, Director, Genre, Favorite
+
+cache = Cache()
+
+FRAGMENT_TIMEOUT = 300  # Seconds
+CATALOG = 'catalog'
+LABELS = 'labels'
+_NAMESPACES_KEY = 'fragment_cache_namespaces'
+
+
+def user_namespace(user_id):
+    """Return the namespace of a user's movie and favorite lists."""
+    return f'user:{user_id}'
+
+
+def _version_key(namespace):
+    return f'ns-version:{namespace}'
+
+
+def _new_version():
+    """
+    A fresh version token: the time of the change in milliseconds (hex), for
+    Last-Modified, and a random part, so a version evicted from the cache never comes back.
+    """
+    return f'{time.time_ns() // 1_000_000:x}-{uuid.uuid4().hex[:8]}'
+
+
+def namespace_versions(namespaces):
+    """
+    Read the current version tokens of namespaces, creating missing ones.
+
+    Parameters:
+    namespaces (list[str]): The namespaces.
+
+    Returns:
+    list[str]: Their version tokens, in the same order.
+    """
+    keys = [_version_key(namespace) for namespace in namespaces]
+    versions = cache.get_many(*keys)
+    for index, version in enumerate(versions):
+        if version is None:
+            # add() only sets a missing key, so concurrent requests agree on one token
+            cache.add(keys[index], _new_version(), timeout=0)
+            versions[index] = cache.get(keys[index])
+    return versions
+
+
+def bump_namespaces(namespaces):
+    """
+    Invalidate every fragment of the given namespaces by replacing their version tokens.
+
+    Parameters:
+    namespaces (iterable[str]): The namespaces.
+
+    Returns:
+    None
+    """
+    cache.set_many({_version_key(namespace): _new_version() for namespace in namespaces}, timeout=0)
+
+
+def cached_fragment(namespaces, name, render, *args):
+    """
+    Return a cached fragment, or render and cache it.
+
+    Parameters:
+    namespaces (list[str]): The namespaces the fragment depends on.
+    name (str): The fragment name, e.g. 'movies-home'.
+    render (callable): Builds the fragment (rendered HTML, or a tuple of
+    values and HTML) on a miss. Only called on a miss, so it should run the queries.
+    *args: What else the fragment varies by, e.g. sort order and page.
+
+    Returns:
+    The fragment.
+    """
+    signature = hashlib.sha1(repr(args).encode()).hexdigest()[:16]
+    key = f"fragment:{name}:{signature}:{'.'.join(namespace_versions(namespaces))}"
+    fragment = cache.get(key)
+    if fragment is None:
+        fragment = render()
+        cache.set(key, fragment, timeout=FRAGMENT_TIMEOUT)
+    return fragment
+
+
+def page_version(namespaces, *args):
+    """
+    Return an ETag and a Last-Modified time for a page built from namespaces,
+    without rendering it.
+
+    Parameters:
+    namespaces (list[str]): The namespaces the page depends on.
+    *args: What else the page varies by, e.g. the URL and the logged-in user.
+
+    Returns:
+    tuple: (etag (str), last_modified (datetime, UTC, whole seconds)).
+    """
+    versions = namespace_versions(namespaces)
+    etag = hashlib.sha1(repr((versions, args)).encode()).hexdigest()[:20]
+    if all('-' in version for version in versions):
+        changed = max(int(version.split('-')[0], 16) for version in versions) // 1000
+    else:
+        changed = int(time.time())  # A token without a time, from an older version of this module
+    last_modified = datetime.fromtimestamp(changed, timezone.utc)
+    return etag, last_modified
+
+
+@event.listens_for(Movie.user_id, 'set', active_history=True)
+def _load_replaced_owner(target, value, oldvalue, initiator):
+    """Load the old owner of a reassigned movie (active_history), so its lists can be invalidated."""
+    return value
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_namespaces(session, flush_context):
+    """Remember which namespaces this flush changed until the transaction commits."""
+    namespaces = session.info.setdefault(_NAMESPACES_KEY, set())
+    changed_movie_ids = []
+    for obj in session.new | session.dirty | session.deleted:
+        if isinstance(obj, Movie):
+            namespaces.add(CATALOG)
+            if obj.user_id:
+                namespaces.add(user_namespace(obj.user_id))
+            # A movie moved to another user also leaves the old owner's lists
+            namespaces.update(user_namespace(user_id) for user_id in inspect(obj).attrs.user_id.history.deleted
+                              if user_id)
+            if obj not in session.new:
+                changed_movie_ids.append(obj.id)
+        elif isinstance(obj, CatalogMovie):
+            namespaces.add(CATALOG)
+        elif isinstance(obj, (Genre, Director)):
+            namespaces.add(LABELS)
+        elif isinstance(obj, Favorite):
+            namespaces.add(user_namespace(obj.user_id))
+    if changed_movie_ids:
+        # Any user may have favorited an edited or deleted movie
+        namespaces.update(user_namespace(user_id) for user_id in session.connection().execute(
+            select(Favorite.user_id).where(Favorite.movie_id.in_(changed_movie_ids)).distinct()
+        ).scalars())
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _collect_bulk_favorite_deletes(orm_execute_state):
+    """Favorites removed with a bulk DELETE (when a movie is deleted) bypass the flush; note their users."""
+    if not orm_execute_state.is_delete or orm_execute_state.bind_mapper is not inspect(Favorite):
+        return
+    session = orm_execute_state.session
+    namespaces = session.info.setdefault(_NAMESPACES_KEY, set())
+    namespaces.update(user_namespace(user_id) for user_id in session.execute(
+        select(Favorite.user_id).where(orm_execute_state.statement.whereclause).distinct()
+    ).scalars())
+
+
+@event.listens_for(Session, 'after_commit')
+def _bump_committed_namespaces(session):
+    """Invalidate the namespaces changed by the committed transaction."""
+    namespaces = session.info.pop(_NAMESPACES_KEY, None)
+    if namespaces:
+        bump_namespaces(namespaces)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_namespaces(session):
+    """A rolled back transaction changed nothing."""
+    session.info.pop(_NAMESPACES_KEY, None)
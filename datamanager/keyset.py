@@ -0,0 +1,160 @@
+"""
+keyset.py
+
+This module contains the cursor (keyset) pagination used by the admin and
+user lists.
+
+Instead of skipping rows with OFFSET, a page continues from the sort key of
+the last row shown: WHERE (title, id) > (:title, :id) ORDER BY title, id
+LIMIT n. With an index on the sort columns, page 10,000 costs the same as
+page 1. The cursor put in the links (?after= or ?before=) is an opaque
+URL-safe token holding that sort key and the row's position in the list,
+which keeps the "Page X of Y" display without counting rows.
+"""
+
+import base64
+import binascii
+import json
+from sqlalchemy import tuple_
+
+
+def encode_cursor(position, key):
+    """
+    Encode a row's position and sort key into a cursor token.
+
+    Parameters:
+    position (int): The 0-based position of the row in the whole list.
+    key (tuple): The row's values of the sort columns.
+
+    Returns:
+    str: A URL-safe token.
+    """
+    data = json.dumps([position, list(key)], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """
+    Decode a cursor token.
+
+    Parameters:
+    token (str): A token made by encode_cursor(), or None.
+
+    Returns:
+    tuple: (position, key), or None if the token is missing or malformed.
+    """
+    if not token:
+        return None
+    try:
+        data = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        position, key = json.loads(data)
+        if not all(isinstance(value, (str, int, float)) for value in key):
+            return None
+        return int(position), tuple(key)
+    except (binascii.Error, ValueError, TypeError):
+        return None
+
+
+class KeysetPage:
+    """
+    One page of a keyset-paginated list. Has the attributes the templates
+    used from Flask-SQLAlchemy's Pagination (items, page, pages, per_page,
+    has_prev, has_next), with cursors instead of page numbers.
+
+    Attributes:
+        items (list): The rows on this page.
+        per_page (int): The page size.
+        total (int): The number of rows in the whole list, or None if not counted.
+        start (int): The 0-based position of the first row in the whole list.
+        prev_cursor (str): The ?before= token of the previous page, or None on the first page.
+        next_cursor (str): The ?after= token of the next page, or None on the last page.
+    """
+
+    def __init__(self, items, per_page, total, start, prev_cursor, next_cursor):
+        self.items = items
+        self.per_page = per_page
+        self.total = total
+        self.start = start
+        self.prev_cursor = prev_cursor
+        self.next_cursor = next_cursor
+
+    @property
+    def page(self):
+        """The 1-based number of this page."""
+        return self.start // self.per_page + 1
+
+    @property
+    def pages(self):
+        """The number of pages, or None if the total was not counted."""
+        if self.total is None:
+            return None
+        return max((self.total + self.per_page - 1) // self.per_page, 1)
+
+    @property
+    def has_prev(self):
+        return self.prev_cursor is not None
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+
+def paginate_keyset(query, order_by, after=None, before=None, per_page=10, total=None, count=True, key=None):
+    """
+    Fetch one page of a query ordered by indexed columns, continuing from a cursor.
+
+    Parameters:
+    query (Query): The query to paginate, without ORDER BY.
+    order_by (list): The columns to sort by, ascending. The last one must be
+    unique (usually the id) so that every row has its own position.
+    after (str): The cursor of the previous page's last row (?after=).
+    before (str): The cursor of the next page's first row (?before=), to go back.
+    per_page (int): The page size.
+    total (int): The number of rows, if already known (e.g. from a counter).
+    count (bool): Run a COUNT for the total when it is not given. Pass False
+    to skip it; the page then shows no page count.
+    key (callable): Returns a row's values of the sort columns. Defaults to
+    reading the columns' attributes from the row.
+
+    Returns:
+    KeysetPage: The page.
+    """
+    if key is None:
+        def key(row):
+            return tuple(getattr(row, column.key) for column in order_by)
+
+    if total is None and count:
+        total = query.order_by(None).count()
+
+    columns = tuple_(*order_by)
+    cursor_after, cursor_before = decode_cursor(after), decode_cursor(before)
+    if cursor_before and len(cursor_before[1]) == len(order_by):
+        # Walk backwards from the cursor, then restore the display order
+        position, values = cursor_before
+        rows = (query.filter(columns < tuple_(*values))
+                .order_by(*[column.desc() for column in order_by])
+                .limit(per_page + 1).all())
+        has_prev = len(rows) > per_page
+        items = rows[:per_page][::-1]
+        start = max(position - len(items), 0) if has_prev else 0
+        has_next = True
+    else:
+        start = 0
+        if cursor_after and len(cursor_after[1]) == len(order_by):
+            position, values = cursor_after
+            page_query = query.filter(columns > tuple_(*values))
+            start = position + 1
+        else:
+            page_query = query
+        rows = page_query.order_by(*order_by).limit(per_page + 1).all()
+        has_prev = start > 0
+        has_next = len(rows) > per_page
+        items = rows[:per_page]
+
+    if not items and (cursor_before or cursor_after):
+        # The rows around the cursor were deleted; start over from the first page
+        return paginate_keyset(query, order_by, per_page=per_page, total=total, count=False, key=key)
+
+    prev_cursor = encode_cursor(start, key(items[0])) if has_prev and items else None
+    next_cursor = encode_cursor(start + len(items) - 1, key(items[-1])) if has_next and items else None
+    return KeysetPage(items, per_page, total, start, prev_cursor, next_cursor)
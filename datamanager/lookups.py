@@ -0,0 +1,81 @@
+"""
+lookups.py
+
+This module resolves names in the director and genre lookup tables.
+All names of a movie are looked up with one IN (...) query; the missing ones
+are created with a single multi-row INSERT that ignores names another request
+inserted meanwhile (ON CONFLICT DO NOTHING on SQLite and PostgreSQL).
+Nothing is committed here, so the lookup rows are saved atomically with
+the movie that uses them.
+"""
+
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql, sqlite
+from models import db, Director, Genre
+
+# Dialects whose INSERT supports ON CONFLICT DO NOTHING
+_UPSERT_INSERTS = {
+    'sqlite': sqlite.insert,
+    'postgresql': postgresql.insert,
+}
+
+
+def _insert_missing(model, names):
+    """Insert one row per name in a single statement, skipping names that already exist."""
+    dialect = db.session.get_bind().dialect.name
+    rows = [{'name': name} for name in names]
+    if dialect in _UPSERT_INSERTS:
+        statement = _UPSERT_INSERTS[dialect](model).on_conflict_do_nothing(index_elements=['name'])
+    else:
+        statement = insert(model)
+    db.session.execute(statement, rows)
+
+
+def resolve_names(model, names):
+    """
+    Map names to rows of a lookup table, creating the missing rows.
+
+    Parameters:
+    model (db.Model): Director or Genre; the model must have a unique name column.
+    names (iterable): The names to resolve. Blank names are ignored.
+
+    Returns:
+    dict: The rows keyed by name.
+    """
+    wanted = list(dict.fromkeys(name for name in names if name))
+    if not wanted:
+        return {}
+
+    found = {row.name: row for row in model.query.filter(model.name.in_(wanted))}
+    missing = [name for name in wanted if name not in found]
+    if missing:
+        _insert_missing(model, missing)
+        found.update({row.name: row for row in model.query.filter(model.name.in_(missing))})
+    return found
+
+
+def resolve_director(director_name):
+    """
+    Find or create a director by name, without committing.
+
+    Parameters:
+    director_name (str): The name of the director.
+
+    Returns:
+    Director: The existing or new director, or None if the name is blank.
+    """
+    return resolve_names(Director, [director_name]).get(director_name)
+
+
+def resolve_genres(genre_names):
+    """
+    Find or create genres by name with one lookup query, without committing.
+
+    Parameters:
+    genre_names (iterable): The names of the genres.
+
+    Returns:
+    list[Genre]: The genres in the order of their first occurrence in genre_names.
+    """
+    genres = resolve_names(Genre, genre_names)
+    return [genres[name] for name in dict.fromkeys(genre_names) if name in genres]
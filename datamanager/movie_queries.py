@@ -0,0 +1,211 @@
+"""
+movie_queries.py
+
+This module contains query builders for the movie listing pages.
+The public catalog reads from CatalogMovie, which holds one row per film (imdbID),
+so listing pages never have to collapse duplicate user copies themselves.
+Listing queries eager-load the relationships their templates render, so a
+page costs a fixed number of SELECTs regardless of how many rows it shows.
+"""
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import contains_eager, joinedload, selectinload
+from models import Movie, CatalogMovie, Director, Genre, catalog_movie_genre
+
+LIKE_ESCAPE = '\\'  # Escape character of the patterns built by contains_pattern()
+
+
+def contains_pattern(text):
+    """
+    Build a LIKE pattern matching text anywhere in a value. The %, _ and
+    escape characters in text match themselves, so pass escape=LIKE_ESCAPE
+    to like()/ilike().
+
+    Parameters:
+    text (str): The text typed by the user.
+
+    Returns:
+    str: The pattern.
+    """
+    for character in (LIKE_ESCAPE, '%', '_'):
+        text = text.replace(character, LIKE_ESCAPE + character)
+    return f'%{text}%'
+
+
+def with_listing_relationships(query):
+    """
+    Eager-load the director, genres and owning user of every movie in a listing.
+    Director and user are joined into the main SELECT; genres are fetched
+    for the whole page with one extra IN query.
+
+    Parameters:
+    query (Query): A Movie query.
+
+    Returns:
+    Query: The same query with loader options applied.
+    """
+    return query.options(
+        joinedload(Movie.director),
+        joinedload(Movie.user),
+        selectinload(Movie.genres)
+    )
+
+
+def first_genre_name():
+    """
+    Build a correlated subquery returning the alphabetically first genre of a film.
+    Sorting on this value keeps one row per film instead of one row per genre.
+
+    Returns:
+    ScalarSelect: A scalar subquery usable in ORDER BY.
+    """
+    return (
+        select(func.min(Genre.name))
+        .join(catalog_movie_genre, catalog_movie_genre.c.genre_id == Genre.id)
+        .where(catalog_movie_genre.c.catalog_movie_id == CatalogMovie.id)
+        .scalar_subquery()
+    )
+
+
+SORT_OPTIONS = {
+    'title': lambda: CatalogMovie.title,
+    'director': lambda: Director.name,
+    'year': lambda: CatalogMovie.year,
+    'rating': lambda: CatalogMovie.rating,
+    'genre': first_genre_name,
+}
+
+
+def catalog_movie_data(imdb_id):
+    """
+    Return a catalog entry in the shape of an OMDb response, so a film picked
+    from the title autocomplete can be added without calling the API.
+
+    Parameters:
+    imdb_id (str): The imdbID of the film.
+
+    Returns:
+    dict: The movie data (Title, Year, Director, imdbRating, Genre, Poster,
+    Plot, Trailer, imdbID), or None if the film is not in the catalog.
+    """
+    if not imdb_id:
+        return None
+    catalog_movie = (
+        CatalogMovie.query
+        .options(joinedload(CatalogMovie.director), selectinload(CatalogMovie.genres))
+        .filter_by(imdbID=imdb_id)
+        .first()
+    )
+    if catalog_movie is None:
+        return None
+    return {
+        'Title': catalog_movie.title,
+        'Year': str(catalog_movie.year),
+        'Director': catalog_movie.director.name,
+        'imdbRating': str(catalog_movie.rating),
+        'Genre': ', '.join(genre.name for genre in catalog_movie.genres),
+        'Poster': catalog_movie.poster,
+        'Plot': catalog_movie.plot,
+        'Trailer': catalog_movie.trailer,
+        'imdbID': catalog_movie.imdbID,
+        'Response': 'True',
+    }
+
+
+def catalog_imdb_id_for_title(title):
+    """
+    Look up the imdbID of a film already in the catalog by its title, case-insensitively.
+
+    Parameters:
+    title (str): The title as typed by the user.
+
+    Returns:
+    str: The imdbID, or None if no catalog entry has this title.
+    """
+    title = ' '.join((title or '').split())
+    if not title:
+        return None
+    return (
+        CatalogMovie.query
+        .with_entities(CatalogMovie.imdbID)
+        .filter(func.lower(CatalogMovie.title) == title.lower())
+        .order_by(CatalogMovie.id)
+        .limit(1)
+        .scalar()
+    )
+
+
+def listed_catalog_movies():
+    """
+    Build a query over the catalog entries that at least one user or admin still owns.
+
+    Returns:
+    Query: A CatalogMovie query.
+    """
+    return CatalogMovie.query.filter(CatalogMovie.copies.any())
+
+
+def unique_movies_query(sort_column='title', sort_order='asc', filters=None):
+    """
+    Build a query over every listed film, sorted in the database.
+
+    Parameters:
+    sort_column (str): One of the keys of SORT_OPTIONS, defaults to 'title'.
+    sort_order (str): 'asc' or 'desc', defaults to 'asc'.
+    filters (CatalogFilters): Facet filters to apply, if any.
+
+    Returns:
+    Query: A CatalogMovie query with one row per imdbID.
+    """
+    sort = SORT_OPTIONS.get(sort_column, SORT_OPTIONS['title'])()
+    sort = sort.desc() if sort_order == 'desc' else sort.asc()
+
+    query = listed_catalog_movies()
+    if filters is not None:
+        query = filters.apply(query)
+    return (
+        query
+        .outerjoin(CatalogMovie.director)
+        .options(contains_eager(CatalogMovie.director),
+                 selectinload(CatalogMovie.genres))
+        .order_by(sort, CatalogMovie.id.asc())  # Tie-break on id for stable pages
+    )
+
+
+def count_unique_movies(filters=None):
+    """
+    Count the listed films in the catalog.
+
+    Parameters:
+    filters (CatalogFilters): Facet filters to apply, if any.
+
+    Returns:
+    int: The number of unique movies in the catalog (matching the filters).
+    """
+    query = listed_catalog_movies()
+    if filters is not None:
+        query = filters.apply(query)
+    return query.count()
+
+
+def get_unique_movies_page(sort_column='title', sort_order='asc', page=1, per_page=10, filters=None):
+    """
+    Fetch one page of unique movies using LIMIT/OFFSET in the database.
+
+    Parameters:
+    sort_column (str): The column to sort by.
+    sort_order (str): 'asc' or 'desc'.
+    page (int): The 1-based page number.
+    per_page (int): The number of movies per page.
+    filters (CatalogFilters): Facet filters to apply, if any.
+
+    Returns:
+    list[CatalogMovie]: The movies on the requested page.
+    """
+    page = max(page, 1)
+    return (
+        unique_movies_query(sort_column, sort_order, filters)
+        .limit(per_page)
+        .offset((page - 1) * per_page)
+        .all()
+    )
@@ -0,0 +1,304 @@
+"""
+movie_search.py
+
+This module contains the full-text search over movies: title, plot,
+director and genre names.
+
+On SQLite the text of every movie is mirrored into the movie_search FTS5
+virtual table (rowid = movie.id). A session event rewrites the rows of the
+movies touched by each flush in the same transaction, including movies whose
+catalog entry (plot), director or genre was changed. Matches are ranked
+with bm25, title hits weighing most. Snippets are highlighted with <mark>,
+and pages use keyset pagination on (rank, id), so deep pages cost the same
+as the first one.
+
+Other databases fall back to case-insensitive substring matching on title
+and director (served by the pg_trgm indexes on PostgreSQL), without
+snippets.
+"""
+
+import re
+from collections import namedtuple
+from markupsafe import Markup, escape
+from sqlalchemy import event, inspect, or_, select, text
+from sqlalchemy.orm import Session
+from models import db, Movie, CatalogMovie, Director, Genre, movie_genre
+from datamanager.movie_queries import LIKE_ESCAPE, contains_pattern, with_listing_relationships
+
+SEARCH_TABLE = 'movie_search'
+SNIPPET_TOKENS = 16
+# Private-use characters mark the highlights in snippet(), so the text can be escaped first
+_MARK_START, _MARK_END = '\ue000', '\ue001'
+
+SearchResult = namedtuple('SearchResult', ['item', 'snippet'])
+
+# Columns written for each movie; the plot comes from its catalog entry
+_INDEX_ROWS = f"""
+    INSERT INTO {SEARCH_TABLE} (rowid, title, plot, director, genres)
+    SELECT movie.id, movie.title, coalesce(catalog_movie.plot, ''), coalesce(director.name, ''),
+           coalesce((SELECT group_concat(genre.name, ' ') FROM movie_genre
+                     JOIN genre ON genre.id = movie_genre.genre_id
+                     WHERE movie_genre.movie_id = movie.id), '')
+    FROM movie
+    LEFT JOIN catalog_movie ON catalog_movie.id = movie.catalog_movie_id
+    LEFT JOIN director ON director.id = movie.director_id
+"""
+
+
+def _search_enabled(connection):
+    """Return whether the connection's database has the FTS5 table (SQLite after the migration)."""
+    if connection.dialect.name != 'sqlite':
+        return False
+    enabled = connection.info.get('movie_search_enabled')
+    if enabled is None:
+        enabled = inspect(connection).has_table(SEARCH_TABLE)
+        connection.info['movie_search_enabled'] = enabled
+    return enabled
+
+
+def rebuild_search_index():
+    """Rewrite every row of the search index from the movie table, without committing."""
+    connection = db.session.connection()
+    if not _search_enabled(connection):
+        return
+    connection.execute(text(f'DELETE FROM {SEARCH_TABLE}'))
+    connection.execute(text(_INDEX_ROWS))
+
+
+def _reindex(connection, movie_ids, removed_ids):
+    """Rewrite the index rows of the given movies and drop those of removed movies."""
+    stale = sorted(set(movie_ids) | set(removed_ids))
+    if not stale:
+        return
+    # Parameter lists are chunked to stay below SQLite's variable limit
+    for start in range(0, len(stale), 500):
+        chunk = stale[start:start + 500]
+        placeholders = ', '.join(str(int(movie_id)) for movie_id in chunk)
+        connection.execute(text(f'DELETE FROM {SEARCH_TABLE} WHERE rowid IN ({placeholders})'))
+        connection.execute(text(f'{_INDEX_ROWS} WHERE movie.id IN ({placeholders})'))
+
+
+@event.listens_for(Session, 'after_flush')
+def _sync_search_index(session, flush_context):
+    """Mirror the movies written by this flush into the search index, in the same transaction."""
+    movie_ids, removed_ids = set(), set()
+    catalog_ids, director_ids, genre_ids = set(), set(), set()
+    for obj in session.new | session.dirty:
+        if isinstance(obj, Movie):
+            movie_ids.add(obj.id)
+        elif isinstance(obj, CatalogMovie) and obj in session.dirty:
+            catalog_ids.add(obj.id)
+        elif isinstance(obj, Director) and obj in session.dirty:
+            director_ids.add(obj.id)
+        elif isinstance(obj, Genre) and obj in session.dirty:
+            genre_ids.add(obj.id)
+    for obj in session.deleted:
+        if isinstance(obj, Movie):
+            removed_ids.add(obj.id)
+    if not (movie_ids or removed_ids or catalog_ids or director_ids or genre_ids):
+        return
+
+    connection = session.connection()
+    if not _search_enabled(connection):
+        return
+    related = []
+    if catalog_ids:
+        related.append(Movie.catalog_movie_id.in_(catalog_ids))
+    if director_ids:
+        related.append(Movie.director_id.in_(director_ids))
+    if genre_ids:
+        related.append(Movie.id.in_(select(movie_genre.c.movie_id)
+                                    .where(movie_genre.c.genre_id.in_(genre_ids))))
+    if related:
+        movie_ids.update(connection.execute(select(Movie.id).where(or_(*related))).scalars())
+    _reindex(connection, movie_ids - removed_ids, removed_ids)
+
+
+def fts_query(search_text):
+    """
+    Turn user input into an FTS5 query: every word must match, the last one
+    as a prefix. Operators and quotes in the input are treated as plain text.
+
+    Parameters:
+    search_text (str): The text typed in the search box.
+
+    Returns:
+    str: The FTS5 MATCH expression, or None if the text has no words.
+    """
+    words = re.findall(r'\w+', search_text or '')
+    if not words:
+        return None
+    return ' '.join(f'"{word}"' for word in words) + '*'
+
+
+def _highlight(snippet):
+    """Escape a snippet and turn the highlight markers into <mark> tags."""
+    if not snippet:
+        return None
+    return Markup(str(escape(snippet))
+                  .replace(_MARK_START, '<mark>').replace(_MARK_END, '</mark>'))
+
+
+def encode_cursor(rank, ident):
+    """Encode the position after a result for the next page's ?after= argument."""
+    return f'{float(rank)!r}_{int(ident)}'
+
+
+def decode_cursor(cursor):
+    """Decode an ?after= argument; returns (rank, id), or None if it is missing or malformed."""
+    try:
+        rank, ident = (cursor or '').rsplit('_', 1)
+        return float(rank), int(ident)
+    except ValueError:
+        return None
+
+
+def _hits(match, filters, after, limit):
+    """
+    Run the FTS5 query and return (movie_id, rank, snippet) rows after the cursor.
+    Filters are SQL conditions on the movie table with their parameters.
+    """
+    conditions = [f'{SEARCH_TABLE} MATCH :match'] + [condition for condition, _ in filters]
+    params = {'match': match, 'limit': limit}
+    for _, condition_params in filters:
+        params.update(condition_params)
+    if after:
+        conditions.append(f'({SEARCH_TABLE}.rank > :after_rank OR '
+                          f'({SEARCH_TABLE}.rank = :after_rank AND movie.id > :after_id))')
+        params.update(after_rank=after[0], after_id=after[1])
+    sql = (
+        f"SELECT movie.id, {SEARCH_TABLE}.rank, "
+        f"snippet({SEARCH_TABLE}, -1, '{_MARK_START}', '{_MARK_END}', '…', {SNIPPET_TOKENS}) "
+        f"FROM {SEARCH_TABLE} JOIN movie ON movie.id = {SEARCH_TABLE}.rowid "
+        f"WHERE {' AND '.join(conditions)} "
+        f"ORDER BY {SEARCH_TABLE}.rank, movie.id LIMIT :limit"
+    )
+    return db.session.execute(text(sql), params).all()
+
+
+def _fallback_movie_filter(search_text):
+    """Substring filter used where FTS5 is not available."""
+    pattern = contains_pattern(search_text.strip())
+    return or_(Movie.title.ilike(pattern, escape=LIKE_ESCAPE),
+               Movie.director_id.in_(select(Director.id).where(Director.name.ilike(pattern, escape=LIKE_ESCAPE))))
+
+
+def search_movies_page(search_text, user_id=None, admin_id=None, exclude_ids=None,
+                       after=None, per_page=10):
+    """
+    Search the movies of a user or an admin, one keyset page at a time.
+
+    Parameters:
+    search_text (str): The text typed in the search box.
+    user_id (int): Only search this user's movies, if given.
+    admin_id (int): Only search this admin's movies, if given.
+    exclude_ids (list[int]): Movie ids to leave out, e.g. the user's favorites.
+    after (str): The cursor of the previous page's last result.
+    per_page (int): The number of results per page.
+
+    Returns:
+    tuple: (results, next_cursor). results is a list of SearchResult with the
+    Movie (relationships loaded for listings) and its highlighted snippet;
+    next_cursor is None on the last page.
+    """
+    match = fts_query(search_text)
+    if match is None:
+        return [], None
+    after = decode_cursor(after)
+
+    if not _search_enabled(db.session.connection()):
+        query = Movie.query.filter(_fallback_movie_filter(search_text))
+        if user_id is not None:
+            query = query.filter(Movie.user_id == user_id)
+        if admin_id is not None:
+            query = query.filter(Movie.admin_id == admin_id)
+        if exclude_ids:
+            query = query.filter(Movie.id.notin_(exclude_ids))
+        if after:
+            query = query.filter(Movie.id > after[1])
+        movies = with_listing_relationships(query).order_by(Movie.id).limit(per_page + 1).all()
+        next_cursor = encode_cursor(0, movies[per_page - 1].id) if len(movies) > per_page else None
+        return [SearchResult(movie, None) for movie in movies[:per_page]], next_cursor
+
+    filters = []
+    if user_id is not None:
+        filters.append(('movie.user_id = :user_id', {'user_id': user_id}))
+    if admin_id is not None:
+        filters.append(('movie.admin_id = :admin_id', {'admin_id': admin_id}))
+    if exclude_ids:
+        excluded = ', '.join(str(int(movie_id)) for movie_id in exclude_ids)
+        filters.append((f'movie.id NOT IN ({excluded})', {}))
+    hits = _hits(match, filters, after, per_page + 1)
+
+    page = hits[:per_page]
+    movies = {movie.id: movie for movie in
+              with_listing_relationships(Movie.query.filter(Movie.id.in_([hit[0] for hit in page])))}
+    results = [SearchResult(movies[movie_id], _highlight(snippet))
+               for movie_id, _, snippet in page if movie_id in movies]
+    next_cursor = encode_cursor(page[-1][1], page[-1][0]) if len(hits) > per_page else None
+    return results, next_cursor
+
+
+def search_catalog_page(search_text, after=None, per_page=10):
+    """
+    Search the public catalog, one keyset page at a time. Each film is ranked
+    by its best matching copy.
+
+    Parameters:
+    search_text (str): The text typed in the search box.
+    after (str): The cursor of the previous page's last result.
+    per_page (int): The number of results per page.
+
+    Returns:
+    tuple: (results, next_cursor). results is a list of SearchResult with the
+    CatalogMovie (director and genres loaded) and its highlighted snippet;
+    next_cursor is None on the last page.
+    """
+    match = fts_query(search_text)
+    if match is None:
+        return [], None
+    after = decode_cursor(after)
+
+    if not _search_enabled(db.session.connection()):
+        query = CatalogMovie.query.filter(CatalogMovie.copies.any(_fallback_movie_filter(search_text)))
+        if after:
+            query = query.filter(CatalogMovie.id > after[1])
+        entries = query.order_by(CatalogMovie.id).limit(per_page + 1).all()
+        next_cursor = encode_cursor(0, entries[per_page - 1].id) if len(entries) > per_page else None
+        return [SearchResult(entry, None) for entry in entries[:per_page]], next_cursor
+
+    # Best copy of each film, then the snippet of that copy (snippet() cannot be aggregated)
+    params = {'match': match, 'limit': per_page + 1}
+    after_condition = ''
+    if after:
+        after_condition = 'WHERE best.rank > :after_rank OR (best.rank = :after_rank AND best.catalog_id > :after_id)'
+        params.update(after_rank=after[0], after_id=after[1])
+    sql = (
+        f"WITH hits AS ("
+        f"  SELECT movie.catalog_movie_id AS catalog_id, movie.id AS movie_id, {SEARCH_TABLE}.rank AS rank,"
+        f"         row_number() OVER (PARTITION BY movie.catalog_movie_id"
+        f"                            ORDER BY {SEARCH_TABLE}.rank, movie.id) AS position"
+        f"  FROM {SEARCH_TABLE} JOIN movie ON movie.id = {SEARCH_TABLE}.rowid"
+        f"  WHERE {SEARCH_TABLE} MATCH :match AND movie.catalog_movie_id IS NOT NULL"
+        f"), best AS (SELECT catalog_id, movie_id, rank FROM hits WHERE position = 1) "
+        f"SELECT best.catalog_id, best.rank, best.movie_id FROM best {after_condition} "
+        f"ORDER BY best.rank, best.catalog_id LIMIT :limit"
+    )
+    hits = db.session.execute(text(sql), params).all()
+    page = hits[:per_page]
+
+    snippets = {}
+    if page:
+        movie_ids = ', '.join(str(int(hit[2])) for hit in page)
+        snippets = dict(db.session.execute(text(
+            f"SELECT rowid, snippet({SEARCH_TABLE}, -1, '{_MARK_START}', '{_MARK_END}', '…', "
+            f"{SNIPPET_TOKENS}) FROM {SEARCH_TABLE} "
+            f"WHERE {SEARCH_TABLE} MATCH :match AND rowid IN ({movie_ids})"
+        ), {'match': match}).all())
+    entries = {entry.id: entry for entry in CatalogMovie.query.options(
+        db.joinedload(CatalogMovie.director), db.selectinload(CatalogMovie.genres)
+    ).filter(CatalogMovie.id.in_([hit[0] for hit in page]))}
+    results = [SearchResult(entries[catalog_id], _highlight(snippets.get(movie_id)))
+               for catalog_id, _, movie_id in page if catalog_id in entries]
+    next_cursor = encode_cursor(page[-1][1], page[-1][0]) if len(hits) > per_page else None
+    return results, next_cursor
@@ -0,0 +1,60 @@
+from sqlalchemy import func
+from models import CatalogMovie, db
+from datamanager.sqlite_data_manager import SQLiteDataManager
+from datamanager.db_engine import POSTGRES_ENGINE_OPTIONS
+from datamanager.movie_queries import LIKE_ESCAPE, contains_pattern
+
+
+class PostgresDataManager(SQLiteDataManager):
+    """
+    Data Manager class to handle database operations with PostgreSQL using SQLAlchemy.
+    The ORM operations are shared with SQLiteDataManager (directors and genres are
+    upserted with ON CONFLICT by datamanager/lookups.py on both backends); this
+    class swaps in a pooled PostgreSQL engine and trigram-ranked title search.
+
+    Attributes:
+        db (SQLAlchemy): The SQLAlchemy instance to interact with the PostgreSQL database.
+    """
+
+    def __init__(self, app):
+        """
+        Initializes the PostgresDataManager with a Flask app and configures the database.
+
+        Args:
+            app (Flask): The Flask application instance. Its DATABASE_URL config
+            must point at the PostgreSQL database.
+        """
+        uri = app.config.get('DATABASE_URL')
+        if not uri:
+            raise ValueError('DATABASE_URL must be set to use the PostgreSQL backend.')
+        if uri.startswith('postgres://'):  # Scheme used by some hosting providers
+            uri = 'postgresql://' + uri[len('postgres://'):]
+
+        app.config['SQLALCHEMY_DATABASE_URI'] = uri
+        app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        options = dict(POSTGRES_ENGINE_OPTIONS)
+        options.update(app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+        db.init_app(app)
+        self.db = db
+
+    def search_movies(self, term, limit=20):
+        """
+        Searches the catalog for films whose title contains the given text.
+        The ILIKE filter is served by the pg_trgm index on catalog_movie.title,
+        and results are ranked by trigram similarity to the search text.
+
+        Args:
+            term (str): The text to look for, case-insensitive.
+            limit (int): The maximum number of results.
+
+        Returns:
+            List[CatalogMovie]: The matching films, best match first.
+        """
+        return (
+            CatalogMovie.query
+            .filter(CatalogMovie.title.ilike(contains_pattern(term), escape=LIKE_ESCAPE))
+            .order_by(func.similarity(CatalogMovie.title, term).desc(), CatalogMovie.title)
+            .limit(limit)
+            .all()
+        )
@@ -0,0 +1,338 @@
+"""
+shared_cache.py
+
+This module chooses the Flask-Caching backend from the app config and
+contains a cache backend that every worker process on the host shares
+without an outside service.
+
+CACHE_BACKEND selects the backend:
+
+- 'sqlite' (default): SQLiteCache below, one SQLite file in WAL mode
+  (CACHE_SQLITE_PATH) with least-recently-used eviction once it holds more
+  than CACHE_THRESHOLD entries or CACHE_SQLITE_MAX_SIZE bytes;
+- 'redis': Flask-Caching's RedisCache on CACHE_REDIS_URL, for any
+  Redis-compatible server (needs the redis package);
+- 'simple': Flask-Caching's SimpleCache, a dict in each process. Workers do
+  not see each other's entries or invalidations; for development only.
+"""
+
+import os
+import pickle
+import random
+import sqlite3
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+from multiprocessing import Pool
+from flask_caching.backends.base import BaseCache
+from werkzeug.utils import import_string
+
+DEFAULT_THRESHOLD = 2000  # Entries kept before the least recently used are evicted
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024  # Bytes of values kept before the same
+PRUNE_EVERY = 50  # Writes of a process between two size checks
+PRUNE_TARGET = 0.8  # An eviction shrinks the cache to this share of both limits
+TOUCH_INTERVAL = 5  # Seconds; a hit refreshes the entry's last use at most this often
+
+CACHE_BACKENDS = {
+    'sqlite': 'datamanager.shared_cache.SQLiteCache',
+    'redis': 'RedisCache',
+    'simple': 'SimpleCache',
+}
+
+
+def configure_cache(app, db_directory):
+    """
+    Set the Flask-Caching config of the backend chosen by CACHE_BACKEND.
+
+    Parameters:
+    app (Flask): The Flask application instance.
+    db_directory (str): The directory of the default SQLite cache file.
+
+    Returns:
+    None
+    """
+    backend = app.config.get('CACHE_BACKEND', 'sqlite')
+    if backend not in CACHE_BACKENDS:
+        raise ValueError(f"Unknown CACHE_BACKEND '{backend}', "
+                         f"expected one of: {', '.join(CACHE_BACKENDS)}")
+    app.config['CACHE_TYPE'] = CACHE_BACKENDS[backend]
+    app.config.setdefault('CACHE_THRESHOLD', DEFAULT_THRESHOLD)
+    app.config.setdefault('CACHE_SQLITE_PATH', os.path.join(db_directory, 'fragment_cache.db'))
+    app.config.setdefault('CACHE_SQLITE_MAX_SIZE', DEFAULT_MAX_SIZE)
+    app.config.setdefault('CACHE_KEY_PREFIX', 'moviweb:')  # Used by the Redis backend
+
+
+class SQLiteCache(BaseCache):
+    """
+    Flask-Caching backend storing pickled values in a SQLite file shared by
+    every process that opens it.
+
+    Reads run concurrently with writes thanks to WAL mode. Each entry
+    records its size and last use; every PRUNE_EVERY writes a process drops
+    the expired entries and, if a limit is exceeded, the least recently used
+    ones. Last use is refreshed at most every TOUCH_INTERVAL seconds, so
+    most hits do not write.
+
+    Attributes:
+        path (str): The SQLite file.
+        threshold (int): Maximum number of entries.
+        max_size (int): Maximum total size of the pickled values, in bytes.
+    """
+
+    def __init__(self, path, default_timeout=300, threshold=DEFAULT_THRESHOLD, max_size=DEFAULT_MAX_SIZE):
+        super().__init__(default_timeout)
+        self.path = path
+        self.threshold = threshold
+        self.max_size = max_size
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        conn = self._connection()
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache ('
+            'key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL, '
+            'accessed_at REAL NOT NULL, size INTEGER NOT NULL)'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS ix_cache_accessed_at ON cache (accessed_at)')
+
+    @classmethod
+    def factory(cls, app, config, args, kwargs):
+        """Build the cache from the Flask-Caching config (called by Cache.init_app)."""
+        kwargs.update(path=config['CACHE_SQLITE_PATH'],
+                      threshold=config.get('CACHE_THRESHOLD', DEFAULT_THRESHOLD),
+                      max_size=config.get('CACHE_SQLITE_MAX_SIZE', DEFAULT_MAX_SIZE))
+        return cls(*args, **kwargs)
+
+    def _connection(self):
+        """
+        Return this thread's connection, opening a new one in a forked worker
+        (SQLite connections must not cross a fork).
+        """
+        if getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return self._local.conn
+
+    @contextmanager
+    def _transaction(self):
+        """Run statements in one write transaction, rolled back on error."""
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+
+    def _expires_at(self, timeout):
+        """Return the expiry time of a timeout, or None for entries that never expire."""
+        timeout = self._normalize_timeout(timeout)
+        return time.time() + timeout if timeout else None
+
+    def _row(self, key, value, timeout):
+        """Return the INSERT parameters of an entry."""
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        return key, data, self._expires_at(timeout), time.time(), len(data)
+
+    def _fetch(self, keys):
+        """Return {key: value} of the live entries among keys, refreshing their last use."""
+        now = time.time()
+        conn = self._connection()
+        rows = conn.execute(
+            f"SELECT key, value, accessed_at FROM cache WHERE key IN ({', '.join('?' * len(keys))}) "
+            'AND (expires_at IS NULL OR expires_at > ?)', (*keys, now)
+        ).fetchall()
+        stale = [(now, key) for key, _, accessed_at in rows if now - accessed_at > TOUCH_INTERVAL]
+        if stale:
+            conn.executemany('UPDATE cache SET accessed_at = ? WHERE key = ?', stale)
+        return {key: pickle.loads(value) for key, value, _ in rows}
+
+    def _wrote(self, count=1):
+        """Count writes and prune every PRUNE_EVERY of them."""
+        with self._writes_lock:
+            self._writes += count
+            due = self._writes >= PRUNE_EVERY
+            if due:
+                self._writes = 0
+        if due:
+            self.prune()
+
+    def get(self, key):
+        return self._fetch([key]).get(key)
+
+    def get_many(self, *keys):
+        found = self._fetch(list(keys)) if keys else {}
+        return [found.get(key) for key in keys]
+
+    def has(self, key):
+        row = self._connection().execute(
+            'SELECT 1 FROM cache WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)', (key, time.time())
+        ).fetchone()
+        return row is not None
+
+    def set(self, key, value, timeout=None):
+        row = self._row(key, value, timeout)
+        if row[4] > self.max_size:
+            return False
+        self._connection().execute('INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?)', row)
+        self._wrote()
+        return True
+
+    def add(self, key, value, timeout=None):
+        # Only replaces an expired entry, so concurrent add()s of one key agree on a single value
+        cursor = self._connection().execute(
+            'INSERT INTO cache VALUES (?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET '
+            'value = excluded.value, expires_at = excluded.expires_at, '
+            'accessed_at = excluded.accessed_at, size = excluded.size '
+            'WHERE cache.expires_at <= excluded.accessed_at', self._row(key, value, timeout)
+        )
+        if cursor.rowcount:
+            self._wrote()
+        return cursor.rowcount > 0
+
+    def set_many(self, mapping, timeout=None):
+        rows = [self._row(key, value, timeout) for key, value in mapping.items()]
+        rows = [row for row in rows if row[4] <= self.max_size]
+        with self._transaction() as conn:
+            conn.executemany('INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?)', rows)
+        self._wrote(len(rows))
+        return [row[0] for row in rows]
+
+    def delete(self, key):
+        return self._connection().execute('DELETE FROM cache WHERE key = ?', (key,)).rowcount > 0
+
+    def delete_many(self, *keys):
+        with self._transaction() as conn:
+            return [key for key in keys
+                    if conn.execute('DELETE FROM cache WHERE key = ?', (key,)).rowcount]
+
+    def clear(self):
+        self._connection().execute('DELETE FROM cache')
+        return True
+
+    def inc(self, key, delta=1):
+        with self._transaction() as conn:
+            row = conn.execute(
+                'SELECT value, expires_at FROM cache WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)',
+                (key, time.time())
+            ).fetchone()
+            value = (pickle.loads(row[0]) if row else 0) + delta
+            data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            conn.execute('INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?)',
+                         (key, data, row[1] if row else self._expires_at(None), time.time(), len(data)))
+        return value
+
+    def dec(self, key, delta=1):
+        return self.inc(key, -delta)
+
+    def prune(self):
+        """
+        Drop the expired entries, then the least recently used ones while
+        either limit is exceeded, down to PRUNE_TARGET of both limits.
+
+        Returns:
+        None
+        """
+        with self._transaction() as conn:
+            conn.execute('DELETE FROM cache WHERE expires_at <= ?', (time.time(),))
+            count, size = conn.execute('SELECT count(*), total(size) FROM cache').fetchone()
+            if count <= self.threshold and size <= self.max_size:
+                return
+            conn.execute(
+                'DELETE FROM cache WHERE key IN ('
+                ' SELECT key FROM ('
+                '  SELECT key, row_number() OVER recent AS position, sum(size) OVER recent AS kept'
+                '  FROM cache WINDOW recent AS (ORDER BY accessed_at DESC ROWS UNBOUNDED PRECEDING))'
+                ' WHERE position > ? OR kept > ?)',
+                (int(self.threshold * PRUNE_TARGET), int(self.max_size * PRUNE_TARGET))
+            )
+
+
+def create_cache(config):
+    """
+    Create the cache backend of a config outside of a Flask app.
+
+    Parameters:
+    config (dict): The app config, after configure_cache().
+
+    Returns:
+    BaseCache: The backend.
+    """
+    config = dict({'CACHE_IGNORE_ERRORS': False}, **config)  # Defaults Cache.init_app() would add
+    cache_type = config['CACHE_TYPE']
+    if '.' not in cache_type:
+        cache_type = 'flask_caching.backends.' + cache_type
+    return import_string(cache_type).factory(None, config, [],
+                                             {'default_timeout': config.get('CACHE_DEFAULT_TIMEOUT', 300)})
+
+
+def _benchmark_worker(config, requests, keys, render_ms, seed):
+    """
+    Serve requests for Zipf-distributed fragment keys from a fresh backend in
+    one process, "rendering" (sleeping render_ms) and storing on a miss.
+
+    Returns:
+    tuple: (hits, latencies of the cache reads in seconds)
+    """
+    cache = create_cache(config)
+    rng = random.Random(seed)
+    weights = [1 / rank for rank in range(1, keys + 1)]
+    hits, latencies = 0, []
+    for key in rng.choices(range(keys), weights, k=requests):
+        start = time.perf_counter()
+        value = cache.get(f'bench:{key}')
+        latencies.append(time.perf_counter() - start)
+        if value is None:
+            time.sleep(render_ms / 1000)
+            cache.set(f'bench:{key}', 'x' * 2048)
+        else:
+            hits += 1
+    return hits, latencies
+
+
+def benchmark(config, processes=4, requests=2000, keys=500, render_ms=2.0, seed=0):
+    """
+    Measure the hit ratio and read latency of a backend shared by several
+    worker processes, the way gunicorn workers share it.
+
+    Parameters:
+    config (dict): The app config, after configure_cache().
+    processes (int): Worker processes.
+    requests (int): Requests per process.
+    keys (int): Distinct fragment keys.
+    render_ms (float): Time a miss spends rendering, in milliseconds.
+    seed (int): Makes the key sequence reproducible.
+
+    Returns:
+    dict: hit_ratio, p50_ms, p95_ms (cache reads) and seconds (wall time).
+    """
+    # Use a separate file / key prefix, so the benchmark never touches the app's entries
+    config = dict(config, CACHE_SQLITE_PATH=config['CACHE_SQLITE_PATH'] + '.bench',
+                  CACHE_KEY_PREFIX=(config.get('CACHE_KEY_PREFIX') or '') + 'bench:')
+    create_cache(config).clear()
+    start = time.perf_counter()
+    with Pool(processes) as pool:
+        results = pool.starmap(_benchmark_worker, [(config, requests, keys, render_ms, seed + worker)
+                                                   for worker in range(processes)])
+    seconds = time.perf_counter() - start
+    create_cache(config).clear()
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(config['CACHE_SQLITE_PATH'] + suffix):
+            os.remove(config['CACHE_SQLITE_PATH'] + suffix)
+
+    hits = sum(worker_hits for worker_hits, _ in results)
+    latencies = sorted(latency for _, worker_latencies in results for latency in worker_latencies)
+    return {
+        'hit_ratio': hits / (processes * requests),
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p95_ms': latencies[int(len(latencies) * 0.95)] * 1000,
+        'seconds': seconds,
+    }
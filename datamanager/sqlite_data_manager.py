@@ -1,5 +1,10 @@
-from models import User, Movie, Director, Admin, Genre, db
+from models import User, Movie, CatalogMovie, Admin, Genre, Favorite, db
+from datamanager import counters
 from datamanager.data_manager_interface import DataManagerInterface
+from datamanager.stats_service import get_admin_stats
+from datamanager.db_engine import configure_sqlite_engine
+from datamanager.lookups import resolve_director, resolve_genres
+from datamanager.movie_search import search_catalog_page
 
 
 class SQLiteDataManager(DataManagerInterface):
@@ -17,8 +22,9 @@ class SQLiteDataManager(DataManagerInterface):
         Args:
             app (Flask): The Flask application instance.
         """
-        app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///db/moviwebapp.db'
+        app.config.setdefault('SQLALCHEMY_DATABASE_URI', 'sqlite:///db/moviwebapp.db')
         app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        configure_sqlite_engine(app)
         db.init_app(app)
         self.db = db
 
@@ -85,6 +91,7 @@ class SQLiteDataManager(DataManagerInterface):
         new_user = User(name=user_name, email=user_email)
         new_user.set_password(user_password)
         self.db.session.add(new_user)
+        counters.user_added(new_user)
         self.db.session.commit()
 
     def add_admin(self, admin_name, admin_email, admin_password):
@@ -108,14 +115,14 @@ class SQLiteDataManager(DataManagerInterface):
         Args:
             movie_data (dict): A dictionary containing movie details 
             like title, director, year, genres, etc.
-        """
-        director_name = movie_data.get('director')
-        director = Director.query.filter_by(name=director_name).first()
 
-        if not director:
-            director = Director(name=director_name)
-            self.db.session.add(director)
-            self.db.session.commit()
+        Raises:
+            ValueError: If the director is blank.
+        """
+        director = resolve_director(movie_data.get('director'))
+        if director is None:
+            raise ValueError('A movie needs a director.')
+        genres = resolve_genres(movie_data.get('genres', []))
 
         new_movie = Movie(
             user_id=movie_data.get('user_id'),
@@ -124,23 +131,45 @@ class SQLiteDataManager(DataManagerInterface):
             director_id=director.id,
             year=movie_data.get('year'),
             rating=movie_data.get('rating'),
-            plot=movie_data.get('plot', ''),
-            poster=movie_data.get('poster', ''),
-            imdbID=movie_data.get('imdbID')
+            catalog_movie=self._find_or_create_catalog_movie(movie_data, director, genres),
+            genres=genres
         )
+        # Director, genres, catalog entry and movie are saved in one transaction
         self.db.session.add(new_movie)
+        counters.movie_added(new_movie)
         self.db.session.commit()
 
-        # Handle genres
-        genres = movie_data.get('genres', [])
-        for genre_name in genres:
-            genre = Genre.query.filter_by(name=genre_name).first()
-            if not genre:
-                genre = Genre(name=genre_name)
-                self.db.session.add(genre)
-                self.db.session.commit()
-            new_movie.genres.append(genre)
-        self.db.session.commit()
+    def _find_or_create_catalog_movie(self, movie_data, director, genres):
+        """
+        Finds the catalog entry for a movie by its imdbID, or creates it.
+        An existing entry keeps its metadata and genres.
+
+        Args:
+            movie_data (dict): A dictionary containing movie details.
+            director (Director): The director of the movie.
+            genres (List[Genre]): The genres of a new entry.
+
+        Returns:
+            CatalogMovie: The catalog entry, or None if no imdbID was given.
+        """
+        imdb_id = movie_data.get('imdbID')
+        if not imdb_id:
+            return None
+
+        catalog_movie = CatalogMovie.query.filter_by(imdbID=imdb_id).first()
+        if not catalog_movie:
+            catalog_movie = CatalogMovie(
+                imdbID=imdb_id,
+                title=movie_data.get('title'),
+                director_id=director.id,
+                year=movie_data.get('year'),
+                rating=movie_data.get('rating'),
+                plot=movie_data.get('plot', ''),
+                poster=movie_data.get('poster', ''),
+                trailer=movie_data.get('trailer', ''),
+                genres=list(genres)
+            )
+        return catalog_movie
 
     def update_movie(self, movie_id, new_data):
         """
@@ -150,34 +179,26 @@ class SQLiteDataManager(DataManagerInterface):
             movie_id (int): The ID of the movie to be updated.
             new_data (dict): A dictionary containing updated movie details like title, 
             director, year, genres, etc.
+
+        Raises:
+            ValueError: If the director is blank.
         """
         movie = Movie.query.get(movie_id)
         if movie:
-            director_name = new_data.get('director')
-            director = Director.query.filter_by(name=director_name).first()
-
-            if not director:
-                director = Director(name=director_name)
-                self.db.session.add(director)
-                self.db.session.commit()
+            director = resolve_director(new_data.get('director'))
+            if director is None:
+                raise ValueError('A movie needs a director.')
 
             movie.title = new_data.get('title')
             movie.director_id = director.id
             movie.year = new_data.get('year')
             movie.rating = new_data.get('rating')
+            counters.movie_admin_changed(movie.admin_id, new_data.get('admin_id'))
             movie.admin_id = new_data.get('admin_id')
-            movie.imdbID = new_data.get('imdbID')
+            movie.catalog_movie = CatalogMovie.query.filter_by(imdbID=new_data.get('imdbID')).first()
 
             # Update genres
-            movie.genres = []
-            genres = new_data.get('genres', [])
-            for genre_name in genres:
-                genre = Genre.query.filter_by(name=genre_name).first()
-                if not genre:
-                    genre = Genre(name=genre_name)
-                    self.db.session.add(genre)
-                    self.db.session.commit()
-                movie.genres.append(genre)
+            movie.genres = resolve_genres(new_data.get('genres', []))
             self.db.session.commit()
 
     def delete_movie(self, movie_id):
@@ -189,6 +210,8 @@ class SQLiteDataManager(DataManagerInterface):
         """
         movie = Movie.query.get(movie_id)
         if movie:
+            counters.movie_removed(movie)
+            Favorite.query.filter_by(movie_id=movie.id).delete()
             self.db.session.delete(movie)
             self.db.session.commit()
 
@@ -201,9 +224,25 @@ class SQLiteDataManager(DataManagerInterface):
         """
         user = User.query.get(user_id)
         if user:
+            counters.user_removed(user)
             self.db.session.delete(user)
             self.db.session.commit()
 
+    def search_movies(self, term, limit=20):
+        """
+        Searches the catalog for films whose title, plot, director or genres
+        match the given words, using the movie_search FTS5 index.
+
+        Args:
+            term (str): The words to look for; the last one may be a prefix.
+            limit (int): The maximum number of results.
+
+        Returns:
+            List[CatalogMovie]: The matching films, best match first.
+        """
+        results, _ = search_catalog_page(term, per_page=limit)
+        return [result.item for result in results]
+
     def get_reports(self):
         """
         Generates a report of the total number of users and movies.
@@ -211,6 +250,5 @@ class SQLiteDataManager(DataManagerInterface):
         Returns:
             dict: A dictionary containing the number of users and movies.
         """
-        num_users = User.query.count()
-        num_movies = Movie.query.count()
-        return {'num_users': num_users, 'num_movies': num_movies}
+        stats = get_admin_stats()
+        return {'num_users': stats.num_users_total, 'num_movies': stats.num_movies_total}
@@ -0,0 +1,403 @@
+"""
+static_assets.py
+
+This module builds the static files the pages load into static/dist/:
+
+- the theme scripts every page loads (jQuery and its plugins, util.js,
+  main.js and message.js) are bundled into js/site.js, one request instead of eight;
+- scripts and style sheets are minified (files named *.min.* are used as they are);
+- every file gets the hash of its content in its name, e.g. js/site.3f9a0c1d2e.js,
+  and style sheets point at the hashed names of the fonts and images they use;
+- text files get .gz (and, with brotli installed, .br) copies next to them,
+  so they are compressed once at build time instead of on every request.
+
+dist/manifest.json maps source names to hashed names; the asset_url()
+template global (app.py) looks names up in it. A hashed name changes whenever
+the content does, so app.py serves dist/ with a one-year immutable
+Cache-Control: browsers never ask for a file twice, and a new build is picked
+up through the new names in the pages.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import posixpath
+import re
+
+try:
+    import brotli  # Optional; without it only .gz copies are written
+except ImportError:
+    brotli = None
+
+DIST_DIRECTORY = 'dist'
+MANIFEST_NAME = 'manifest.json'
+HASH_LENGTH = 10
+LONG_CACHE_SECONDS = 365 * 24 * 3600
+
+# Bundle name -> sources, in load order
+BUNDLES = {
+    'js/site.js': ['js/jquery.min.js', 'js/jquery.scrolly.min.js', 'js/jquery.scrollex.min.js',
+                   'js/browser.min.js', 'js/breakpoints.min.js', 'js/util.js', 'js/main.js',
+                   'js/message.js'],
+}
+
+# Directories under static/ that are not served from dist/: the build output,
+# the Sass sources of main.css and uploaded profile pictures
+SKIPPED_DIRECTORIES = ('dist', 'sass', 'images/upload')
+
+# Extensions worth keeping pre-compressed copies of; images and woff fonts are compressed already
+COMPRESSIBLE_EXTENSIONS = {'.js', '.css', '.svg', '.ttf', '.eot', '.json', '.txt'}
+
+# Encodings of the pre-compressed copies, in order of preference
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+
+_URL_PATTERN = re.compile(r'''url\(\s*(?:"([^"]*)"|'([^']*)'|([^'")\s]*))\s*\)''')
+_REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+_REGEX_KEYWORDS = ('return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'void', 'delete')
+
+
+def _strip_js_comments(source):
+    """
+    Minify a script conservatively: drop comments (except license headers),
+    indentation, trailing spaces and blank lines. Line breaks are kept, so
+    automatic semicolon insertion works as before; strings, template literals
+    and regular expression literals are copied untouched.
+
+    Parameters:
+    source (str): The script.
+
+    Returns:
+    str: The minified script.
+    """
+    out = []
+    i, length = 0, len(source)
+    last_code = ''  # Last non-blank character of code, to tell a regex from a division
+
+    def ends_with_keyword():
+        text = ''.join(out[-12:]).rstrip()
+        return any(text.endswith(keyword) and not (text[:-len(keyword)][-1:].isalnum())
+                   for keyword in _REGEX_KEYWORDS)
+
+    while i < length:
+        char = source[i]
+        if char == '/' and source.startswith('//', i):
+            end = source.find('\n', i)
+            i = length if end == -1 else end
+        elif char == '/' and source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            end = length if end == -1 else end + 2
+            comment = source[i:end]
+            if 'license' in comment.lower() or comment.startswith('/*!'):
+                out.append(comment)
+            else:
+                out.append('\n' if '\n' in comment else ' ')
+            i = end
+        elif char in '\'"`' or (char == '/' and (not last_code or last_code in _REGEX_PRECEDERS
+                                                 or ends_with_keyword())):
+            # A string, template literal or regex literal: copy up to the closing delimiter
+            start, i, in_class = i, i + 1, False
+            while i < length:
+                if source[i] == '\\':
+                    i += 2
+                    continue
+                if char == '/' and source[i] in '[]':
+                    in_class = source[i] == '['
+                elif source[i] == char and not in_class:
+                    break
+                elif source[i] == '\n' and char != '`':
+                    break  # Unterminated; leave the rest of the line as it is
+                i += 1
+            i += 1
+            # Line breaks inside template literals are hidden from the line stripping below
+            out.append(source[start:i].replace('\n', '\x00'))
+            last_code = char
+        else:
+            out.append(char)
+            if not char.isspace():
+                last_code = char
+            i += 1
+
+    lines = (line.strip() for line in ''.join(out).split('\n'))
+    return '\n'.join(line for line in lines if line).replace('\x00', '\n') + '\n'
+
+
+def _minify_css(source):
+    """
+    Minify a style sheet: drop comments (except /*! ones) and the whitespace
+    around braces, semicolons, commas and after colons. Strings are copied untouched.
+
+    Parameters:
+    source (str): The style sheet.
+
+    Returns:
+    str: The minified style sheet.
+    """
+    out = []
+    i, length = 0, len(source)
+    while i < length:
+        char = source[i]
+        if source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            end = length if end == -1 else end + 2
+            if source.startswith('/*!', i):
+                out.append(source[i:end])
+            else:
+                out.append(' ')
+            i = end
+        elif char in '\'"':
+            start, i = i, i + 1
+            while i < length and source[i] != char:
+                i += 2 if source[i] == '\\' else 1
+            i += 1
+            out.append(source[start:i])
+        elif char.isspace():
+            while i < length and source[i].isspace():
+                i += 1
+            out.append(' ')
+        else:
+            out.append(char)
+            i += 1
+
+    # Work on the parts outside strings only (odd indexes are strings)
+    parts = re.split(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')''', ''.join(out))
+    for index in range(0, len(parts), 2):
+        part = re.sub(r'\s*([{};,])\s*', r'\1', parts[index])
+        part = re.sub(r':\s+', ':', part)
+        parts[index] = part.replace(';}', '}')
+    return ''.join(parts).strip() + '\n'
+
+
+def _hashed_name(name, content):
+    """Return name with the hash of content before its extension, e.g. js/site.3f9a0c1d2e.js."""
+    root, extension = posixpath.splitext(name)
+    return f'{root}.{hashlib.sha1(content).hexdigest()[:HASH_LENGTH]}{extension}'
+
+
+def _is_minified(name):
+    return '.min.' in posixpath.basename(name)
+
+
+def _source_names(static_folder):
+    """Return the names (relative to static/, with '/') of the files served from dist/."""
+    names = []
+    for directory, subdirectories, files in os.walk(static_folder):
+        relative = posixpath.normpath(os.path.relpath(directory, static_folder).replace(os.sep, '/'))
+        subdirectories[:] = [subdirectory for subdirectory in sorted(subdirectories)
+                             if posixpath.normpath(posixpath.join(relative, subdirectory))
+                             not in SKIPPED_DIRECTORIES and not subdirectory.startswith('.')]
+        names.extend(posixpath.normpath(posixpath.join(relative, file))
+                     for file in sorted(files) if not file.startswith('.'))
+    return names
+
+
+def _read(static_folder, name):
+    with open(os.path.join(static_folder, *name.split('/')), 'rb') as file:
+        return file.read()
+
+
+def _write(dist_folder, name, content):
+    """Write a file of dist/ through a temporary file, so readers never see half of it."""
+    path = os.path.join(dist_folder, *name.split('/'))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary_path = f'{path}.{os.getpid()}.tmp'
+    with open(temporary_path, 'wb') as file:
+        file.write(content)
+    os.replace(temporary_path, path)
+
+
+def _compressed_copies(name, content):
+    """
+    Return the pre-compressed copies of a file worth keeping.
+
+    Parameters:
+    name (str): The hashed name.
+    content (bytes): The file content.
+
+    Returns:
+    dict: Copy name (e.g. 'js/site.3f9a0c1d2e.js.gz') -> content.
+    """
+    if posixpath.splitext(name)[1] not in COMPRESSIBLE_EXTENSIONS:
+        return {}
+    candidates = {name + '.gz': gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        candidates[name + '.br'] = brotli.compress(content, quality=11)
+    return {copy: data for copy, data in candidates.items() if len(data) < len(content)}
+
+
+def _rewrite_css_urls(name, source, manifest):
+    """
+    Point the url() references of a style sheet at the hashed names of their
+    targets. References to files that are not in dist/ are adjusted so they
+    still reach the same URL from dist/.
+
+    Parameters:
+    name (str): The style sheet name, e.g. 'css/main.css'.
+    source (str): Its content.
+    manifest (dict): Source name -> hashed name of the files built so far.
+
+    Returns:
+    str: The style sheet with rewritten references.
+    """
+    directory = posixpath.dirname(name)
+
+    def replace(match):
+        url = next(group for group in match.groups() if group is not None)
+        if not url or url.startswith(('data:', '#', '/')) or '://' in url:
+            return match.group(0)
+        path, suffix = re.match(r'([^?#]*)(.*)', url).groups()
+        target = posixpath.normpath(posixpath.join(directory, path))
+        if target in manifest:
+            # Hashed names stay in the directory of their source
+            new_path = posixpath.relpath(manifest[target], directory)
+        else:
+            new_path = posixpath.relpath(target, posixpath.join(DIST_DIRECTORY, directory))
+        return f'url("{new_path}{suffix}")'
+
+    return _URL_PATTERN.sub(replace, source)
+
+
+def _css_dependencies(name, source, css_names):
+    directory = posixpath.dirname(name)
+    targets = (posixpath.normpath(posixpath.join(directory, re.match(r'[^?#]*', url).group(0)))
+               for groups in _URL_PATTERN.findall(source) for url in groups if url)
+    return [target for target in targets if target in css_names and target != name]
+
+
+def load_manifest(static_folder):
+    """
+    Read dist/manifest.json.
+
+    Parameters:
+    static_folder (str): The static folder of the app.
+
+    Returns:
+    dict: Source name -> hashed name (relative to dist/), empty if nothing is built.
+    """
+    try:
+        with open(os.path.join(static_folder, DIST_DIRECTORY, MANIFEST_NAME)) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def build_id(static_folder, template_folder):
+    """
+    Hash the built manifest and the templates, so pages rendered by another
+    deploy get other ETags (controllers/common_fun.py conditional_get()).
+
+    Parameters:
+    static_folder (str): The static folder of the app.
+    template_folder (str): The template folder of the app.
+
+    Returns:
+    str: A short hex digest.
+    """
+    digest = hashlib.sha1(json.dumps(load_manifest(static_folder), sort_keys=True).encode())
+    for root, directories, files in os.walk(template_folder):
+        directories.sort()
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            digest.update(os.path.relpath(path, template_folder).encode())
+            with open(path, 'rb') as file:
+                digest.update(file.read())
+    return digest.hexdigest()[:12]
+
+
+def needs_build(static_folder):
+    """Return True if dist/ is missing or older than a source file or this module."""
+    manifest_path = os.path.join(static_folder, DIST_DIRECTORY, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return True
+    built_at = os.path.getmtime(manifest_path)
+    paths = [os.path.join(static_folder, *name.split('/')) for name in _source_names(static_folder)]
+    return any(os.path.getmtime(path) > built_at for path in paths + [__file__])
+
+
+def build_assets(static_folder):
+    """
+    Build static/dist/: minify, bundle, fingerprint and pre-compress the
+    static files, write the manifest, then remove the files that neither the
+    new nor the previous build uses (pages rendered before the build may still
+    ask for the previous ones).
+
+    Parameters:
+    static_folder (str): The static folder of the app.
+
+    Returns:
+    dict: The new manifest, source name -> hashed name (relative to dist/).
+    """
+    dist_folder = os.path.join(static_folder, DIST_DIRECTORY)
+    previous_manifest = load_manifest(static_folder)
+    names = _source_names(static_folder)
+    css_names = {name for name in names if name.endswith('.css')}
+    contents, manifest, written = {}, {}, set()
+
+    def emit(name, content):
+        hashed = _hashed_name(name, content)
+        manifest[name] = hashed
+        files = dict(_compressed_copies(hashed, content), **{hashed: content})
+        for file_name, data in files.items():
+            if not os.path.exists(os.path.join(dist_folder, *file_name.split('/'))):
+                _write(dist_folder, file_name, data)
+        written.update(files)
+
+    for name in names:
+        if name in css_names:
+            continue
+        content = _read(static_folder, name)
+        if name.endswith('.js') and not _is_minified(name):
+            content = _strip_js_comments(content.decode('utf-8')).encode('utf-8')
+        contents[name] = content
+        emit(name, content)
+
+    for bundle, sources in BUNDLES.items():
+        # A semicolon between files, in case one does not end its last statement
+        emit(bundle, b';\n'.join(contents[source].rstrip() for source in sources) + b'\n')
+
+    def emit_css(name, pending=()):
+        if name in manifest:
+            return
+        source = _read(static_folder, name).decode('utf-8')
+        for dependency in _css_dependencies(name, source, css_names):
+            if dependency not in pending:  # Style sheets importing each other keep their plain names
+                emit_css(dependency, pending + (name,))
+        if not _is_minified(name):
+            source = _minify_css(source)
+        emit(name, _rewrite_css_urls(name, source, manifest).encode('utf-8'))
+
+    for name in sorted(css_names):
+        emit_css(name)
+
+    _write(dist_folder, MANIFEST_NAME, json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+
+    # Keep this build's and the previous build's files, with their compressed copies
+    keep = {MANIFEST_NAME} | written
+    keep.update(name + extension for name in previous_manifest.values()
+                for extension in ('', '.gz', '.br'))
+    for directory, _, files in os.walk(dist_folder):
+        for file in files:
+            path = os.path.join(directory, file)
+            name = os.path.relpath(path, dist_folder).replace(os.sep, '/')
+            if name not in keep and not file.endswith('.tmp'):
+                os.remove(path)
+    return manifest
+
+
+def precompressed_variant(dist_folder, filename, accept_encodings):
+    """
+    Pick the pre-compressed copy of a dist/ file the client accepts.
+
+    Parameters:
+    dist_folder (str): The dist/ folder.
+    filename (str): The requested hashed name.
+    accept_encodings (MIMEAccept): The request's Accept-Encoding.
+
+    Returns:
+    tuple: (file name to send, Content-Encoding or None).
+    """
+    for encoding, extension in ENCODINGS:
+        path = os.path.join(dist_folder, *(filename + extension).split('/'))
+        if accept_encodings[encoding] and os.path.isfile(path):
+            return filename + extension, encoding
+    return filename, None
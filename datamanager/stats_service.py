@@ -0,0 +1,98 @@
+"""
+stats_service.py
+
+This module reads the user and movie counts shown on the admin
+dashboard and the reports pages. The counts come from the denormalized
+counters maintained by datamanager/counters.py, so reading them does not
+scan the user or movie tables.
+"""
+
+from dataclasses import dataclass
+from sqlalchemy import select
+from models import db, User, Admin, Counter
+from datamanager.counters import MOVIES_TOTAL, USERS_TOTAL, get_total
+
+
+@dataclass(frozen=True)
+class AdminStats:
+    """User and movie counts for one admin, plus the global totals."""
+    num_users: int
+    num_movies: int
+    num_users_total: int
+    num_movies_total: int
+
+    def as_dict(self):
+        """Return the counts as a dictionary of template variables."""
+        return {
+            'num_users': self.num_users,
+            'num_movies': self.num_movies,
+            'num_users_total': self.num_users_total,
+            'num_movies_total': self.num_movies_total,
+        }
+
+
+@dataclass(frozen=True)
+class UserMovieCount:
+    """A user together with the number of movies they added."""
+    user: User
+    movies_count: int
+
+
+def get_admin_stats(admin_id=None):
+    """
+    Fetch the admin's user and movie counts and the global totals.
+
+    Parameters:
+    admin_id (int): The ID of the admin, or None to only fetch the totals.
+
+    Returns:
+    AdminStats: The counts.
+    """
+    totals = dict(db.session.execute(
+        select(Counter.name, Counter.value).where(Counter.name.in_([USERS_TOTAL, MOVIES_TOTAL]))
+    ).all())
+    num_users_total = totals.get(USERS_TOTAL)
+    num_movies_total = totals.get(MOVIES_TOTAL)
+    if num_users_total is None:
+        num_users_total = get_total(USERS_TOTAL)
+    if num_movies_total is None:
+        num_movies_total = get_total(MOVIES_TOTAL)
+
+    admin = db.session.get(Admin, admin_id) if admin_id is not None else None
+    return AdminStats(
+        num_users=admin.user_count if admin else 0,
+        num_movies=admin.movie_count if admin else 0,
+        num_users_total=num_users_total,
+        num_movies_total=num_movies_total,
+    )
+
+
+def user_movie_counts_query(admin_id):
+    """
+    Build a query of (User, movie count) rows for the users of an admin.
+    The count is read from the user's movie_count counter.
+
+    Parameters:
+    admin_id (int): The ID of the admin.
+
+    Returns:
+    Query: A query yielding (User, int) rows, ordered by user id.
+    """
+    return (
+        db.session.query(User, User.movie_count)
+        .filter(User.admin_id == admin_id)
+        .order_by(User.id)
+    )
+
+
+def to_user_movie_counts(rows):
+    """
+    Convert (User, movie count) rows into UserMovieCount objects.
+
+    Parameters:
+    rows (iterable): Rows produced by user_movie_counts_query().
+
+    Returns:
+    list[UserMovieCount]: One entry per user.
+    """
+    return [UserMovieCount(user=user, movies_count=count) for user, count in rows]
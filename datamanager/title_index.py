@@ -0,0 +1,228 @@
+"""
+title_index.py
+
+This module keeps an in-memory prefix index over the titles of the catalog
+films that are in at least one collection, for the title autocomplete of
+the add-movie forms. Only the catalog title (from OMDb) is indexed, never
+the title a user or admin gave their own copy, since the autocomplete is
+public.
+
+Every title is stored under the start of each of its words, in one sorted
+list searched with bisect, so "matr" finds "The Matrix" in microseconds.
+Titles matching from their first word rank first.
+
+The index is built on the first lookup and then kept current incrementally:
+session events collect the copies added, relinked and deleted by a flush
+and apply them once the transaction commits (a rollback discards them).
+A renamed catalog entry makes the next lookup rebuild the index. Writes
+made by other processes are picked up by a full rebuild every
+REBUILD_INTERVAL seconds.
+"""
+
+import threading
+import time
+from bisect import bisect_left, insort
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import Session
+from models import db, Movie, CatalogMovie
+
+REBUILD_INTERVAL = 300  # Seconds
+SCAN_LIMIT = 200  # Index entries looked at per lookup, bounds the lookup time
+_CHANGES_KEY = 'title_index_changes'
+
+
+def _title_key(title):
+    """Key used to compare titles: whitespace collapsed and case-folded."""
+    return ' '.join(title.split()).casefold()
+
+
+class TitlePrefixIndex:
+    """
+    Prefix index over (title, imdbID) pairs with reference counts, so a title
+    stays in the index while any copy of the film is still in a collection.
+
+    Attributes:
+        built_at (float): time.monotonic() of the last full build, or None.
+    """
+
+    def __init__(self):
+        self._entries = []  # Sorted (word-start key, word position, title, imdbID)
+        self._counts = {}  # (title, imdbID) -> number of copies
+        self._lock = threading.Lock()
+        self.built_at = None
+
+    @staticmethod
+    def _keys(title):
+        """Return the index keys of a title: the key from the start of each word."""
+        words = _title_key(title).split(' ')
+        return [(' '.join(words[position:]), position) for position in range(len(words))]
+
+    def _insert(self, title, imdb_id):
+        for key, position in self._keys(title):
+            insort(self._entries, (key, position, title, imdb_id or ''))
+
+    def _remove(self, title, imdb_id):
+        for key, position in self._keys(title):
+            entry = (key, position, title, imdb_id or '')
+            index = bisect_left(self._entries, entry)
+            if index < len(self._entries) and self._entries[index] == entry:
+                del self._entries[index]
+
+    def build(self, rows):
+        """
+        Replace the index contents.
+
+        Parameters:
+        rows (iterable): (title, imdbID, count) rows.
+
+        Returns:
+        None
+        """
+        counts = {(title, imdb_id or ''): count for title, imdb_id, count in rows if title}
+        entries = sorted(
+            (key, position, title, imdb_id)
+            for title, imdb_id in counts
+            for key, position in self._keys(title)
+        )
+        with self._lock:
+            self._entries = entries
+            self._counts = counts
+            self.built_at = time.monotonic()
+
+    def add(self, title, imdb_id):
+        """Count one more copy of the film with this title."""
+        if not title:
+            return
+        pair = (title, imdb_id or '')
+        with self._lock:
+            self._counts[pair] = self._counts.get(pair, 0) + 1
+            if self._counts[pair] == 1:
+                self._insert(*pair)
+
+    def remove(self, title, imdb_id):
+        """Count one copy of the film with this title less, dropping the title at zero."""
+        pair = (title, imdb_id or '')
+        with self._lock:
+            count = self._counts.get(pair, 0) - 1
+            if count > 0:
+                self._counts[pair] = count
+            elif pair in self._counts:
+                del self._counts[pair]
+                self._remove(*pair)
+
+    def search(self, prefix, limit=10):
+        """
+        Find titles with a word starting with the prefix.
+
+        Parameters:
+        prefix (str): The text typed so far, case-insensitive.
+        limit (int): The maximum number of suggestions.
+
+        Returns:
+        list[dict]: Suggestions with 'title' and 'imdbID' (None if unknown),
+        titles starting with the prefix first, then alphabetically.
+        """
+        prefix = _title_key(prefix or '')
+        if not prefix:
+            return []
+        matches = {}
+        with self._lock:
+            index = bisect_left(self._entries, (prefix,))
+            for key, position, title, imdb_id in self._entries[index:index + SCAN_LIMIT]:
+                if not key.startswith(prefix):
+                    break
+                pair = (title, imdb_id)
+                matches[pair] = min(position, matches.get(pair, position))
+        ranked = sorted(matches, key=lambda pair: (matches[pair] > 0, pair[0].casefold(), pair[1]))
+        return [{'title': title, 'imdbID': imdb_id or None} for title, imdb_id in ranked[:limit]]
+
+    def invalidate(self):
+        """Make the next lookup rebuild the index."""
+        self.built_at = None
+
+    def __len__(self):
+        with self._lock:
+            return len(self._counts)
+
+
+title_index = TitlePrefixIndex()
+
+
+def rebuild_title_index():
+    """Rebuild the index from the catalog entries that have copies, with one GROUP BY query."""
+    title_index.build(db.session.execute(
+        select(CatalogMovie.title, CatalogMovie.imdbID, func.count(Movie.id))
+        .join(Movie, Movie.catalog_movie_id == CatalogMovie.id)
+        .group_by(CatalogMovie.id, CatalogMovie.title, CatalogMovie.imdbID)
+    ).all())
+
+
+def suggest_titles(prefix, limit=10):
+    """
+    Autocomplete a title from the catalog films already in a collection.
+    Builds the index on first use and rebuilds it every REBUILD_INTERVAL seconds.
+
+    Parameters:
+    prefix (str): The text typed so far.
+    limit (int): The maximum number of suggestions.
+
+    Returns:
+    list[dict]: Suggestions with 'title' and 'imdbID', see TitlePrefixIndex.search().
+    """
+    if title_index.built_at is None or time.monotonic() - title_index.built_at > REBUILD_INTERVAL:
+        rebuild_title_index()
+    return title_index.search(prefix, limit)
+
+
+@event.listens_for(Movie.catalog_movie, 'set', active_history=True)
+def _load_replaced_catalog_movie(target, value, oldvalue, initiator):
+    """Load the old catalog entry of a relinked copy (active_history), so the index can drop it."""
+    return value
+
+
+def _catalog_title(session, catalog_movie_id):
+    """The (title, imdbID) of a catalog entry, or None for a copy without one."""
+    if catalog_movie_id is None:
+        return None
+    catalog_movie = session.get(CatalogMovie, catalog_movie_id)
+    return (catalog_movie.title, catalog_movie.imdbID) if catalog_movie else None
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_title_changes(session, flush_context):
+    """Remember the catalog titles added and removed by this flush until the commit."""
+    changes = session.info.setdefault(_CHANGES_KEY, [])
+    for obj in session.new:
+        if isinstance(obj, Movie) and obj.catalog_movie is not None:
+            changes.append((title_index.add, obj.catalog_movie.title, obj.catalog_movie.imdbID))
+    for obj in session.deleted:
+        if isinstance(obj, Movie):
+            pair = _catalog_title(session, obj.catalog_movie_id)
+            if pair:
+                changes.append((title_index.remove, *pair))
+    for obj in session.dirty:
+        if isinstance(obj, Movie):
+            history = inspect(obj).attrs.catalog_movie.history
+            if history.has_changes():
+                for old in history.deleted:
+                    if old is not None:
+                        changes.append((title_index.remove, old.title, old.imdbID))
+                if obj.catalog_movie is not None:
+                    changes.append((title_index.add, obj.catalog_movie.title, obj.catalog_movie.imdbID))
+        elif isinstance(obj, CatalogMovie):
+            state = inspect(obj)
+            if state.attrs.title.history.has_changes() or state.attrs.imdbID.history.has_changes():
+                changes.append((title_index.invalidate,))
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_title_changes(session):
+    """Apply the committed title changes to the index."""
+    for change, *args in session.info.pop(_CHANGES_KEY, []):
+        change(*args)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_title_changes(session):
+    """Forget the title changes of a rolled back transaction."""
+    session.info.pop(_CHANGES_KEY, None)
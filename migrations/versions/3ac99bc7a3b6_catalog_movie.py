@@ -0,0 +1,102 @@
+"""catalog movie
+
+Move the OMDb/TMDb metadata (poster, plot, trailer) of each film into a
+catalog_movie table keyed by imdbID, and link every movie copy to it.
+
+Revision ID: 3ac99bc7a3b6
+Revises: 4177780b76d0
+Create Date: 2026-10-18 06:20:11.402315
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3ac99bc7a3b6'
+down_revision = '4177780b76d0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('catalog_movie',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('imdbID', sa.String(length=255), nullable=False),
+    sa.Column('title', sa.String(length=100), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('rating', sa.Float(), nullable=False),
+    sa.Column('poster', sa.String(length=255), nullable=True),
+    sa.Column('plot', sa.Text(), nullable=True),
+    sa.Column('trailer', sa.String(length=255), nullable=True),
+    sa.Column('director_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['director_id'], ['director.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('imdbID')
+    )
+    op.create_table('catalog_movie_genre',
+    sa.Column('catalog_movie_id', sa.Integer(), nullable=False),
+    sa.Column('genre_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['catalog_movie_id'], ['catalog_movie.id'], ),
+    sa.ForeignKeyConstraint(['genre_id'], ['genre.id'], ),
+    sa.PrimaryKeyConstraint('catalog_movie_id', 'genre_id')
+    )
+    with op.batch_alter_table('movie', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('catalog_movie_id', sa.Integer(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_movie_catalog_movie_id'), ['catalog_movie_id'], unique=False)
+        batch_op.create_foreign_key('fk_movie_catalog_movie_id', 'catalog_movie', ['catalog_movie_id'], ['id'])
+
+    # Backfill: the earliest copy of each imdbID becomes the catalog entry
+    op.execute("""
+        INSERT INTO catalog_movie ("imdbID", title, year, rating, poster, plot, trailer, director_id)
+        SELECT "imdbID", title, year, rating, poster, plot, trailer, director_id
+        FROM movie
+        WHERE id IN (
+            SELECT min(id) FROM movie
+            WHERE "imdbID" IS NOT NULL AND "imdbID" != ''
+            GROUP BY "imdbID"
+        )
+    """)
+    op.execute("""
+        INSERT INTO catalog_movie_genre (catalog_movie_id, genre_id)
+        SELECT catalog_movie.id, movie_genre.genre_id
+        FROM catalog_movie
+        JOIN movie ON movie.id = (
+            SELECT min(id) FROM movie WHERE movie."imdbID" = catalog_movie."imdbID"
+        )
+        JOIN movie_genre ON movie_genre.movie_id = movie.id
+    """)
+    op.execute("""
+        UPDATE movie SET catalog_movie_id = (
+            SELECT catalog_movie.id FROM catalog_movie
+            WHERE catalog_movie."imdbID" = movie."imdbID"
+        )
+    """)
+
+    with op.batch_alter_table('movie', schema=None) as batch_op:
+        batch_op.drop_column('trailer')
+        batch_op.drop_column('plot')
+        batch_op.drop_column('poster')
+
+
+def downgrade():
+    with op.batch_alter_table('movie', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('poster', sa.String(length=255), nullable=True))
+        batch_op.add_column(sa.Column('plot', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('trailer', sa.String(length=255), nullable=True))
+
+    # Copy the catalog metadata back onto every linked copy
+    op.execute("""
+        UPDATE movie SET
+            poster = (SELECT poster FROM catalog_movie WHERE catalog_movie.id = movie.catalog_movie_id),
+            plot = (SELECT plot FROM catalog_movie WHERE catalog_movie.id = movie.catalog_movie_id),
+            trailer = (SELECT trailer FROM catalog_movie WHERE catalog_movie.id = movie.catalog_movie_id)
+    """)
+
+    with op.batch_alter_table('movie', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_movie_catalog_movie_id', type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_movie_catalog_movie_id'))
+        batch_op.drop_column('catalog_movie_id')
+
+    op.drop_table('catalog_movie_genre')
+    op.drop_table('catalog_movie')
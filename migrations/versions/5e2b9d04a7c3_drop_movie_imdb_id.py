@@ -0,0 +1,37 @@
+"""drop movie imdbID
+
+A copy's imdbID is the imdbID of the catalog entry it links to; drop the
+duplicate column from movie. Downgrading copies it back from catalog_movie.
+
+Revision ID: 5e2b9d04a7c3
+Revises: 86db211b586f
+Create Date: 2026-10-18 14:05:12.318644
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e2b9d04a7c3'
+down_revision = '86db211b586f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('movie', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_movie_imdbID'))
+        batch_op.drop_column('imdbID')
+
+
+def downgrade():
+    with op.batch_alter_table('movie', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('imdbID', sa.String(length=255), nullable=True))
+        batch_op.create_index(batch_op.f('ix_movie_imdbID'), ['imdbID'], unique=False)
+
+    op.execute("""
+        UPDATE movie SET "imdbID" = (
+            SELECT "imdbID" FROM catalog_movie WHERE catalog_movie.id = movie.catalog_movie_id
+        )
+    """)
@@ -0,0 +1,45 @@
+"""enrichment jobs
+
+Add the enrichment_job queue table used to fill in trailers, posters and
+plots in the background after a movie is added.
+
+Revision ID: 7f07cd8c1e50
+Revises: b3def1b722ad
+Create Date: 2026-10-18 08:40:39.855906
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7f07cd8c1e50'
+down_revision = 'b3def1b722ad'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('enrichment_job',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('catalog_movie_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('run_after', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['catalog_movie_id'], ['catalog_movie.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('enrichment_job', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_enrichment_job_catalog_movie_id'), ['catalog_movie_id'], unique=False)
+        batch_op.create_index('ix_enrichment_job_status_run_after', ['status', 'run_after'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('enrichment_job', schema=None) as batch_op:
+        batch_op.drop_index('ix_enrichment_job_status_run_after')
+        batch_op.drop_index(batch_op.f('ix_enrichment_job_catalog_movie_id'))
+
+    op.drop_table('enrichment_job')
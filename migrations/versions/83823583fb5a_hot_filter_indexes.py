@@ -0,0 +1,58 @@
+"""hot filter indexes
+
+Index the columns the controllers filter on and make a favorite unique per
+user and movie. Duplicate favorites are removed before the constraint is added.
+
+Revision ID: 83823583fb5a
+Revises: 876642281c77
+Create Date: 2026-10-18 07:31:03.209025
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '83823583fb5a'
+down_revision = '876642281c77'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keep the earliest favorite of each (user, movie) pair
+    op.execute("""
+        DELETE FROM favorite WHERE id NOT IN (
+            SELECT min(id) FROM favorite GROUP BY user_id, movie_id
+        )
+    """)
+    op.execute("""
+        UPDATE "user" SET
+            favorite_count = (SELECT count(*) FROM favorite WHERE favorite.user_id = "user".id)
+    """)
+
+    with op.batch_alter_table('favorite', schema=None) as batch_op:
+        batch_op.create_index('ix_favorite_movie_id', ['movie_id'], unique=False)
+        batch_op.create_unique_constraint('uq_favorite_user_id_movie_id', ['user_id', 'movie_id'])
+
+    with op.batch_alter_table('movie', schema=None) as batch_op:
+        batch_op.create_index('ix_movie_admin_id_title', ['admin_id', 'title'], unique=False)
+        batch_op.create_index(batch_op.f('ix_movie_imdbID'), ['imdbID'], unique=False)
+        batch_op.create_index('ix_movie_user_id_title', ['user_id', 'title'], unique=False)
+
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_user_admin_id'), ['admin_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_user_admin_id'))
+
+    with op.batch_alter_table('movie', schema=None) as batch_op:
+        batch_op.drop_index('ix_movie_user_id_title')
+        batch_op.drop_index(batch_op.f('ix_movie_imdbID'))
+        batch_op.drop_index('ix_movie_admin_id_title')
+
+    with op.batch_alter_table('favorite', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_favorite_user_id_movie_id', type_='unique')
+        batch_op.drop_index('ix_favorite_movie_id')
@@ -0,0 +1,39 @@
+"""catalog facet indexes
+
+Index the catalog columns the movies page filters and counts facets on:
+director, year and rating, and the films of each genre.
+
+Revision ID: 86db211b586f
+Revises: c41e9a7d2f58
+Create Date: 2026-10-18 10:48:21.537204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '86db211b586f'
+down_revision = 'c41e9a7d2f58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('catalog_movie', schema=None) as batch_op:
+        batch_op.create_index('ix_catalog_movie_director_id', ['director_id'], unique=False)
+        batch_op.create_index('ix_catalog_movie_rating', ['rating'], unique=False)
+        batch_op.create_index('ix_catalog_movie_year', ['year'], unique=False)
+
+    with op.batch_alter_table('catalog_movie_genre', schema=None) as batch_op:
+        batch_op.create_index('ix_catalog_movie_genre_genre_id', ['genre_id', 'catalog_movie_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('catalog_movie_genre', schema=None) as batch_op:
+        batch_op.drop_index('ix_catalog_movie_genre_genre_id')
+
+    with op.batch_alter_table('catalog_movie', schema=None) as batch_op:
+        batch_op.drop_index('ix_catalog_movie_year')
+        batch_op.drop_index('ix_catalog_movie_rating')
+        batch_op.drop_index('ix_catalog_movie_director_id')
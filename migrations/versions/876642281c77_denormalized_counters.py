@@ -0,0 +1,62 @@
+"""denormalized counters
+
+Add movie/favorite counters to user, user/movie counters to admin and a
+counter table for the site-wide totals, backfilled from the current rows.
+
+Revision ID: 876642281c77
+Revises: 3ac99bc7a3b6
+Create Date: 2026-10-18 07:02:37.518204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '876642281c77'
+down_revision = '3ac99bc7a3b6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('counter',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('value', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    with op.batch_alter_table('admin', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('user_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('movie_count', sa.Integer(), server_default='0', nullable=False))
+
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('movie_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('favorite_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill the counters from the current rows
+    op.execute("""
+        UPDATE "user" SET
+            movie_count = (SELECT count(*) FROM movie WHERE movie.user_id = "user".id),
+            favorite_count = (SELECT count(*) FROM favorite WHERE favorite.user_id = "user".id)
+    """)
+    op.execute("""
+        UPDATE admin SET
+            user_count = (SELECT count(*) FROM "user" WHERE "user".admin_id = admin.id),
+            movie_count = (SELECT count(*) FROM movie WHERE movie.admin_id = admin.id)
+    """)
+    op.execute("INSERT INTO counter (name, value) SELECT 'movies_total', count(*) FROM movie")
+    op.execute("""
+        INSERT INTO counter (name, value) SELECT 'users_total', count(*) FROM "user"
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_column('favorite_count')
+        batch_op.drop_column('movie_count')
+
+    with op.batch_alter_table('admin', schema=None) as batch_op:
+        batch_op.drop_column('movie_count')
+        batch_op.drop_column('user_count')
+
+    op.drop_table('counter')
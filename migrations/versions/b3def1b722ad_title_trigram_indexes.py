@@ -0,0 +1,39 @@
+"""title trigram indexes
+
+On PostgreSQL, add pg_trgm GIN indexes on the movie and catalog titles so
+substring (ILIKE '%...%') title searches use an index. Other databases
+have no trigram support; this revision does nothing there.
+
+Revision ID: b3def1b722ad
+Revises: 83823583fb5a
+Create Date: 2026-10-18 08:04:52.611093
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3def1b722ad'
+down_revision = '83823583fb5a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index('ix_catalog_movie_title_trgm', 'catalog_movie', ['title'],
+                    postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'})
+    op.create_index('ix_movie_title_trgm', 'movie', ['title'],
+                    postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'})
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.drop_index('ix_movie_title_trgm', table_name='movie')
+    op.drop_index('ix_catalog_movie_title_trgm', table_name='catalog_movie')
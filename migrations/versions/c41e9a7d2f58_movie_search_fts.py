@@ -0,0 +1,50 @@
+"""movie search fts
+
+On SQLite, add the movie_search FTS5 table mirroring the title, plot,
+director and genre names of every movie (rowid = movie.id), and fill it.
+datamanager/movie_search.py keeps it in sync. Other databases search with
+ILIKE instead; this revision does nothing there.
+
+Revision ID: c41e9a7d2f58
+Revises: 7f07cd8c1e50
+Create Date: 2026-10-18 10:12:37.402118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c41e9a7d2f58'
+down_revision = '7f07cd8c1e50'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    op.execute(
+        "CREATE VIRTUAL TABLE movie_search USING fts5("
+        "title, plot, director, genres, tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    )
+    # ORDER BY rank uses bm25 weighted towards title, then director and genre hits
+    op.execute("INSERT INTO movie_search (movie_search, rank) VALUES ('rank', 'bm25(10.0, 1.0, 5.0, 3.0)')")
+    op.execute("""
+        INSERT INTO movie_search (rowid, title, plot, director, genres)
+        SELECT movie.id, movie.title, coalesce(catalog_movie.plot, ''), coalesce(director.name, ''),
+               coalesce((SELECT group_concat(genre.name, ' ') FROM movie_genre
+                         JOIN genre ON genre.id = movie_genre.genre_id
+                         WHERE movie_genre.movie_id = movie.id), '')
+        FROM movie
+        LEFT JOIN catalog_movie ON catalog_movie.id = movie.catalog_movie_id
+        LEFT JOIN director ON director.id = movie.director_id
+    """)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    op.execute('DROP TABLE movie_search')
@@ -10,6 +10,15 @@ movie_genre = db.Table('movie_genre',
                        db.Column('genre_id', db.Integer, db.ForeignKey('genre.id'), primary_key=True)
                        )
 
+# Association table for many-to-many relationship between CatalogMovie and Genre
+catalog_movie_genre = db.Table('catalog_movie_genre',
+                               db.Column('catalog_movie_id', db.Integer, db.ForeignKey('catalog_movie.id'),
+                                         primary_key=True),
+                               db.Column('genre_id', db.Integer, db.ForeignKey('genre.id'), primary_key=True),
+                               # Genre filters and facet counts look films up by genre
+                               db.Index('ix_catalog_movie_genre_genre_id', 'genre_id', 'catalog_movie_id')
+                               )
+
 
 class User(db.Model):
     __tablename__ = 'user'
@@ -23,7 +32,10 @@ class User(db.Model):
     join_date = db.Column(db.DateTime, default=db.func.current_timestamp())
     movies = db.relationship('Movie', backref='user', lazy=True)
     favorites = db.relationship('Favorite', back_populates='user', lazy=True)
-    admin_id = db.Column(db.Integer, db.ForeignKey('admin.id'), nullable=True)
+    admin_id = db.Column(db.Integer, db.ForeignKey('admin.id'), nullable=True, index=True)
+    # Denormalized counters, maintained on write by datamanager/counters.py
+    movie_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    favorite_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
 
     def set_password(self, password):
         """
@@ -61,21 +73,89 @@ class Director(db.Model):
     movies = db.relationship('Movie', backref='director', lazy=True)
 
 
-class Movie(db.Model):
-    __tablename__ = 'movie'
+class CatalogMovie(db.Model):
+    """
+    One row per film (keyed by imdbID) holding the metadata fetched from OMDb/TMDb.
+    Every user or admin copy of the film links to this row instead of
+    storing its own poster, plot and trailer. Title, year, rating, director and
+    genres are set from the fetched data when the entry is created; the public
+    catalog and its facets read only these, and editing a copy never changes them.
+    """
+    __tablename__ = 'catalog_movie'
     id = db.Column(db.Integer, primary_key=True)
+    imdbID = db.Column(db.String(255), unique=True, nullable=False)
     title = db.Column(db.String(100), nullable=False)
     year = db.Column(db.Integer, nullable=False)
     rating = db.Column(db.Float, nullable=False)
     poster = db.Column(db.String(255))  # Optional field to store movie posters
     plot = db.Column(db.Text)  # Optional field to store the plot
-    imdbID = db.Column(db.String(255), nullable=True)  # IMDb ID or link
-    trailer = db.Column(db.String(255), nullable=True)  # New field to store YouTube trailer URL
+    trailer = db.Column(db.String(255), nullable=True)  # YouTube trailer URL
+    director_id = db.Column(db.Integer, db.ForeignKey('director.id'), nullable=False)
+
+    # Relationships
+    director = db.relationship('Director')
+    genres = db.relationship('Genre', secondary=catalog_movie_genre)
+    copies = db.relationship('Movie', back_populates='catalog_movie', lazy=True)
+
+    # Faceted filters on the movies page: director, year range and minimum rating
+    __table_args__ = (
+        db.Index('ix_catalog_movie_director_id', 'director_id'),
+        db.Index('ix_catalog_movie_year', 'year'),
+        db.Index('ix_catalog_movie_rating', 'rating'),
+    )
+
+
+class Movie(db.Model):
+    """
+    A user's or admin's copy of a film.
+
+    Per copy, on purpose: title, year, rating, director and genres (movie_genre)
+    start as the film's fetched metadata and are then the owner's to edit. The
+    owner's lists, search and reports show them, and the title orders the lists
+    and detects duplicates. They are never copied back to CatalogMovie (whose
+    genres live in catalog_movie_genre), so an edit stays on its copy.
+
+    Shared: imdbID, poster, plot and trailer are read from CatalogMovie.
+    """
+    __tablename__ = 'movie'
+    id = db.Column(db.Integer, primary_key=True)
+    title = db.Column(db.String(100), nullable=False)
+    year = db.Column(db.Integer, nullable=False)
+    rating = db.Column(db.Float, nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
     admin_id = db.Column(db.Integer, db.ForeignKey('admin.id'))
     director_id = db.Column(db.Integer, db.ForeignKey('director.id'), nullable=False)  # Foreign key to Director
+    catalog_movie_id = db.Column(db.Integer, db.ForeignKey('catalog_movie.id'), nullable=True, index=True)
     genres = db.relationship('Genre', secondary=movie_genre, backref='movies')
     favorites = db.relationship('Favorite', back_populates='movie', lazy=True)  # Add this line
+    catalog_movie = db.relationship('CatalogMovie', back_populates='copies')
+
+    # Lists filter by owner and duplicate checks by owner and title;
+    # the leading owner column also serves the owner-only filters.
+    __table_args__ = (
+        db.Index('ix_movie_user_id_title', 'user_id', 'title'),
+        db.Index('ix_movie_admin_id_title', 'admin_id', 'title'),
+    )
+
+    @property
+    def imdbID(self):
+        """Return the imdbID of the linked catalog entry, if any."""
+        return self.catalog_movie.imdbID if self.catalog_movie else None
+
+    @property
+    def poster(self):
+        """Return the poster URL of the linked catalog entry, if any."""
+        return self.catalog_movie.poster if self.catalog_movie else None
+
+    @property
+    def plot(self):
+        """Return the plot of the linked catalog entry, if any."""
+        return self.catalog_movie.plot if self.catalog_movie else None
+
+    @property
+    def trailer(self):
+        """Return the trailer URL of the linked catalog entry, if any."""
+        return self.catalog_movie.trailer if self.catalog_movie else None
 
 
 class Genre(db.Model):
@@ -94,6 +174,12 @@ class Favorite(db.Model):
     movie = db.relationship('Movie', back_populates='favorites')
     # movie = db.relationship('Movie', backref='favorites', lazy=True)
 
+    # A movie can be favorited once per user; movie_id is indexed for deletes by movie
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'movie_id', name='uq_favorite_user_id_movie_id'),
+        db.Index('ix_favorite_movie_id', 'movie_id'),
+    )
+
 
 class Admin(db.Model):
     __tablename__ = 'admin'
@@ -101,6 +187,9 @@ class Admin(db.Model):
     name = db.Column(db.String(100), nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
     password = db.Column(db.String(200), nullable=False)
+    # Denormalized counters, maintained on write by datamanager/counters.py
+    user_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    movie_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
 
     def set_password(self, password):
         """
@@ -134,3 +223,34 @@ class Contact(db.Model):
     email = db.Column(db.String(100), nullable=False)
     message = db.Column(db.Text, nullable=False)
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+
+
+class Counter(db.Model):
+    """Site-wide denormalized counters (e.g. total users and movies), maintained on write."""
+    __tablename__ = 'counter'
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+
+
+class EnrichmentJob(db.Model):
+    """
+    A queued background job that fills in the trailer, checks the poster and
+    fetches the full plot of a catalog entry after the movie has been saved.
+    Processed by datamanager/enrichment_jobs.py.
+    """
+    __tablename__ = 'enrichment_job'
+    id = db.Column(db.Integer, primary_key=True)
+    catalog_movie_id = db.Column(db.Integer, db.ForeignKey('catalog_movie.id'), nullable=False, index=True)
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending, running, done, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text, nullable=True)
+    run_after = db.Column(db.DateTime, nullable=False, default=datetime.now)  # Retry backoff
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.now)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.now, onupdate=datetime.now)
+
+    catalog_movie = db.relationship('CatalogMovie')
+
+    # Workers pick the oldest due pending job
+    __table_args__ = (
+        db.Index('ix_enrichment_job_status_run_after', 'status', 'run_after'),
+    )
@@ -1,235 +1,152 @@
 document.addEventListener('DOMContentLoaded', () => {
 
-     // Handle pagination for Reports
-    const paginationContainerReports = document.querySelector('#pagination-container-reports');
-    if (paginationContainerReports) {
-        paginationContainerReports.addEventListener('click', async (event) => {
-            if (event.target.classList.contains('page-link')) {
-                event.preventDefault();
-                const href = event.target.getAttribute('href');
-                const response = await fetch(href);
-                if (response.ok) {
-                    const data = await response.text();
-                    document.querySelector('#main').innerHTML = data;
-                } else {
-                    console.error('Failed to load page');
-                }
-            }
-        });
-    }
-    // Handle pagination for dashboard
-    const paginationContainerDashboard = document.querySelector('#pagination-container-dashboard');
-    if (paginationContainerDashboard) {
-        paginationContainerDashboard.addEventListener('click', async (event) => {
-            if (event.target.classList.contains('page-link')) {
-                event.preventDefault();
-                const href = event.target.getAttribute('href');
-                const response = await fetch(href);
-                if (response.ok) {
-                    const data = await response.text();
-                    document.querySelector('#main').innerHTML = data;
-                } else {
-                    console.error('Failed to load page');
-                }
-            }
-        });
-    }
-// Handle pagination for dashboard -all-users-movies
-    const paginationContainerDashboardAllUsersMovies = document.querySelector('#pagination-container-dashboard-all-users-movies');
-    if (paginationContainerDashboardAllUsersMovies) {
-        paginationContainerDashboardAllUsersMovies.addEventListener('click', async (event) => {
-            if (event.target.classList.contains('page-link')) {
-                event.preventDefault();
-                const href = event.target.getAttribute('href');
-                const response = await fetch(href);
-                if (response.ok) {
-                    const data = await response.text();
-                    document.querySelector('#main').innerHTML = data;
-                } else {
-                    console.error('Failed to load page');
-                }
-            }
-        });
-    }
-    // Handle pagination for users
-    const userPaginationContainer = document.querySelector('#pagination-container-users');
-    if (userPaginationContainer) {
-        userPaginationContainer.addEventListener('click', async (event) => {
-            if (event.target.classList.contains('page-link')) {
-                event.preventDefault();
-                const href = event.target.getAttribute('href');
-                const response = await fetch(href);
-                if (response.ok) {
-                    const data = await response.text();
-                    document.querySelector('#main').innerHTML = data;
-                } else {
-                    console.error('Failed to load page');
-                }
-            }
-        });
+    // Some pages include this script twice; register the handlers once
+    if (window.paginationReady) {
+        return;
     }
+    window.paginationReady = true;
 
-      // Handle pagination for movies
-    const moviePaginationContainer = document.querySelector('#pagination-container-movies');
-    if (moviePaginationContainer) {
-        moviePaginationContainer.addEventListener('click', async (event) => {
-            if (event.target.classList.contains('page-link')) {
-                event.preventDefault();
-                const href = event.target.getAttribute('href');
-                const response = await fetch(href);
-                if (response.ok) {
-                    const data = await response.text();
-                    document.querySelector('#main').innerHTML = data;
-                } else {
-                    console.error('Failed to load page');
-                }
-            }
-        });
+    // Lists are paginated with cursors (?after= / ?before=, see datamanager/keyset.py),
+    // so the Previous/Next links already point at the right page.
+    // Containers with a data-api attribute load the page from the JSON API (blueprints/api.py)
+    // and fill in the rows of their table's <template class="row-template">; others load the
+    // HTML page and swap #main.
+    const main = document.querySelector('#main');
+    if (!main) {
+        return;
     }
 
-    // Handle pagination for my movies (users)
-    const paginationContainerMymovies = document.querySelector('#pagination-container-my-movies');
-    if (paginationContainerMymovies) {
-        paginationContainerMymovies.addEventListener('click', async (event) => {
-            if (event.target.classList.contains('page-link')) {
-                event.preventDefault();
-                const href = event.target.getAttribute('href');
-                const response = await fetch(href);
-                if (response.ok) {
-                    const data = await response.text();
-                    document.querySelector('#main').innerHTML = data;
-                } else {
-                    console.error('Failed to load page');
-                }
-            }
-        });
-    }
+    const loadPage = async (href, push) => {
+        // Revalidate the browser's copy: unchanged pages come back as 304 Not Modified
+        // (see conditional_get in controllers/common_fun.py) and are served from its cache
+        const response = await fetch(href, {cache: 'no-cache'});
+        if (!response.ok) {
+            console.error('Failed to load page');
+            return;
+        }
+        const data = await response.text();
+        // Full pages are trimmed down to their #main; partials are used as they are
+        const page = new DOMParser().parseFromString(data, 'text/html');
+        const newMain = page.querySelector('#main');
+        main.innerHTML = newMain ? newMain.innerHTML : data;
+        if (push) {
+            history.pushState({pagination: true}, '', href);
+        }
+    };
 
-    // Handle pagination for user favorites movies
-    const paginationContainerUserFavoritesMovies = document.querySelector('#pagination-container-user-favorites');
-    if (paginationContainerUserFavoritesMovies) {
-        paginationContainerUserFavoritesMovies.addEventListener('click', async (event) => {
-            if (event.target.classList.contains('page-link')) {
-                event.preventDefault();
-                const href = event.target.getAttribute('href');
-                const response = await fetch(href);
-                if (response.ok) {
-                    const data = await response.text();
-                    document.querySelector('#main').innerHTML = data;
-                } else {
-                    console.error('Failed to load page');
-                }
+    // Fill in a row template: data-field cells get the item's value ('#' is the row number),
+    // data-href and data-action attributes get their {field} placeholders replaced
+    const renderRow = (template, item, number) => {
+        const row = template.content.firstElementChild.cloneNode(true);
+        row.querySelectorAll('[data-field]').forEach((cell) => {
+            const field = cell.dataset.field;
+            let value = field === '#' ? number : item[field];
+            if (Array.isArray(value)) {
+                value = value.join(', ');
             }
+            cell.textContent = value === null || value === undefined ? (cell.dataset.empty || '') : value;
         });
-    }
+        const fill = (url) => url.replace(/\{(\w+)\}/g, (match, field) => encodeURIComponent(item[field]));
+        row.querySelectorAll('[data-href]').forEach((link) => link.setAttribute('href', fill(link.dataset.href)));
+        row.querySelectorAll('[data-action]').forEach((form) => form.setAttribute('action', fill(form.dataset.action)));
+        return row;
+    };
 
-    // Handle pagination for movie web app movies list
-    const paginationContainerWebAppMovies = document.querySelector('#pagination-container-movies-web-app');
-    if (paginationContainerWebAppMovies) {
-        paginationContainerWebAppMovies.addEventListener('click', async (event) => {
-            if (event.target.classList.contains('page-link')) {
-                event.preventDefault();
-                const href = event.target.getAttribute('href');
-                const response = await fetch(href);
-                if (response.ok) {
-                    const data = await response.text();
-                    document.querySelector('#main').innerHTML = data;
-                } else {
-                    console.error('Failed to load page');
-                }
+    // Point the First/Previous/Next links at the HTML page of the new cursors,
+    // like partials/cursor_pagination.html does
+    const updateLinks = (container, pageUrl, data) => {
+        const linkTo = (cursorName, cursor) => {
+            const url = new URL(pageUrl);
+            url.searchParams.delete('after');
+            url.searchParams.delete('before');
+            if (cursorName) {
+                url.searchParams.set(cursorName, cursor);
             }
-        });
-    }
+            return url.pathname + url.search;
+        };
+        const item = (label, href, state) => {
+            const li = document.createElement('li');
+            li.className = state ? 'page-item ' + state : 'page-item';
+            const a = document.createElement('a');
+            a.className = 'page-link';
+            a.href = href;
+            a.textContent = label;
+            li.appendChild(a);
+            return li;
+        };
+        const previous = data.prev
+            ? [item('First', linkTo(null)), item('Previous', linkTo('before', data.prev))]
+            : [item('Previous', '#', 'disabled')];
+        const next = data.next ? item('Next', linkTo('after', data.next)) : item('Next', '#', 'disabled');
+        container.querySelector('.pagination').replaceChildren(...previous, item(String(data.page), '#', 'active'), next);
+    };
 
-     // Handle pagination for movies-details-added-by-user-of-current-admin
-    const paginationContainerMoviesAddedByUserOfCurrentAdmin = document.querySelector('#pagination-container-all-movies-added-by-user-of-current-admin-report');
-    if (paginationContainerMoviesAddedByUserOfCurrentAdmin) {
-        paginationContainerMoviesAddedByUserOfCurrentAdmin.addEventListener('click', async (event) => {
-            if (event.target.classList.contains('page-link')) {
-                event.preventDefault();
-                const href = event.target.getAttribute('href');
-                const response = await fetch(href);
-                if (response.ok) {
-                    const data = await response.text();
-                    document.querySelector('#main').innerHTML = data;
-                } else {
-                    console.error('Failed to load page');
-                }
+    const loadRows = async (container, href, push) => {
+        const pageUrl = new URL(href, location.href);
+        const apiUrl = new URL(container.dataset.api, location.href);
+        ['after', 'before'].forEach((name) => {
+            if (pageUrl.searchParams.has(name)) {
+                apiUrl.searchParams.set(name, pageUrl.searchParams.get(name));
             }
         });
-    }
+        apiUrl.searchParams.set('fields', container.dataset.fields);
 
-     // Handle pagination for movies-added-by-user-of-current-admin
-    const paginationContainerMoviesAddedByAllUser = document.querySelector('#pagination-container-all-movies-added-by-all-user-of-report');
-    if (paginationContainerMoviesAddedByAllUser) {
-        paginationContainerMoviesAddedByAllUser.addEventListener('click', async (event) => {
-            if (event.target.classList.contains('page-link')) {
-                event.preventDefault();
-                const href = event.target.getAttribute('href');
-                const response = await fetch(href);
-                if (response.ok) {
-                    const data = await response.text();
-                    document.querySelector('#main').innerHTML = data;
-                } else {
-                    console.error('Failed to load page');
-                }
-            }
-        });
-    }
+        const response = await fetch(apiUrl, {cache: 'no-cache', headers: {Accept: 'application/json'}});
+        if (!response.ok) {
+            // E.g. an expired session: the HTML page redirects to the login page
+            loadPage(href, push);
+            return;
+        }
+        const data = await response.json();
 
-    // Handle pagination for movies-details-added-by-user-of-current-admin
-    const paginationContainerMoviesDetailsAddedByUserOfCurrentAdmin = document.querySelector('#pagination-container-movies-details-added-by-user-of-current-admin');
-    if (paginationContainerMoviesDetailsAddedByUserOfCurrentAdmin) {
-        paginationContainerMoviesDetailsAddedByUserOfCurrentAdmin.addEventListener('click', async (event) => {
-            if (event.target.classList.contains('page-link')) {
-                event.preventDefault();
-                const href = event.target.getAttribute('href');
-                const response = await fetch(href);
-                if (response.ok) {
-                    const data = await response.text();
-                    document.querySelector('#main').innerHTML = data;
-                } else {
-                    console.error('Failed to load page');
-                }
-            }
-        });
-    }
+        const table = document.querySelector(container.dataset.table);
+        const body = table.tBodies[0];
+        body.querySelectorAll(':scope > tr').forEach((row) => row.remove());
+        const template = body.querySelector('template.row-template');
+        data.items.forEach((item, index) => body.appendChild(renderRow(template, item, data.start + index + 1)));
+        const emptyTemplate = body.querySelector('template.empty-row-template');
+        if (!data.items.length && emptyTemplate) {
+            body.appendChild(emptyTemplate.content.firstElementChild.cloneNode(true));
+        }
 
-     // Handle pagination for -manage-all-movies
-    const paginationContainerManageAllMovies = document.querySelector('#pagination-container-manage-all-movies');
-    if (paginationContainerManageAllMovies) {
-        paginationContainerManageAllMovies.addEventListener('click', async (event) => {
-            if (event.target.classList.contains('page-link')) {
-                event.preventDefault();
-                const href = event.target.getAttribute('href');
-                const response = await fetch(href);
-                if (response.ok) {
-                    const data = await response.text();
-                    document.querySelector('#main').innerHTML = data;
-                } else {
-                    console.error('Failed to load page');
-                }
-            }
-        });
-    }
+        const pageCount = table.parentElement.querySelector('.page-count');
+        if (pageCount) {
+            pageCount.textContent = 'Page ' + data.page + (data.pages ? ' of ' + data.pages : '');
+        }
+        updateLinks(container, pageUrl, data);
+        if (push) {
+            history.pushState({pagination: true}, '', href);
+        }
+    };
 
-    // Handle pagination for -manage-all-users
-    const paginationContainerManageAllUsers = document.querySelector('#pagination-container-manage-all-users');
-    if (paginationContainerManageAllUsers) {
-        paginationContainerManageAllUsers.addEventListener('click', async (event) => {
-            if (event.target.classList.contains('page-link')) {
-                event.preventDefault();
-                const href = event.target.getAttribute('href');
-                const response = await fetch(href);
-                if (response.ok) {
-                    const data = await response.text();
-                    document.querySelector('#main').innerHTML = data;
-                } else {
-                    console.error('Failed to load page');
-                }
-            }
-        });
-    }
+    // One delegated handler covers every pagination container, including the ones
+    // inserted by a previous page load
+    main.addEventListener('click', (event) => {
+        const link = event.target.closest('.page-link');
+        const container = link && link.closest('[id^="pagination-container"]');
+        if (!container) {
+            return;
+        }
+        event.preventDefault();
+        const href = link.getAttribute('href');
+        if (!href || href === '#' || link.closest('.disabled')) {
+            return;
+        }
+        if (container.dataset.api) {
+            loadRows(container, href, true);
+        } else {
+            loadPage(href, true);
+        }
+    });
 
-});
+    // Back and forward buttons reload the page the cursor in the URL points at
+    window.addEventListener('popstate', () => {
+        const container = main.querySelector('[id^="pagination-container"][data-api]');
+        if (container) {
+            loadRows(container, location.href, false);
+        } else {
+            loadPage(location.href, false);
+        }
+    });
 
+});
@@ -0,0 +1,43 @@
+// title_autocomplete.js
+
+// Suggests titles of movies already in the database while a title is typed.
+// Picking a suggestion fills the hidden imdb_id field, so the movie is copied
+// from the catalog instead of being looked up in the OMDb API.
+document.addEventListener('DOMContentLoaded', function () {
+    const input = document.querySelector('input[data-autocomplete-url]');
+    if (!input) {
+        return;
+    }
+    const datalist = document.getElementById(input.getAttribute('list'));
+    const imdbField = document.getElementById('imdb_id');
+    let suggestions = {};  // title -> imdbID
+    let timer = null;
+
+    function showSuggestions(items) {
+        suggestions = {};
+        datalist.innerHTML = '';
+        items.forEach(function (item) {
+            suggestions[item.title] = item.imdbID;
+            const option = document.createElement('option');
+            option.value = item.title;
+            datalist.appendChild(option);
+        });
+    }
+
+    input.addEventListener('input', function () {
+        // Keep the imdbID only while the title matches a suggestion exactly
+        imdbField.value = suggestions[input.value] || '';
+        clearTimeout(timer);
+        const prefix = input.value.trim();
+        if (prefix.length < 2) {
+            showSuggestions([]);
+            return;
+        }
+        timer = setTimeout(function () {
+            fetch(input.dataset.autocompleteUrl + '?q=' + encodeURIComponent(prefix))
+                .then(function (response) { return response.json(); })
+                .then(showSuggestions)
+                .catch(function () { showSuggestions([]); });
+        }, 150);  // Wait for a pause in typing
+    });
+});
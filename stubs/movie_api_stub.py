@@ -0,0 +1,271 @@
+"""
+movie_api_stub.py
+
+A local stand-in for the OMDb and TMDb APIs, serving a fixture corpus, for
+offline development and reproducible benchmarks of the add-movie and import
+paths. It implements the endpoints blueprints/utils.py calls:
+
+- GET /?t=<title> and GET /?i=<imdbID> (with plot=full) like OMDb;
+- GET /3/movie/<imdbID>/videos like TMDb;
+- GET and HEAD /posters/<imdbID>.jpg for the poster checks.
+
+Latency (with jitter) and errors (a share of requests answered with e.g.
+503 or 429) can be injected. With --synthesize, unknown titles get a
+deterministic made-up movie instead of "Movie not found!", so any title
+list can be imported.
+
+Usage:
+    python -m stubs.movie_api_stub [--port 5001] [--latency 50] [--jitter 10]
+                                   [--error-rate 0.05] [--error-status 503] [--synthesize]
+
+and start the app with MOVIE_API_STUB_URL=http://127.0.0.1:5001.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'movies.json')
+VIDEOS_PATH = re.compile(r'^/3/movie/([^/]+)/videos$')
+POSTER_PATH = re.compile(r'^/posters/([^/]+)\.jpg$')
+# Served for every known poster
+POSTER_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           'static', 'images', 'default_movie_poster.jpg')
+
+
+def _title_key(title):
+    """Key used to look up titles: whitespace collapsed and case-folded."""
+    return ' '.join(title.split()).casefold()
+
+
+def load_fixtures(path=DEFAULT_FIXTURES):
+    """
+    Load the fixture corpus.
+
+    Each fixture is an OMDb response for one movie, with two extra fields:
+    FullPlot (returned for plot=full) and Videos (the TMDb video results).
+
+    Parameters:
+    path (str): The JSON file holding a list of fixtures.
+
+    Returns:
+    dict: The fixtures keyed by imdbID.
+    """
+    with open(path, encoding='utf-8') as f:
+        return {movie['imdbID']: movie for movie in json.load(f)}
+
+
+def synthesize_movie(title):
+    """
+    Make up a movie for a title that is not in the corpus.
+    The same title always gives the same movie.
+
+    Parameters:
+    title (str): The title that was looked up.
+
+    Returns:
+    dict: A fixture like the ones in the corpus.
+    """
+    digest = hashlib.sha1(_title_key(title).encode()).hexdigest()
+    number = int(digest[:8], 16)
+    imdb_id = 'tt9' + str(number % 10 ** 6).zfill(6)
+    return {
+        'Title': ' '.join(title.split()).title(),
+        'Year': str(1950 + number % 75),
+        'Genre': ', '.join(sorted({('Drama', 'Comedy', 'Action', 'Thriller', 'Sci-Fi')[number % 5],
+                                   ('Crime', 'Romance', 'Adventure')[number % 3]})),
+        'Director': f'Director {number % 500}',
+        'Plot': f'A synthesized plot for {title}.',
+        'FullPlot': f'A longer synthesized plot for {title}, served by the movie API stub.',
+        'Poster': f'/posters/{imdb_id}.jpg',
+        'imdbRating': f'{1 + number % 90 / 10:.1f}',
+        'imdbID': imdb_id,
+        'Type': 'movie',
+        'Videos': [{'site': 'YouTube', 'type': 'Trailer', 'key': f'stub-{imdb_id}'}],
+    }
+
+
+class MovieApiStub:
+    """
+    The stub server. Runs in a background thread, so it can also be started
+    from a benchmark script in the same process.
+
+    Attributes:
+        latency (float): Seconds added to every API response.
+        jitter (float): Up to this many seconds more, at random.
+        error_rate (float): Share of API requests answered with error_status.
+        error_status (int): The injected error status, e.g. 503 or 429.
+        synthesize (bool): Make up movies for unknown titles.
+        stats (dict): Requests served and errors injected, by kind.
+    """
+
+    def __init__(self, host='127.0.0.1', port=5001, fixtures_path=DEFAULT_FIXTURES, latency=0.0,
+                 jitter=0.0, error_rate=0.0, error_status=503, synthesize=False, seed=None):
+        self.movies = load_fixtures(fixtures_path)
+        self.titles = {_title_key(movie['Title']): imdb_id for imdb_id, movie in self.movies.items()}
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.synthesize = synthesize
+        self.stats = {'omdb': 0, 'tmdb': 0, 'posters': 0, 'errors': 0}
+        with open(POSTER_FILE, 'rb') as f:
+            self.poster = f.read()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._handler_class())
+        self.server.daemon_threads = True
+
+    @property
+    def url(self):
+        """The base URL to put in MOVIE_API_STUB_URL."""
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self):
+        """Serve in a background thread and return self."""
+        threading.Thread(target=self.server.serve_forever, name='movie-api-stub', daemon=True).start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the socket."""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _count(self, kind):
+        """Increment one of the request counters."""
+        with self._lock:
+            self.stats[kind] += 1
+
+    def _inject(self):
+        """Sleep for the configured latency; return True if this request should fail."""
+        with self._lock:
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            fail = self._random.random() < self.error_rate
+        if delay:
+            time.sleep(delay)
+        if fail:
+            self._count('errors')
+        return fail
+
+    def _find(self, params):
+        """Find the movie for OMDb query parameters, or None."""
+        if 'i' in params:
+            return self.movies.get(params['i'])
+        title = params.get('t', '')
+        imdb_id = self.titles.get(_title_key(title))
+        if imdb_id:
+            return self.movies[imdb_id]
+        if self.synthesize and title.strip():
+            movie = synthesize_movie(title)
+            with self._lock:
+                self.movies.setdefault(movie['imdbID'], movie)
+            return movie
+        return None
+
+    def omdb_response(self, params, base_url):
+        """Return the OMDb JSON body for the query parameters."""
+        movie = self._find(params)
+        if movie is None:
+            return {'Response': 'False', 'Error': 'Movie not found!' if 't' in params else 'Incorrect IMDb ID.'}
+        body = {key: value for key, value in movie.items() if key not in ('FullPlot', 'Videos')}
+        if params.get('plot') == 'full' and movie.get('FullPlot'):
+            body['Plot'] = movie['FullPlot']
+        if body.get('Poster', '').startswith('/'):
+            body['Poster'] = base_url + body['Poster']
+        body['Response'] = 'True'
+        return body
+
+    def _handler_class(self):
+        """Build the request handler class bound to this stub."""
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Keep-alive, like the real APIs
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status, body=b'', content_type='application/json'):
+                if isinstance(body, (dict, list)):
+                    body = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                if status == 429:
+                    self.send_header('Retry-After', '1')
+                self.end_headers()
+                if self.command != 'HEAD':
+                    self.wfile.write(body)
+
+            def do_HEAD(self):
+                self.do_GET()
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                poster = POSTER_PATH.match(parts.path)
+                if poster:
+                    stub._count('posters')
+                    if poster.group(1) in stub.movies:
+                        return self._send(200, stub.poster, 'image/jpeg')
+                    return self._send(404, b'Not Found', 'text/plain')
+
+                videos = VIDEOS_PATH.match(parts.path)
+                if parts.path != '/' and not videos:
+                    return self._send(404, {'status_code': 34, 'status_message': 'Not found.'})
+
+                stub._count('tmdb' if videos else 'omdb')
+                if stub._inject():
+                    return self._send(stub.error_status, {'status_message': 'Injected error.'})
+
+                if videos:
+                    movie = stub.movies.get(videos.group(1))
+                    if movie is None:
+                        return self._send(404, {'status_code': 34, 'status_message':
+                                                'The resource you requested could not be found.'})
+                    return self._send(200, {'id': movie['imdbID'], 'results': movie.get('Videos', [])})
+
+                params = {key: values[0] for key, values in parse_qs(parts.query).items()}
+                return self._send(200, stub.omdb_response(params, f'http://{self.headers.get("Host")}'))
+
+        return Handler
+
+
+def main():
+    """Run the stub server until interrupted."""
+    parser = argparse.ArgumentParser(description='Local stand-in for the OMDb and TMDb APIs.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5001)
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURES, help='JSON file with the movie fixtures.')
+    parser.add_argument('--latency', type=float, default=0, help='Milliseconds added to every API response.')
+    parser.add_argument('--jitter', type=float, default=0, help='Up to this many milliseconds more, at random.')
+    parser.add_argument('--error-rate', type=float, default=0, help='Share of API requests that fail, 0 to 1.')
+    parser.add_argument('--error-status', type=int, default=503, help='Status code of the injected errors.')
+    parser.add_argument('--synthesize', action='store_true', help='Make up movies for unknown titles.')
+    parser.add_argument('--seed', type=int, help='Random seed, for reproducible jitter and errors.')
+    args = parser.parse_args()
+
+    stub = MovieApiStub(args.host, args.port, args.fixtures, args.latency / 1000, args.jitter / 1000,
+                        args.error_rate, args.error_status, args.synthesize, args.seed)
+    print(f'Movie API stub serving {len(stub.movies)} movies on {stub.url}', flush=True)
+    print(f'Start the app with MOVIE_API_STUB_URL={stub.url}', flush=True)
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub.server.server_close()
+        print(f"Served {stub.stats['omdb']} OMDb, {stub.stats['tmdb']} TMDb and "
+              f"{stub.stats['posters']} poster requests; injected {stub.stats['errors']} errors.")
+
+
+if __name__ == '__main__':
+    main()
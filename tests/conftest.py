@@ -0,0 +1,135 @@
+"""
+Shared fixtures for the test suite.
+
+The app is imported once, pointed at a scratch SQLite database whose schema
+is built by running the project's migrations (not db.create_all()), so the
+tests see the same tables and indexes as a migrated deployment. Every test
+starts from a copy of the freshly migrated, empty database.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import zlib
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MIGRATIONS = os.path.join(ROOT, 'migrations')
+sys.path.insert(0, ROOT)
+
+_scratch = tempfile.mkdtemp(prefix='moviwebapp-tests-')
+DATABASE_PATH = os.path.join(_scratch, 'test.db')
+os.environ.update({
+    'SQLITE_DATABASE_URI': f'sqlite:///{DATABASE_PATH}',
+    'METADATA_CACHE_PATH': os.path.join(_scratch, 'metadata_cache.db'),
+    'CACHE_BACKEND': 'simple',  # One in-process cache, cleared between tests
+    'ENRICHMENT_WORKER': 'external',  # No worker thread in the tests
+    'ASSETS_AUTO_BUILD': '0',
+})
+
+
+@pytest.fixture(scope='session')
+def migrated_database():
+    """Migrate the scratch database once and keep an empty copy of it."""
+    from flask_migrate import upgrade
+    from app import app
+    from models import db
+
+    with app.app_context():
+        upgrade(directory=MIGRATIONS)
+        db.engine.dispose()
+    template = os.path.join(_scratch, 'migrated.db')
+    shutil.copy(DATABASE_PATH, template)
+    yield template
+    shutil.rmtree(_scratch, ignore_errors=True)
+
+
+@pytest.fixture
+def app(migrated_database):
+    """The app on a fresh copy of the migrated database, inside an app context."""
+    from app import app as flask_app
+    from models import db
+    from datamanager.fragment_cache import cache
+    from datamanager.title_index import title_index
+
+    with flask_app.app_context():
+        db.engine.dispose()
+        for suffix in ('-wal', '-shm'):
+            if os.path.exists(DATABASE_PATH + suffix):
+                os.remove(DATABASE_PATH + suffix)
+        shutil.copy(migrated_database, DATABASE_PATH)
+        cache.clear()
+        title_index.built_at = None  # Rebuilt from this test's rows on first lookup
+        yield flask_app
+        db.session.remove()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def add_admin(name='Admin'):
+    """Add and return an admin."""
+    from models import db, Admin
+
+    admin = Admin(name=name, email=f'{name.lower().replace(" ", ".")}@example.com')
+    admin.set_password('password')
+    db.session.add(admin)
+    db.session.commit()
+    return admin
+
+
+def add_user(admin, name='User'):
+    """Add and return a user of an admin."""
+    from models import db, User
+    from datamanager import counters
+
+    user = User(name=name, email=f'{name.lower().replace(" ", ".")}@example.com', admin_id=admin.id)
+    user.set_password('password')
+    db.session.add(user)
+    counters.user_added(user)
+    db.session.commit()
+    return user
+
+
+def add_movie(title, admin=None, user=None, director='Some Director', genres=('Drama',),
+              year=2000, rating=7.5, imdb_id=None):
+    """Add a movie for an admin and/or a user through the data manager and return it."""
+    from app import data_manager
+    from models import Movie
+
+    data_manager.add_movie({
+        'title': title,
+        'director': director,
+        'genres': list(genres),
+        'year': year,
+        'rating': rating,
+        'imdbID': imdb_id or f'tt{zlib.crc32(title.encode()) % 10 ** 7:07d}',
+        'admin_id': admin.id if admin else None,
+        'user_id': user.id if user else None,
+        'plot': f'The plot of {title}.',
+        'poster': '',
+    })
+    return Movie.query.filter_by(title=title).order_by(Movie.id.desc()).first()
+
+
+def add_favorite(user, movie):
+    """Mark a movie as a favorite of a user."""
+    from models import db, Favorite
+    from datamanager import counters
+
+    db.session.add(Favorite(user_id=user.id, movie_id=movie.id))
+    counters.favorite_added(user.id)
+    db.session.commit()
+
+
+def log_in(client, admin=None, user=None):
+    """Put an admin and/or a user in the test client's session."""
+    with client.session_transaction() as session:
+        if admin is not None:
+            session['admin_id'] = admin.id
+        if user is not None:
+            session['user_id'] = user.id
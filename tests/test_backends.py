@@ -0,0 +1,122 @@
+"""
+The data manager operations run against every database backend.
+
+The SQLite backend always runs. The PostgreSQL backend runs only when
+TEST_DATABASE_URL points at a scratch PostgreSQL database (its tables are
+dropped after each test) and psycopg2 is installed; otherwise it is skipped.
+"""
+
+import os
+
+import pytest
+from flask import Flask
+from flask_migrate import Migrate, downgrade, upgrade
+
+from conftest import MIGRATIONS
+
+TEST_DATABASE_URL = os.getenv('TEST_DATABASE_URL')
+
+BACKENDS = [
+    pytest.param('sqlite', id='sqlite'),
+    pytest.param('postgresql', id='postgresql', marks=pytest.mark.skipif(
+        not TEST_DATABASE_URL, reason='TEST_DATABASE_URL is not set')),
+]
+
+
+@pytest.fixture(params=BACKENDS)
+def data_manager(request, tmp_path):
+    """A data manager of the backend on a freshly migrated database."""
+    from datamanager.backends import create_data_manager
+    from datamanager.fragment_cache import cache
+    from models import db
+
+    backend_app = Flask(__name__)
+    backend_app.config['DATABASE_BACKEND'] = request.param
+    if request.param == 'postgresql':
+        pytest.importorskip('psycopg2')
+        backend_app.config['DATABASE_URL'] = TEST_DATABASE_URL
+    else:
+        backend_app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{tmp_path / "backend.db"}'
+    manager = create_data_manager(backend_app)
+    cache.init_app(backend_app, config={'CACHE_TYPE': 'SimpleCache'})  # Bumped by every commit
+    Migrate(backend_app, db, render_as_batch=True)
+
+    with backend_app.app_context():
+        upgrade(directory=MIGRATIONS)
+        yield manager
+        db.session.remove()
+        downgrade(directory=MIGRATIONS, revision='base')
+        db.engine.dispose()
+
+
+def _add_admin(data_manager):
+    data_manager.add_admin('Admin', 'admin@example.com', 'password')
+    return data_manager.get_all_admins()[0]
+
+
+def _movie(title, admin, imdb_id, director='Christopher Nolan', genres=('Drama',)):
+    return {
+        'title': title,
+        'director': director,
+        'genres': list(genres),
+        'year': 2010,
+        'rating': 8.5,
+        'imdbID': imdb_id,
+        'admin_id': admin.id,
+        'plot': f'The plot of {title}.',
+    }
+
+
+def test_add_and_list_movies(data_manager):
+    admin = _add_admin(data_manager)
+    data_manager.add_movie(_movie('Inception', admin, 'tt1375666', genres=('Action', 'Sci-Fi')))
+    data_manager.add_movie(_movie('Interstellar', admin, 'tt0816692', genres=('Sci-Fi',)))
+
+    movies = data_manager.get_admin_movies(admin.id)
+    assert sorted(movie.title for movie in movies) == ['Inception', 'Interstellar']
+    # Shared lookup rows are upserted, not duplicated
+    assert len({movie.director_id for movie in movies}) == 1
+    assert sorted(genre.name for genre in data_manager.get_all_genres()) == ['Action', 'Sci-Fi']
+    assert all(movie.catalog_movie is not None for movie in movies)
+
+
+def test_search_movies(data_manager):
+    admin = _add_admin(data_manager)
+    data_manager.add_movie(_movie('Inception', admin, 'tt1375666'))
+    data_manager.add_movie(_movie('Memento', admin, 'tt0209144'))
+
+    assert [movie.title for movie in data_manager.search_movies('Incep')] == ['Inception']
+    # LIKE wildcards in the search text are matched literally
+    assert data_manager.search_movies('%') == []
+    assert data_manager.search_movies('_') == []
+
+
+def test_update_and_delete_movie(data_manager):
+    admin = _add_admin(data_manager)
+    data_manager.add_movie(_movie('Inception', admin, 'tt1375666'))
+    movie = data_manager.get_admin_movies(admin.id)[0]
+
+    data_manager.update_movie(movie.id, {
+        'title': 'Inception (2010)', 'director': 'C. Nolan', 'year': 2010, 'rating': 9,
+        'admin_id': admin.id, 'imdbID': 'tt1375666', 'genres': ['Thriller'],
+    })
+    movie = data_manager.get_admin_movies(admin.id)[0]
+    assert movie.title == 'Inception (2010)'
+    assert [genre.name for genre in movie.genres] == ['Thriller']
+    # The edit stays on the copy; the catalog keeps the fetched metadata
+    assert movie.catalog_movie.title == 'Inception'
+    assert [genre.name for genre in movie.catalog_movie.genres] == ['Drama']
+
+    data_manager.delete_movie(movie.id)
+    assert data_manager.get_admin_movies(admin.id) == []
+
+
+def test_a_second_copy_keeps_the_catalog_genres(data_manager):
+    admin = _add_admin(data_manager)
+    data_manager.add_movie(_movie('Inception', admin, 'tt1375666', genres=('Action', 'Sci-Fi')))
+    data_manager.add_movie(_movie('Inception', admin, 'tt1375666', genres=('Thriller',)))
+
+    first, second = sorted(data_manager.get_admin_movies(admin.id), key=lambda movie: movie.id)
+    assert first.catalog_movie is second.catalog_movie
+    assert [genre.name for genre in second.genres] == ['Thriller']
+    assert [genre.name for genre in second.catalog_movie.genres] == ['Action', 'Sci-Fi']
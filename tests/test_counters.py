@@ -0,0 +1,48 @@
+"""
+The counters kept by the write paths match what reconcile_counters()
+recomputes from the base tables.
+"""
+
+from conftest import add_admin, add_user, add_movie, add_favorite
+
+
+def counter_snapshot():
+    from models import db, User, Admin, Counter
+
+    db.session.expire_all()
+    return (
+        sorted((user.id, user.movie_count, user.favorite_count) for user in User.query),
+        sorted((admin.id, admin.user_count, admin.movie_count) for admin in Admin.query),
+        sorted((counter.name, counter.value) for counter in Counter.query),
+    )
+
+
+def test_counters_match_a_reconcile_after_adds_favorites_deletes_and_moves(app):
+    from app import data_manager
+    from models import db
+    from datamanager.counters import reconcile_counters
+
+    first_admin, second_admin = add_admin('First Admin'), add_admin('Second Admin')
+    owner, fan, leaver = (add_user(first_admin, name) for name in ('Owner', 'Fan', 'Leaver'))
+    heat = add_movie('Heat', admin=first_admin, user=owner, imdb_id='tt0113277')
+    alien = add_movie('Alien', admin=first_admin, user=owner, imdb_id='tt0078748')
+    add_favorite(fan, heat)
+    add_favorite(owner, heat)
+    add_favorite(fan, alien)
+
+    # Deleting a movie uncounts it for everyone who favorited it
+    data_manager.delete_movie(heat.id)
+    # Moving a movie to another admin moves its count
+    data_manager.update_movie(alien.id, {
+        'title': alien.title, 'director': 'Ridley Scott', 'year': alien.year, 'rating': alien.rating,
+        'admin_id': second_admin.id, 'imdbID': 'tt0078748', 'genres': ['Horror'],
+    })
+    data_manager.delete_user(leaver.id)
+
+    counted = counter_snapshot()
+    assert counted[0] == sorted([(owner.id, 1, 0), (fan.id, 0, 1)])
+
+    reconcile_counters()
+    db.session.commit()
+
+    assert counter_snapshot() == counted
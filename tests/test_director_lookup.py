@@ -0,0 +1,52 @@
+"""
+Directors are resolved by name; a blank director is rejected by the edit
+forms and the data manager instead of failing on a missing row.
+"""
+
+import pytest
+
+from conftest import add_admin, add_user, add_movie, log_in
+
+
+def test_admin_edit_with_blank_director_is_rejected(client):
+    from models import db
+
+    admin = add_admin()
+    movie = add_movie('Blank Director', admin=admin)
+    log_in(client, admin=admin)
+
+    response = client.post(f'/admin/edit_movie/{movie.id}', data={
+        'title': 'Renamed', 'director': '', 'year': '2001', 'rating': '8', 'genres': 'Drama',
+    })
+    assert response.status_code == 302
+    assert response.headers['Location'].endswith(f'/admin/edit_movie/{movie.id}')
+    db.session.refresh(movie)
+    assert movie.title == 'Blank Director'
+
+
+def test_user_edit_with_blank_director_is_rejected(client):
+    from models import db
+
+    admin = add_admin()
+    user = add_user(admin)
+    movie = add_movie('Blank Director', user=user, admin=admin)
+    log_in(client, user=user)
+
+    response = client.post(f'/user/edit_movie/{movie.id}', data={
+        'title': 'Renamed', 'director': '', 'year': '2001', 'rating': '8', 'genres': 'Drama',
+    })
+    assert response.status_code == 302
+    assert response.headers['Location'].endswith(f'/user/edit_movie/{movie.id}')
+    db.session.refresh(movie)
+    assert movie.title == 'Blank Director'
+
+
+def test_data_manager_rejects_blank_director(app):
+    from app import data_manager
+
+    admin = add_admin()
+    movie = add_movie('Blank Director', admin=admin)
+    with pytest.raises(ValueError):
+        add_movie('No Director', admin=admin, director='')
+    with pytest.raises(ValueError):
+        data_manager.update_movie(movie.id, {'title': 'Renamed', 'director': '', 'admin_id': admin.id})
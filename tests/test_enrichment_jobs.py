@@ -0,0 +1,96 @@
+"""
+Enrichment jobs fill in the catalog entry, and every kind of failure is
+retried with backoff until MAX_ATTEMPTS, then the job is marked failed.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from conftest import add_admin, add_movie
+
+
+@pytest.fixture
+def job(app):
+    from models import db, EnrichmentJob
+
+    movie = add_movie('Heat', admin=add_admin(), imdb_id='tt0113277')
+    job = EnrichmentJob(catalog_movie=movie.catalog_movie)
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+
+def run_due_job(job):
+    """Make the job due and run it."""
+    from models import db
+    from datamanager.enrichment_jobs import process_jobs
+
+    job.run_after = datetime.now()
+    db.session.commit()
+    assert process_jobs(limit=1) == 1
+    db.session.refresh(job)
+
+
+def test_job_fills_in_the_catalog_entry(job, monkeypatch):
+    from datamanager import enrichment_jobs
+
+    monkeypatch.setattr(enrichment_jobs, 'fetch_enrichment_data', lambda imdb_id, poster: {
+        'trailer': 'https://www.youtube.com/watch?v=abc', 'plot': 'A much longer plot of Heat.', 'poster_ok': None,
+    })
+    run_due_job(job)
+
+    assert job.status == enrichment_jobs.DONE
+    assert job.catalog_movie.trailer == 'https://www.youtube.com/watch?v=abc'
+    assert job.catalog_movie.plot == 'A much longer plot of Heat.'
+
+
+def test_unexpected_error_is_retried_then_fails(job, monkeypatch):
+    from datamanager import enrichment_jobs
+
+    def unexpected_response(imdb_id, poster):
+        raise KeyError('results')
+
+    monkeypatch.setattr(enrichment_jobs, 'fetch_enrichment_data', unexpected_response)
+    run_due_job(job)
+
+    assert job.status == enrichment_jobs.PENDING
+    assert job.attempts == 1
+    assert 'results' in job.last_error
+    assert job.run_after > datetime.now()
+
+    for _ in range(enrichment_jobs.MAX_ATTEMPTS - 1):
+        run_due_job(job)
+    assert job.status == enrichment_jobs.FAILED
+    assert job.attempts == enrichment_jobs.MAX_ATTEMPTS
+
+
+def test_failed_lookup_cancels_the_other_lookups(monkeypatch):
+    import asyncio
+    import httpx
+    import blueprints.utils as utils
+
+    cancelled = []
+
+    async def unreachable(imdb_id):
+        raise httpx.ConnectError('TMDb is down')
+
+    async def slow_plot(imdb_id):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(imdb_id)
+            raise
+
+    async def no_poster(poster_url):
+        return None
+
+    monkeypatch.setattr(utils, '_lookup_trailer', unreachable)
+    monkeypatch.setattr(utils, '_lookup_full_plot', slow_plot)
+    monkeypatch.setattr(utils, '_check_poster', no_poster)
+
+    with pytest.raises(httpx.ConnectError):
+        utils.fetch_enrichment_data('tt0113277', '')
+    # The plot lookup is cancelled on the shared loop rather than left running
+    utils.run_sync(asyncio.sleep(0))
+    assert cancelled == ['tt0113277']
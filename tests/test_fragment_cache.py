@@ -0,0 +1,58 @@
+"""
+Committed writes invalidate the fragment cache namespaces they touch, and
+only those.
+"""
+
+from conftest import add_admin, add_user, add_movie, add_favorite
+
+
+def versions(*namespaces):
+    from datamanager.fragment_cache import namespace_versions
+
+    return namespace_versions(list(namespaces))
+
+
+def test_moving_a_movie_invalidates_both_owners(app):
+    from models import db
+    from datamanager.fragment_cache import CATALOG, LABELS, user_namespace
+
+    admin = add_admin()
+    old_owner, new_owner, bystander = (add_user(admin, name) for name in ('Old Owner', 'New Owner', 'Bystander'))
+    movie = add_movie('Heat', user=old_owner)
+    namespaces = (user_namespace(old_owner.id), user_namespace(new_owner.id),
+                  user_namespace(bystander.id), CATALOG, LABELS)
+    before = versions(*namespaces)
+
+    db.session.expire(movie)  # The old owner is not loaded when the movie is reassigned
+    movie.user_id = new_owner.id
+    db.session.commit()
+    after = versions(*namespaces)
+
+    assert [old != new for old, new in zip(before, after)] == [True, True, False, True, False]
+
+
+def test_editing_a_favorited_movie_invalidates_the_favoriting_user(app):
+    from models import db
+    from datamanager.fragment_cache import user_namespace
+
+    admin = add_admin()
+    owner, fan = add_user(admin, 'Owner'), add_user(admin, 'Fan')
+    movie = add_movie('Heat', user=owner)
+    add_favorite(fan, movie)
+    before = versions(user_namespace(fan.id))
+
+    movie.rating = 9.0
+    db.session.commit()
+
+    assert versions(user_namespace(fan.id)) != before
+
+
+def test_a_new_deploy_changes_the_page_etags(app, client, monkeypatch):
+    first = client.get('/')
+    assert client.get('/', headers={'If-None-Match': first.headers['ETag']}).status_code == 304
+
+    monkeypatch.setitem(app.config, 'BUILD_ID', 'next-deploy')
+    response = client.get('/', headers={'If-None-Match': first.headers['ETag']})
+
+    assert response.status_code == 200
+    assert response.headers['ETag'] != first.headers['ETag']
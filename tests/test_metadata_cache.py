@@ -0,0 +1,73 @@
+"""
+The movie metadata cache keeps found movies for the TTL (their trailer is
+added later by the enrichment job) and "not found" answers for the negative
+TTL, and its expired entries are purged.
+"""
+
+import time
+
+import pytest
+
+from blueprints.metadata_cache import MetadataCache
+from stubs.movie_api_stub import MovieApiStub
+
+
+@pytest.fixture
+def stub_api(monkeypatch):
+    """Point the movie API calls at the local stub, with an empty metadata cache."""
+    import blueprints.utils as utils
+
+    stub = MovieApiStub(port=0).start()
+    monkeypatch.setattr(utils, 'OMDB_URL', stub.url + '/')
+    monkeypatch.setattr(utils, 'TMDB_VIDEOS_URL', stub.url + '/3/movie/{imdb_id}/videos')
+    utils.metadata_cache.clear()
+    yield utils
+    utils.metadata_cache.clear()
+    stub.stop()
+
+
+def expires_in(cache, key):
+    """Seconds until a cache entry expires."""
+    with cache._connect() as conn:
+        (expires_at,) = conn.execute('SELECT expires_at FROM metadata WHERE key = ?', (key,)).fetchone()
+    return expires_at - time.time()
+
+
+def test_found_movie_is_cached_for_the_ttl(stub_api):
+    cache = stub_api.metadata_cache
+    data = stub_api.fetch_movie_data('Heat')
+
+    assert data['imdbID'] == 'tt0113277' and 'Trailer' not in data
+    assert expires_in(cache, 'title:heat') == pytest.approx(cache.ttl, abs=60)
+    assert expires_in(cache, 'imdb:tt0113277') == pytest.approx(cache.ttl, abs=60)
+
+
+def test_movie_not_found_is_cached_for_the_negative_ttl(stub_api):
+    cache = stub_api.metadata_cache
+
+    assert stub_api.fetch_movie_data('No Such Movie') is None
+    assert expires_in(cache, 'title:no such movie') == pytest.approx(cache.negative_ttl, abs=60)
+    assert cache.get_by_title('No Such Movie') == (True, None)
+
+
+def test_purge_expired_deletes_only_expired_entries(tmp_path):
+    cache = MetadataCache(str(tmp_path / 'metadata_cache.db'))
+    cache.set(['title:old', 'imdb:old'], {'Title': 'Old'}, ttl=-1)
+    cache.set(['title:new'], {'Title': 'New'})
+
+    assert cache.purge_expired() == 2
+    assert cache.get('title:old') == (False, None)
+    assert cache.get('title:new') == (True, {'Title': 'New'})
+    assert cache.purge_expired() == 0
+
+
+def test_workers_purge_at_most_once_per_interval(monkeypatch):
+    from datamanager import enrichment_jobs
+
+    purges = []
+    monkeypatch.setattr(enrichment_jobs.metadata_cache, 'purge_expired', lambda: purges.append(1) or 3)
+    monkeypatch.setattr(enrichment_jobs, '_last_purge', None)
+
+    assert enrichment_jobs.purge_metadata_cache_if_due() == 3
+    assert enrichment_jobs.purge_metadata_cache_if_due() is None
+    assert len(purges) == 1
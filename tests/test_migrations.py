@@ -0,0 +1,62 @@
+"""
+The migrations build the schema the models describe, upgrade the sample
+database shipped in db/, and can be stepped down and back up.
+"""
+
+import os
+import shutil
+
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from flask import Flask
+from flask_migrate import Migrate, downgrade, stamp, upgrade
+from sqlalchemy import inspect
+
+from conftest import MIGRATIONS, ROOT
+
+INITIAL_REVISION = '4177780b76d0'
+
+
+def _not_fts(obj, name, type_, reflected, compare_to):
+    """The FTS5 search index tables are created with raw SQL and have no model."""
+    return not (type_ == 'table' and name.startswith('movie_search'))
+
+
+def test_migrated_schema_matches_models(app):
+    from models import db
+
+    with db.engine.connect() as connection:
+        context = MigrationContext.configure(connection, opts={'include_object': _not_fts})
+        assert compare_metadata(context, db.metadata) == []
+
+
+def test_migrations_step_down_and_back_up(app):
+    from models import db
+
+    downgrade(directory=MIGRATIONS, revision=INITIAL_REVISION)
+    assert 'catalog_movie' not in inspect(db.engine).get_table_names()
+    upgrade(directory=MIGRATIONS)
+    assert 'catalog_movie' in inspect(db.engine).get_table_names()
+
+
+def test_sample_database_upgrades_after_stamping(tmp_path):
+    from models import db
+
+    path = tmp_path / 'sample.db'
+    shutil.copy(os.path.join(ROOT, 'db', 'moviwebapp.db'), path)
+    sample_app = Flask(__name__)
+    sample_app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{path}'
+    db.init_app(sample_app)
+    Migrate(sample_app, db, render_as_batch=True)
+
+    with sample_app.app_context():
+        movies = db.session.execute(db.text('SELECT count(*) FROM movie')).scalar()
+        stamp(directory=MIGRATIONS, revision=INITIAL_REVISION)
+        upgrade(directory=MIGRATIONS)
+        # Every copy of a film with an imdbID is linked to its catalog entry
+        assert db.session.execute(db.text('SELECT count(*) FROM movie')).scalar() == movies
+        assert db.session.execute(db.text(
+            'SELECT count(*) FROM movie WHERE catalog_movie_id IS NULL'
+        )).scalar() == 0
+        db.session.remove()
+        db.engine.dispose()
@@ -0,0 +1,79 @@
+"""
+The movie API client against the local API stub (stubs/movie_api_stub.py)
+with injected latency: lookups run concurrently on pooled connections, and
+each API host has its own pool, so a slow API does not hold up the other.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from blueprints.movie_api_client import MovieApiClient
+from stubs.movie_api_stub import MovieApiStub
+
+LATENCY = 0.3  # Seconds the slow stub takes to answer
+
+
+@pytest.fixture
+def slow_stub():
+    stub = MovieApiStub(port=0, latency=LATENCY).start()
+    yield stub
+    stub.stop()
+
+
+@pytest.fixture
+def fast_stub():
+    stub = MovieApiStub(port=0).start()
+    yield stub
+    stub.stop()
+
+
+def run_client(hosts, pool_maxsize, requests):
+    """
+    Send the requests concurrently through a new client.
+
+    Parameters:
+    hosts (iterable): The client's API hosts.
+    pool_maxsize (int): Connections per pool.
+    requests (list): (url, params) pairs.
+
+    Returns:
+    list: (status code, seconds until the response arrived) per request.
+    """
+    async def run():
+        client = MovieApiClient(pool_maxsize=pool_maxsize, hosts=hosts)
+        start = time.perf_counter()
+
+        async def timed(url, params):
+            response = await client.get(url, params)
+            return response.status_code, time.perf_counter() - start
+
+        try:
+            return await asyncio.gather(*(timed(url, params) for url, params in requests))
+        finally:
+            await client.aclose()
+
+    return asyncio.run(run())
+
+
+def test_lookups_run_concurrently_up_to_the_pool_size(slow_stub):
+    url = slow_stub.url + '/'
+    results = run_client([url], 4, [(url, {'t': 'Heat'})] * 4)
+
+    assert [status for status, _ in results] == [200] * 4
+    # One round of latency, not four in a row
+    assert max(seconds for _, seconds in results) < 2 * LATENCY
+
+
+def test_a_slow_host_does_not_hold_up_another_host(slow_stub, fast_stub):
+    omdb_url = slow_stub.url + '/'
+    videos_url = fast_stub.url + '/3/movie/tt0113277/videos'
+    # The slow API uses up its pool of 2; the other API still gets a connection at once
+    results = run_client([omdb_url, videos_url], 2,
+                         [(omdb_url, {'t': 'Heat'}), (omdb_url, {'t': 'Inception'}), (videos_url, None)])
+
+    assert [status for status, _ in results] == [200] * 3
+    assert results[2][1] < LATENCY / 2
+    assert slow_stub.stats['omdb'] == 2
+    assert fast_stub.stats['tmdb'] == 1
@@ -0,0 +1,32 @@
+"""
+The substring search used where the FTS5 index is missing takes LIKE
+wildcards in the search text literally.
+"""
+
+import pytest
+
+from conftest import add_admin, add_movie
+
+
+@pytest.fixture
+def without_fts(monkeypatch):
+    from datamanager import movie_search
+
+    monkeypatch.setattr(movie_search, '_search_enabled', lambda connection: False)
+
+
+@pytest.mark.parametrize('search_text, titles', [
+    ('100%', ['100% Wolf']),
+    ('_', ['Snake_Eyes']),
+])
+def test_fallback_search_matches_wildcards_literally(app, without_fts, search_text, titles):
+    from datamanager.movie_search import search_movies_page, search_catalog_page
+
+    admin = add_admin()
+    for title in ('100% Wolf', 'Room 1001', 'Snake_Eyes', 'Heat'):
+        add_movie(title, admin=admin)
+
+    results, _ = search_movies_page(search_text, admin_id=admin.id)
+    assert [result.item.title for result in results] == titles
+    results, _ = search_catalog_page(search_text)
+    assert [result.item.title for result in results] == titles
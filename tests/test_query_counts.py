@@ -0,0 +1,87 @@
+"""
+The catalog page and the admin and user lists load their rows, and each
+row's director, genres, catalog entry and owner, with a fixed number of
+queries: the count must not grow with the number of rows on the page.
+
+Each page is rendered once with a few rows and once with a full page of
+rows, with the fragment cache cleared so every query actually runs.
+"""
+
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from conftest import add_admin, add_user, add_movie, add_favorite, log_in
+
+PAGES = [
+    '/movies_home',
+    '/admin/manage_movies',
+    '/admin/manage_all_movies',
+    '/admin/manage_users',
+    '/admin/manage_all_users',
+    '/user/my_movies',
+    '/user/user_favorites',
+]
+
+
+@contextmanager
+def counted_queries():
+    """Count the statements run on the engine."""
+    from models import db
+
+    executed = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', count)
+    try:
+        yield executed
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', count)
+
+
+def query_count(client, url):
+    from flask import g
+    from datamanager.fragment_cache import cache
+    from models import db
+
+    # The request runs in the test's app context: drop the rows cached on
+    # flask.g and in the session by the previous request, like a new request
+    cache.clear()
+    g.pop('admin', None)
+    g.pop('user', None)
+    db.session.remove()
+    with counted_queries() as executed:
+        response = client.get(url)
+    assert response.status_code == 200, response.data
+    return len(executed)
+
+
+def add_rows(admin, user, first, last):
+    """Add movies, users and favorites numbered first..last-1, each with its own director and genres."""
+    for number in range(first, last):
+        genres = (f'Genre {number}', 'Drama')
+        add_movie(f'Admin Movie {number:02d}', admin=admin, director=f'Director {number}', genres=genres)
+        movie = add_movie(f'User Movie {number:02d}', user=user, admin=admin,
+                          director=f'Director {number}', genres=genres)
+        add_favorite(user, movie)
+        add_user(admin, f'User {number:02d}')
+
+
+@pytest.mark.parametrize('url', PAGES)
+def test_query_count_does_not_grow_with_rows(client, url):
+    from models import db, Admin, User
+
+    admin = add_admin()
+    user = add_user(admin)
+    admin_id, user_id = admin.id, user.id
+    log_in(client, admin=admin, user=user)
+
+    add_rows(admin, user, 0, 2)
+    few = query_count(client, url)
+    add_rows(db.session.get(Admin, admin_id), db.session.get(User, user_id), 2, 12)
+    many = query_count(client, url)
+
+    assert many == few
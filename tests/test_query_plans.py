@@ -0,0 +1,135 @@
+"""
+The hot listing, favorites and report queries must be served by the indexes
+of the hot filter migration (83823583fb5a), not by full table scans.
+
+Each test requests a page of the JSON API (the same queries as the HTML
+lists), records every SELECT it runs and checks their EXPLAIN QUERY PLAN.
+"""
+
+import re
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from conftest import add_admin, add_user, add_movie, add_favorite, log_in
+
+# A plan step reading a whole table: "SCAN movie", but not "SCAN movie USING INDEX ..."
+FULL_SCAN = re.compile(r'^SCAN (movie|favorite|user)\b(?! USING (COVERING )?INDEX)')
+
+
+@contextmanager
+def recorded_selects():
+    """Record the SELECT statements run on the engine, with their parameters."""
+    from models import db
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+
+
+def query_plans(statements):
+    """Return the EXPLAIN QUERY PLAN details of each statement, one list per statement."""
+    from models import db
+
+    with db.engine.connect() as connection:
+        return [[row[3] for row in connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters)]
+                for statement, parameters in statements]
+
+
+def favorite_unique_index():
+    """The name SQLite gave the index of the (user_id, movie_id) unique constraint."""
+    from models import db
+
+    with db.engine.connect() as connection:
+        for index in connection.exec_driver_sql('PRAGMA index_list(favorite)'):
+            columns = [row[2] for row in connection.exec_driver_sql(f'PRAGMA index_info("{index[1]}")')]
+            if index[2] and columns == ['user_id', 'movie_id']:
+                return index[1]
+    raise AssertionError('favorite has no unique (user_id, movie_id) index')
+
+
+def plans_of(client, url):
+    with recorded_selects() as statements:
+        response = client.get(url)
+    assert response.status_code == 200, response.data
+    return query_plans(statements)
+
+
+def assert_uses_index(plans, index):
+    steps = [step for plan in plans for step in plan]
+    assert any(f'USING INDEX {index}' in step or f'USING COVERING INDEX {index}' in step for step in steps), steps
+    full_scans = [step for step in steps if FULL_SCAN.match(step)]
+    assert not full_scans, full_scans
+
+
+@pytest.fixture
+def owners(app, client):
+    admin = add_admin()
+    other_admin = add_admin('Other Admin')
+    user = add_user(admin)
+    other_user = add_user(other_admin, 'Other User')
+    for number in range(12):
+        add_movie(f'Admin Movie {number:02d}', admin=admin)
+        add_movie(f'User Movie {number:02d}', user=user, admin=admin)
+        add_movie(f'Other Movie {number:02d}', user=other_user, admin=other_admin)
+    for movie in user.movies[:6]:
+        add_favorite(user, movie)
+    log_in(client, admin=admin, user=user)
+    return admin, user
+
+
+def test_admin_movie_list_uses_admin_title_index(client, owners):
+    assert_uses_index(plans_of(client, '/api/v1/admin/movies'), 'ix_movie_admin_id_title')
+
+
+def test_admin_movie_list_next_page_uses_admin_title_index(client, owners):
+    cursor = client.get('/api/v1/admin/movies').get_json()['next']
+    assert_uses_index(plans_of(client, f'/api/v1/admin/movies?after={cursor}'), 'ix_movie_admin_id_title')
+
+
+def test_user_movie_list_uses_user_title_index(client, owners):
+    assert_uses_index(plans_of(client, '/api/v1/user/movies'), 'ix_movie_user_id_title')
+
+
+def test_user_movies_report_uses_user_title_index(client, owners):
+    _, user = owners
+    assert_uses_index(plans_of(client, f'/api/v1/admin/reports/users/{user.id}/movies'), 'ix_movie_user_id_title')
+
+
+def test_favorites_use_favorite_unique_index(client, owners):
+    assert_uses_index(plans_of(client, '/api/v1/user/favorites'), favorite_unique_index())
+
+
+def test_users_report_uses_user_admin_index(client, owners):
+    assert_uses_index(plans_of(client, '/api/v1/admin/reports/users'), 'ix_user_admin_id')
+
+
+def test_duplicate_title_check_uses_owner_title_index(app, owners):
+    from controllers.common_fun import check_existing_movie, is_movie_exists
+
+    admin, user = owners
+    with recorded_selects() as statements:
+        assert check_existing_movie('Admin Movie 03', admin.id)
+    assert_uses_index(query_plans(statements), 'ix_movie_admin_id_title')
+
+    with recorded_selects() as statements:
+        assert is_movie_exists('User Movie 03', user.id)
+    assert_uses_index(query_plans(statements), 'ix_movie_user_id_title')
+
+
+def test_deleting_favorites_of_a_movie_uses_movie_index(app, owners):
+    from models import Favorite
+
+    _, user = owners
+    with recorded_selects() as statements:
+        Favorite.query.filter_by(movie_id=user.movies[0].id).all()
+    assert_uses_index(query_plans(statements), 'ix_favorite_movie_id')
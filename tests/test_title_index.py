@@ -0,0 +1,50 @@
+"""
+The public title autocomplete suggests catalog titles of films that are in
+a collection, never the titles users and admins give their own copies.
+"""
+
+from conftest import add_admin, add_user, add_movie
+
+
+def suggestions(client, prefix):
+    response = client.get('/titles/autocomplete', query_string={'q': prefix})
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_renamed_private_copy_is_not_suggested(client):
+    from app import data_manager
+
+    admin = add_admin()
+    user = add_user(admin)
+    movie = add_movie('Heat', user=user, imdb_id='tt0113277')
+    assert suggestions(client, 'hea') == [{'title': 'Heat', 'imdbID': 'tt0113277'}]
+
+    data_manager.update_movie(movie.id, {
+        'title': 'Secret Notes About My Ex', 'director': 'Michael Mann', 'year': 1995, 'rating': 8.3,
+        'imdbID': 'tt0113277', 'genres': ['Crime'],
+    })
+    assert suggestions(client, 'secret') == []
+    assert suggestions(client, 'hea') == [{'title': 'Heat', 'imdbID': 'tt0113277'}]
+
+    # Rebuilt from the database, the index still only holds the catalog title
+    from datamanager.title_index import title_index
+    title_index.invalidate()
+    assert suggestions(client, 'secret') == []
+    assert suggestions(client, 'hea') == [{'title': 'Heat', 'imdbID': 'tt0113277'}]
+
+
+def test_title_is_suggested_while_a_copy_is_listed(client):
+    from app import data_manager
+
+    admin = add_admin()
+    assert suggestions(client, 'matr') == []  # Builds the index
+
+    first = add_movie('The Matrix', admin=admin, imdb_id='tt0133093')
+    second = add_movie('The Matrix', user=add_user(admin), imdb_id='tt0133093')
+    assert suggestions(client, 'matr') == [{'title': 'The Matrix', 'imdbID': 'tt0133093'}]
+
+    data_manager.delete_movie(first.id)
+    assert suggestions(client, 'matr') == [{'title': 'The Matrix', 'imdbID': 'tt0133093'}]
+    data_manager.delete_movie(second.id)
+    assert suggestions(client, 'matr') == []